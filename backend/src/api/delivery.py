@@ -4,23 +4,41 @@ Delivery API endpoints (US-006).
 Handles sending documents to accountant via email.
 """
 
+import asyncio
 from datetime import datetime
 from io import BytesIO
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from pydantic import BaseModel, EmailStr
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
 from src.database import get_session
-from src.models import DocumentStatus, EnrichedContext, MonthlyDocument, Transaction
+from src.models import DocumentStatus, MonthlyDocument
+from src.services.document_service import DocumentService
 from src.services.email_service import EmailService
+from src.services.excel_builder import ExcelBuilder
+from src.utils import TTLCache, json_etag
 
 router = APIRouter(prefix="/delivery", tags=["delivery"])
 
+# Polling clients may reuse a status response for this long
+STATUS_MAX_AGE_SECONDS = 5
+
+# Successful sends by (Idempotency-Key, document_id, accountant_email)
+_idempotent_sends = TTLCache(ttl_seconds=3600)
+_inflight_sends: dict[tuple[str, str, str], asyncio.Event] = {}
+
+# Columns used by the status endpoint (skips the large document_markdown)
+STATUS_COLUMNS = load_only(
+    MonthlyDocument.id,
+    MonthlyDocument.document_version,
+    MonthlyDocument.status,
+    MonthlyDocument.sent_to_accountant_at,
+    MonthlyDocument.accountant_email,
+)
+
 
 # === Pydantic Models ===
 
@@ -51,21 +69,67 @@ class DeliveryStatusResponse(BaseModel):
     accountant_email: Optional[str] = None
 
 
+# === Dependencies ===
+
+
+def get_email_service(request: Request) -> EmailService:
+    """Get the application-wide EmailService (created in the app lifespan)."""
+    email_service = getattr(request.app.state, "email_service", None)
+    if email_service is None:
+        email_service = request.app.state.email_service = EmailService()
+    return email_service
+
+
 # === Endpoints ===
 
 
 @router.post("/send", response_model=SendToAccountantResponse)
 async def send_to_accountant(
     request: SendToAccountantRequest,
+    idempotency_key: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
+    email_service: EmailService = Depends(get_email_service),
 ):
     """
     Send document to accountant via email.
 
     Generates Excel file and sends via SMTP.
 
+    With an Idempotency-Key header, a retry of a successful send returns
+    the original response without sending again, and a duplicate that
+    arrives while the first is in flight waits for its result.
+
     AC-006-01, AC-006-02, AC-006-03
     """
+    if not idempotency_key:
+        return await _deliver(request, session, email_service)
+
+    key = (idempotency_key, request.document_id, request.accountant_email)
+    while (inflight := _inflight_sends.get(key)) is not None:
+        await inflight.wait()
+
+    cached = _idempotent_sends.get(key)
+    if cached is not None:
+        return cached
+
+    done = _inflight_sends[key] = asyncio.Event()
+    try:
+        response = await _deliver(request, session, email_service)
+        # Only successes are replayed; failed sends may be retried
+        if response.status == "success":
+            _idempotent_sends.set(key, response)
+        return response
+    finally:
+        del _inflight_sends[key]
+        done.set()
+
+
+async def _deliver(
+    request: SendToAccountantRequest,
+    session: AsyncSession,
+    email_service: EmailService,
+) -> SendToAccountantResponse:
+    """Build the Excel attachment, email it and mark the document as sent."""
     # Get document
     document = await session.get(MonthlyDocument, request.document_id)
     if not document:
@@ -78,36 +142,20 @@ async def send_to_accountant(
             detail="Document must be reviewed before sending. Please review first.",
         )
 
-    # Get transactions for Excel
-    year, month = document.month.split("-")
-    start_date = datetime(int(year), int(month), 1)
-    if int(month) == 12:
-        end_date = datetime(int(year) + 1, 1, 1)
-    else:
-        end_date = datetime(int(year), int(month) + 1, 1)
-
-    tx_query = (
-        select(Transaction)
-        .where(Transaction.date >= start_date)
-        .where(Transaction.date < end_date)
-        .where(Transaction.is_internal_transfer == False)  # noqa: E712
-        .order_by(Transaction.date)
+    # Generate Excel, streaming the month's transactions (with contexts),
+    # while the SMTP session is opened
+    service = DocumentService(session)
+    builder = ExcelBuilder(document)
+    await asyncio.gather(
+        builder.add_transactions(service.stream_month_transactions(document.month)),
+        email_service.prepare(),
     )
-    tx_result = await session.execute(tx_query)
-    transactions = tx_result.scalars().all()
-
-    # Get contexts
-    tx_ids = [tx.id for tx in transactions]
-    ctx_query = select(EnrichedContext).where(EnrichedContext.transaction_id.in_(tx_ids))
-    ctx_result = await session.execute(ctx_query)
-    contexts = {ctx.transaction_id: ctx for ctx in ctx_result.scalars().all()}
-
-    # Generate Excel
-    excel_content = _generate_excel(document, transactions, contexts)
+    buffer = BytesIO()
+    await builder.save_async(buffer)
+    excel_content = buffer.getvalue()
     filename = f"{request.user_name}_{document.month}_입출금내역.xlsx"
 
     # Send email
-    email_service = EmailService()
     result = await email_service.send_to_accountant(
         to_email=request.accountant_email,
         user_name=request.user_name,
@@ -140,18 +188,24 @@ async def send_to_accountant(
 @router.get("/status/{document_id}", response_model=DeliveryStatusResponse)
 async def get_delivery_status(
     document_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Get delivery status for a document.
 
+    Supports conditional requests: the ETag is a hash of the response, so it
+    changes with the status, send time or recipient, and a matching
+    If-None-Match returns 304.
+
     AC-006-04
     """
-    document = await session.get(MonthlyDocument, document_id)
+    document = await session.get(MonthlyDocument, document_id, options=[STATUS_COLUMNS])
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    return DeliveryStatusResponse(
+    payload = DeliveryStatusResponse(
         document_id=document.id,
         status=document.status.value,
         sent_to_accountant_at=(
@@ -160,86 +214,12 @@ async def get_delivery_status(
         accountant_email=document.accountant_email,
     )
 
+    headers = {
+        "ETag": json_etag(payload),
+        "Cache-Control": f"max-age={STATUS_MAX_AGE_SECONDS}",
+    }
+    if if_none_match == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
-# === Helper Functions ===
-
-
-def _generate_excel(
-    document: MonthlyDocument,
-    transactions: list[Transaction],
-    contexts: dict[str, EnrichedContext],
-) -> bytes:
-    """Generate Excel file for accountant delivery."""
-    wb = Workbook()
-
-    # Sheet 1: Transaction Details
-    ws1 = wb.active
-    ws1.title = "거래 내역"
-
-    # Header
-    headers = ["날짜", "금액", "거래처", "구분", "설명", "계정 분류", "세무 처리"]
-    for col, header in enumerate(headers, 1):
-        cell = ws1.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCE5FF", end_color="CCE5FF", fill_type="solid")
-
-    # Data
-    for row_idx, tx in enumerate(transactions, 2):
-        ctx = contexts.get(tx.id)
-        sign = -1 if tx.type.value == "지출" else 1
-
-        ws1.cell(row=row_idx, column=1, value=tx.date.strftime("%Y-%m-%d"))
-        ws1.cell(row=row_idx, column=2, value=tx.amount * sign)
-        ws1.cell(row=row_idx, column=3, value=tx.counterparty or "")
-        ws1.cell(row=row_idx, column=4, value="정기" if tx.is_recurring else "비정기")
-        ws1.cell(row=row_idx, column=5, value=ctx.ai_generated_summary if ctx else tx.bank_memo or "")
-        ws1.cell(row=row_idx, column=6, value=ctx.account_classification if ctx else "")
-        ws1.cell(row=row_idx, column=7, value=ctx.tax_notes if ctx else "")
-
-    # Adjust column widths
-    ws1.column_dimensions["A"].width = 12
-    ws1.column_dimensions["B"].width = 15
-    ws1.column_dimensions["C"].width = 20
-    ws1.column_dimensions["D"].width = 10
-    ws1.column_dimensions["E"].width = 40
-    ws1.column_dimensions["F"].width = 20
-    ws1.column_dimensions["G"].width = 30
-
-    # Sheet 2: Summary
-    ws2 = wb.create_sheet("요약")
-    ws2.cell(row=1, column=1, value="항목").font = Font(bold=True)
-    ws2.cell(row=1, column=2, value="금액").font = Font(bold=True)
-
-    ws2.cell(row=2, column=1, value="총 입금")
-    ws2.cell(row=2, column=2, value=document.total_income)
-
-    ws2.cell(row=3, column=1, value="총 지출")
-    ws2.cell(row=3, column=2, value=document.total_expense)
-
-    ws2.cell(row=4, column=1, value="순 현금흐름")
-    ws2.cell(row=4, column=2, value=document.total_income - document.total_expense)
-
-    ws2.cell(row=5, column=1, value="총 거래 건수")
-    ws2.cell(row=5, column=2, value=document.total_transactions)
-
-    # Sheet 3: Tax Notes
-    ws3 = wb.create_sheet("세무 처리 메모")
-    ws3.cell(row=1, column=1, value="거래처").font = Font(bold=True)
-    ws3.cell(row=1, column=2, value="금액").font = Font(bold=True)
-    ws3.cell(row=1, column=3, value="세무 처리 메모").font = Font(bold=True)
-
-    row_idx = 2
-    for tx in transactions:
-        ctx = contexts.get(tx.id)
-        if ctx and ctx.tax_notes:
-            ws3.cell(row=row_idx, column=1, value=tx.counterparty or "")
-            ws3.cell(row=row_idx, column=2, value=tx.amount)
-            ws3.cell(row=row_idx, column=3, value=ctx.tax_notes)
-            row_idx += 1
-
-    # Save to buffer
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-
-    return buffer.read()
+    return payload
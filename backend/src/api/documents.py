@@ -4,21 +4,54 @@ Documents API endpoints (US-004, US-005).
 Handles document generation, listing, review, and editing.
 """
 
+import asyncio
+import uuid
 from datetime import datetime
-from typing import Optional
+from tempfile import SpooledTemporaryFile
+from typing import IO, Iterator, Optional
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from src.database import get_session
+from src.api.enrichment import invalidate_cached_context
+from src.database import async_session_maker, get_session
 from src.models import DocumentStatus, EnrichedContext, MonthlyDocument, Transaction
 from src.services.document_service import DocumentService
+from src.services.excel_builder import ExcelBuilder, transaction_row
+from src.utils import TTLCache
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Excel download streaming
+EXCEL_SPOOL_MAX_SIZE = 16 * 1024 * 1024  # Spill to disk above 16MB
+EXCEL_CHUNK_SIZE = 64 * 1024
+
+# Inline edits regenerate the document once editing pauses
+REGENERATE_DEBOUNCE_SECONDS = 2.0
+_pending_regenerations: dict[str, int] = {}  # document_id -> latest edit token
+
+# Columns used by document summaries (skips the large document_markdown)
+SUMMARY_COLUMNS = load_only(
+    MonthlyDocument.id,
+    MonthlyDocument.month,
+    MonthlyDocument.total_transactions,
+    MonthlyDocument.total_income,
+    MonthlyDocument.total_expense,
+    MonthlyDocument.recurring_count,
+    MonthlyDocument.non_recurring_count,
+    MonthlyDocument.pending_count,
+    MonthlyDocument.status,
+    MonthlyDocument.generated_at,
+)
+
+# Excel previews keyed by "document_id:document_version"
+_preview_cache = TTLCache(ttl_seconds=60)
+
 
 # === Pydantic Models ===
 
@@ -87,11 +120,32 @@ class UpdateDocumentRequest(BaseModel):
     updates: dict  # {"description": "...", "account_classification": "..."}
 
 
+class BatchUpdateRequest(BaseModel):
+    """Request for applying several inline edits at once."""
+
+    updates: list[UpdateDocumentRequest]
+
+
 class UpdateDocumentResponse(BaseModel):
-    """Response after document update."""
+    """
+    Response after document update.
+
+    `regeneration` is "scheduled" when the document is re-rendered in the
+    background after the response; `document_version` is then still the
+    version from before the edit. It is "completed" when the document was
+    regenerated before responding.
+    """
 
     status: str
     document_version: int
+    regeneration: str
+
+
+class ReviewDocumentResponse(BaseModel):
+    """Response after marking a document reviewed."""
+
+    status: str
+    reviewed_at: str
 
 
 class ExcelPreviewRow(BaseModel):
@@ -106,6 +160,10 @@ class ExcelPreviewRow(BaseModel):
     tax_notes: str
 
 
+# Field order matches excel_builder.transaction_row columns
+PREVIEW_ROW_FIELDS = tuple(ExcelPreviewRow.model_fields)
+
+
 class ExcelPreviewResponse(BaseModel):
     """Excel preview data."""
 
@@ -117,8 +175,8 @@ class ExcelPreviewResponse(BaseModel):
 
 
 def document_to_summary(doc: MonthlyDocument) -> DocumentSummary:
-    """Convert MonthlyDocument to summary."""
-    return DocumentSummary(
+    """Convert MonthlyDocument to summary (ORM values are trusted, so validation is skipped)."""
+    return DocumentSummary.model_construct(
         id=doc.id,
         month=doc.month,
         total_transactions=doc.total_transactions,
@@ -133,8 +191,8 @@ def document_to_summary(doc: MonthlyDocument) -> DocumentSummary:
 
 
 def document_to_response(doc: MonthlyDocument) -> DocumentResponse:
-    """Convert MonthlyDocument to response."""
-    return DocumentResponse(
+    """Convert MonthlyDocument to response (ORM values are trusted, so validation is skipped)."""
+    return DocumentResponse.model_construct(
         id=doc.id,
         user_id=doc.user_id,
         month=doc.month,
@@ -196,27 +254,43 @@ async def generate_document(
     )
 
 
-@router.get("/", response_model=list[DocumentSummary])
+@router.get("/", response_model=list[DocumentSummary], response_model_exclude_none=True)
 async def list_documents(
+    response: Response,
     user_id: str = Query("default", description="User ID"),
     year: Optional[int] = Query(None, description="Filter by year"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    before_month: Optional[str] = Query(
+        None, description="Cursor: only documents before this month (YYYY-MM)"
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """
-    List all documents for a user.
+    List documents for a user, newest month first.
 
-    Optionally filter by year.
+    Optionally filter by year. Results are paginated by month: when a full
+    page is returned, the X-Next-Cursor header holds the `before_month`
+    value for the next page.
     """
-    query = select(MonthlyDocument).where(MonthlyDocument.user_id == user_id)
+    query = (
+        select(MonthlyDocument)
+        .options(SUMMARY_COLUMNS)
+        .where(MonthlyDocument.user_id == user_id)
+    )
 
     if year:
         query = query.where(MonthlyDocument.month.startswith(str(year)))
+    if before_month:
+        query = query.where(MonthlyDocument.month < before_month)
 
-    query = query.order_by(MonthlyDocument.month.desc())
+    query = query.order_by(MonthlyDocument.month.desc()).limit(limit)
 
     result = await session.execute(query)
     documents = result.scalars().all()
 
+    if len(documents) == limit:
+        response.headers["X-Next-Cursor"] = documents[-1].month
+
     return [document_to_summary(doc) for doc in documents]
 
 
@@ -240,13 +314,17 @@ async def get_document(
 async def update_document(
     document_id: str,
     request: UpdateDocumentRequest,
+    background_tasks: BackgroundTasks,
     session: AsyncSession = Depends(get_session),
 ):
     """
     Update document (inline edit).
 
-    Updates the EnrichedContext for the specified transaction
-    and regenerates the document.
+    Updates the EnrichedContext for the specified transaction and
+    schedules a debounced regeneration of the document, so a burst of
+    edits is rendered once instead of on every request. The returned
+    document_version is the one before the edit; the bump shows once
+    the regeneration has run.
 
     AC-005-03
     """
@@ -254,6 +332,31 @@ async def update_document(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
+    await _apply_context_updates(session, request)
+
+    # Persist the edit before the background regeneration reads it
+    await session.commit()
+    _preview_cache.pop(_preview_cache_key(document))
+    invalidate_cached_context(request.transaction_id)
+
+    _schedule_regeneration(background_tasks, document)
+
+    return UpdateDocumentResponse(
+        status="success",
+        document_version=document.document_version,
+        regeneration="scheduled",
+    )
+
+
+async def _apply_context_updates(session: AsyncSession, request: UpdateDocumentRequest) -> None:
+    """
+    Apply an inline edit to a transaction's EnrichedContext.
+
+    Creates the context if the transaction does not have one yet.
+
+    Raises:
+        HTTPException: If the transaction does not exist
+    """
     # Get transaction and context
     transaction = await session.get(Transaction, request.transaction_id)
     if not transaction:
@@ -273,15 +376,77 @@ async def update_document(
                 setattr(context, key, value)
     else:
         # Create new context with updates
-        import uuid
         context = EnrichedContext(
             id=f"EC-{transaction.date.strftime('%Y-%m-%d')}-{uuid.uuid4().hex[:6]}",
             transaction_id=transaction.id,
             **{k: v for k, v in request.updates.items() if hasattr(EnrichedContext, k)}
         )
         session.add(context)
+        # Make the new context visible to later edits in the same batch
+        await session.flush()
+
+
+def _schedule_regeneration(background_tasks: BackgroundTasks, document: MonthlyDocument) -> None:
+    """
+    Schedule a debounced regeneration of a document.
+
+    Only the most recently scheduled regeneration for a document runs;
+    earlier ones find their token superseded and exit.
+
+    Args:
+        background_tasks: Request background task queue
+        document: Document to regenerate
+    """
+    token = _pending_regenerations.get(document.id, 0) + 1
+    _pending_regenerations[document.id] = token
+    background_tasks.add_task(
+        _regenerate_document, document.id, document.user_id, document.month, token
+    )
+
+
+async def _regenerate_document(document_id: str, user_id: str, month: str, token: int) -> None:
+    """Regenerate a document unless a newer edit has been scheduled."""
+    await asyncio.sleep(REGENERATE_DEBOUNCE_SECONDS)
+    if _pending_regenerations.get(document_id) != token:
+        return
+    del _pending_regenerations[document_id]
+
+    year, mon = month.split("-")
+    try:
+        async with async_session_maker() as session:
+            service = DocumentService(session)
+            await service.generate_monthly_document(
+                user_id=user_id,
+                year=int(year),
+                month=int(mon),
+            )
+    except Exception as e:
+        print(f"Document regeneration failed for {document_id}: {e}")
+
+
+@router.put("/{document_id}/batch", response_model=UpdateDocumentResponse)
+async def batch_update_document(
+    document_id: str,
+    request: BatchUpdateRequest,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Apply several inline edits in one request.
+
+    All EnrichedContext changes are committed together and the document
+    is regenerated once at the end.
+    """
+    document = await session.get(MonthlyDocument, document_id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+
+    for update in request.updates:
+        await _apply_context_updates(session, update)
+    _preview_cache.pop(_preview_cache_key(document))
+
+    # Supersede any debounced regeneration from earlier single edits
+    _pending_regenerations.pop(document.id, None)
 
-    # Regenerate document
     year, month = document.month.split("-")
     service = DocumentService(session)
     updated_doc = await service.generate_monthly_document(
@@ -289,14 +454,18 @@ async def update_document(
         year=int(year),
         month=int(month),
     )
+    # generate_monthly_document committed the edits
+    for update in request.updates:
+        invalidate_cached_context(update.transaction_id)
 
     return UpdateDocumentResponse(
         status="success",
         document_version=updated_doc.document_version,
+        regeneration="completed",
     )
 
 
-@router.post("/{document_id}/review")
+@router.post("/{document_id}/review", response_model=ReviewDocumentResponse)
 async def mark_reviewed(
     document_id: str,
     session: AsyncSession = Depends(get_session),
@@ -306,7 +475,13 @@ async def mark_reviewed(
 
     AC-005-06
     """
-    document = await session.get(MonthlyDocument, document_id)
+    document = await session.get(
+        MonthlyDocument,
+        document_id,
+        options=[
+            load_only(MonthlyDocument.id, MonthlyDocument.status, MonthlyDocument.reviewed_at)
+        ],
+    )
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
@@ -315,10 +490,14 @@ async def mark_reviewed(
 
     await session.commit()
 
-    return {"status": "success", "reviewed_at": document.reviewed_at.isoformat()}
+    return ReviewDocumentResponse(status="success", reviewed_at=document.reviewed_at.isoformat())
 
 
-@router.get("/{document_id}/excel-preview", response_model=ExcelPreviewResponse)
+@router.get(
+    "/{document_id}/excel-preview",
+    response_model=ExcelPreviewResponse,
+    response_model_exclude_none=True,
+)
 async def excel_preview(
     document_id: str,
     session: AsyncSession = Depends(get_session),
@@ -334,47 +513,24 @@ async def excel_preview(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Get transactions for the month
-    year, month = document.month.split("-")
-    start_date = datetime(int(year), int(month), 1)
-    if int(month) == 12:
-        end_date = datetime(int(year) + 1, 1, 1)
-    else:
-        end_date = datetime(int(year), int(month) + 1, 1)
-
-    tx_query = (
-        select(Transaction)
-        .where(Transaction.date >= start_date)
-        .where(Transaction.date < end_date)
-        .where(Transaction.is_internal_transfer == False)  # noqa: E712
-        .order_by(Transaction.date)
-    )
-    tx_result = await session.execute(tx_query)
-    transactions = tx_result.scalars().all()
-
-    # Get contexts
-    tx_ids = [tx.id for tx in transactions]
-    ctx_query = select(EnrichedContext).where(EnrichedContext.transaction_id.in_(tx_ids))
-    ctx_result = await session.execute(ctx_query)
-    contexts = {ctx.transaction_id: ctx for ctx in ctx_result.scalars().all()}
-
-    # Build preview rows
-    rows = []
-    for tx in transactions:
-        ctx = contexts.get(tx.id)
-        sign = -1 if tx.type.value == "지출" else 1
-
-        rows.append(ExcelPreviewRow(
-            date=tx.date.strftime("%Y-%m-%d"),
-            amount=tx.amount * sign,
-            counterparty=tx.counterparty or "",
-            category="정기" if tx.is_recurring else "비정기",
-            description=ctx.ai_generated_summary if ctx else tx.bank_memo or "",
-            account_classification=ctx.account_classification if ctx else "",
-            tax_notes=ctx.tax_notes if ctx else "",
-        ))
-
-    return ExcelPreviewResponse(
+    cache_key = _preview_cache_key(document)
+    cached = _preview_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Get transactions (with contexts) for the month
+    service = DocumentService(session)
+    transactions = await service.get_month_transactions(document.month)
+
+    # Build preview rows (same values as the Excel sheet; already typed, so skip validation)
+    rows = [
+        ExcelPreviewRow.model_construct(
+            **dict(zip(PREVIEW_ROW_FIELDS, transaction_row(tx, tx.enriched_context)))
+        )
+        for tx in transactions
+    ]
+
+    preview = ExcelPreviewResponse(
         rows=rows,
         summary={
             "total_transactions": document.total_transactions,
@@ -383,6 +539,13 @@ async def excel_preview(
             "net_flow": document.total_income - document.total_expense,
         },
     )
+    _preview_cache.set(cache_key, preview)
+    return preview
+
+
+def _preview_cache_key(document: MonthlyDocument) -> str:
+    """Cache key for a document's Excel preview."""
+    return f"{document.id}:{document.document_version}"
 
 
 @router.get("/{document_id}/download")
@@ -399,73 +562,30 @@ async def download_excel(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Get preview data
-    preview = await excel_preview(document_id, session)
-
-    # Generate Excel using openpyxl
-    from io import BytesIO
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill
-
-    wb = Workbook()
-
-    # Sheet 1: Transaction Details
-    ws1 = wb.active
-    ws1.title = "거래 내역"
-
-    # Header
-    headers = ["날짜", "금액", "거래처", "구분", "설명", "계정 분류", "세무 처리"]
-    for col, header in enumerate(headers, 1):
-        cell = ws1.cell(row=1, column=col, value=header)
-        cell.font = Font(bold=True)
-        cell.fill = PatternFill(start_color="CCE5FF", end_color="CCE5FF", fill_type="solid")
-
-    # Data
-    for row_idx, row in enumerate(preview.rows, 2):
-        ws1.cell(row=row_idx, column=1, value=row.date)
-        ws1.cell(row=row_idx, column=2, value=row.amount)
-        ws1.cell(row=row_idx, column=3, value=row.counterparty)
-        ws1.cell(row=row_idx, column=4, value=row.category)
-        ws1.cell(row=row_idx, column=5, value=row.description)
-        ws1.cell(row=row_idx, column=6, value=row.account_classification)
-        ws1.cell(row=row_idx, column=7, value=row.tax_notes)
-
-    # Adjust column widths
-    ws1.column_dimensions["A"].width = 12
-    ws1.column_dimensions["B"].width = 15
-    ws1.column_dimensions["C"].width = 20
-    ws1.column_dimensions["D"].width = 10
-    ws1.column_dimensions["E"].width = 40
-    ws1.column_dimensions["F"].width = 20
-    ws1.column_dimensions["G"].width = 30
-
-    # Sheet 2: Summary
-    ws2 = wb.create_sheet("요약")
-    ws2.cell(row=1, column=1, value="항목").font = Font(bold=True)
-    ws2.cell(row=1, column=2, value="금액").font = Font(bold=True)
-
-    ws2.cell(row=2, column=1, value="총 입금")
-    ws2.cell(row=2, column=2, value=preview.summary["total_income"])
-
-    ws2.cell(row=3, column=1, value="총 지출")
-    ws2.cell(row=3, column=2, value=preview.summary["total_expense"])
-
-    ws2.cell(row=4, column=1, value="순 현금흐름")
-    ws2.cell(row=4, column=2, value=preview.summary["net_flow"])
-
-    ws2.cell(row=5, column=1, value="총 거래 건수")
-    ws2.cell(row=5, column=2, value=preview.summary["total_transactions"])
-
-    # Save to buffer
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-
-    # Generate filename
+    # Stream the month's transactions (with contexts) into the write-only workbook
+    service = DocumentService(session)
+    builder = ExcelBuilder(document)
+    await builder.add_transactions(service.stream_month_transactions(document.month))
+
+    # Save to a spooled file (kept in memory up to 16MB, then spilled to disk)
+    spool = SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE)
+    await builder.save_async(spool)
+    spool.seek(0)
+
+    # Generate filename (RFC 5987 encoding for the Korean characters)
     filename = f"{document.month}_입출금내역.xlsx"
 
     return StreamingResponse(
-        buffer,
+        _iter_file(spool),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"},
     )
+
+
+def _iter_file(file: IO[bytes], chunk_size: int = EXCEL_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's content in fixed-size chunks and close it afterwards."""
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
@@ -5,24 +5,46 @@ Handles smart questions generation, answer submission, and context storage.
 """
 
 import os
+import re
 import shutil
 import uuid
 from datetime import datetime
-from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from pydantic import BaseModel
-from sqlalchemy import select
+import aiofiles
+import aiofiles.os
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Response, UploadFile
+from pydantic import BaseModel, Field
+from sqlalchemy import Executable, Row, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from src.api.transactions import READ_MAX_AGE_SECONDS, invalidate_cached_transaction
 from src.config import get_settings
 from src.database import get_session
 from src.models import EnrichedContext, Transaction, TransactionStatus
-from src.services.ai_service import AIService
+from src.services.ai_service import AIService, get_ai_service
+from src.utils import TTLCache, json_etag
 
 router = APIRouter(prefix="/enrichment", tags=["enrichment"])
 
+# Similar past transactions shown to the AI per question request
+PAST_PATTERN_LIMIT = 5
+
+# Each batch entry is a separate Claude request, so batches are capped
+BATCH_QUESTIONS_MAX = 100
+
+# Uploaded documents are streamed to disk in chunks and capped at 10MB
+UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1 << 20
+UPLOAD_ALLOWED_EXTENSIONS = frozenset({".jpeg", ".jpg", ".pdf", ".png"})
+
+# Anything outside word characters, dot and dash is replaced in stored filenames
+UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+
+# (response, ETag) per transaction_id; dropped whenever the context is written
+_context_cache = TTLCache(ttl_seconds=30, max_entries=1024)
+
 
 # === Pydantic Models ===
 
@@ -33,6 +55,12 @@ class GenerateQuestionsRequest(BaseModel):
     transaction_id: str
 
 
+class BatchGenerateQuestionsRequest(BaseModel):
+    """Request for generating smart questions for several transactions."""
+
+    transaction_ids: list[str] = Field(min_length=1, max_length=BATCH_QUESTIONS_MAX)
+
+
 class QuestionOption(BaseModel):
     """Single question with options."""
 
@@ -94,6 +122,12 @@ class EnrichedContextResponse(BaseModel):
         from_attributes = True
 
 
+# Columns selected for read-only context responses (no ORM object needed)
+CONTEXT_RESPONSE_COLUMNS = tuple(
+    EnrichedContext.__table__.c[name] for name in EnrichedContextResponse.model_fields
+)
+
+
 class FileUploadResponse(BaseModel):
     """Response after file upload."""
 
@@ -105,8 +139,8 @@ class FileUploadResponse(BaseModel):
 # === Helper Functions ===
 
 
-def context_to_response(ctx: EnrichedContext) -> EnrichedContextResponse:
-    """Convert EnrichedContext model to response."""
+def context_to_response(ctx: EnrichedContext | Row) -> EnrichedContextResponse:
+    """Convert an EnrichedContext model (or a CONTEXT_RESPONSE_COLUMNS row) to response."""
     return EnrichedContextResponse(
         id=ctx.id,
         transaction_id=ctx.transaction_id,
@@ -124,6 +158,49 @@ def context_to_response(ctx: EnrichedContext) -> EnrichedContextResponse:
     )
 
 
+def transaction_to_ai_data(tx: Transaction) -> dict:
+    """Convert Transaction model to the dict passed to AIService."""
+    return {
+        "id": tx.id,
+        "date": tx.date.strftime("%Y-%m-%d"),
+        "time": tx.time or "",
+        "amount": tx.amount,
+        "type": tx.type.value,
+        "counterparty": tx.counterparty or "",
+        "bank_memo": tx.bank_memo or "",
+        "bank_name": tx.bank_name,
+    }
+
+
+def transaction_to_past_pattern(tx: Transaction) -> dict:
+    """Convert a similar past Transaction to a pattern dict for AIService."""
+    return {
+        "date": tx.date.strftime("%Y-%m-%d"),
+        "amount": tx.amount,
+        "counterparty": tx.counterparty,
+    }
+
+
+def questions_to_response(transaction_id: str, result: dict) -> GenerateQuestionsResponse:
+    """Convert AIService question result to response."""
+    questions = [
+        QuestionOption(
+            id=q["id"],
+            text=q["text"],
+            options=q["options"],
+            type=q.get("type", "single_choice"),
+        )
+        for q in result.get("questions", [])
+    ]
+
+    return GenerateQuestionsResponse(
+        transaction_id=transaction_id,
+        questions=questions,
+        confidence=result.get("confidence", 0.7),
+        category_suggestion=result.get("category_suggestion"),
+    )
+
+
 # === Endpoints ===
 
 
@@ -131,6 +208,7 @@ def context_to_response(ctx: EnrichedContext) -> EnrichedContextResponse:
 async def generate_questions(
     request: GenerateQuestionsRequest,
     session: AsyncSession = Depends(get_session),
+    ai_service: AIService = Depends(get_ai_service),
 ):
     """
     Generate smart questions for a transaction.
@@ -145,64 +223,90 @@ async def generate_questions(
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Prepare transaction data for AI
-    tx_data = {
-        "id": transaction.id,
-        "date": transaction.date.strftime("%Y-%m-%d"),
-        "time": transaction.time or "",
-        "amount": transaction.amount,
-        "type": transaction.type.value,
-        "counterparty": transaction.counterparty or "",
-        "bank_memo": transaction.bank_memo or "",
-        "bank_name": transaction.bank_name,
-    }
-
     # Find past patterns (similar transactions)
     past_query = (
         select(Transaction)
         .where(Transaction.counterparty == transaction.counterparty)
         .where(Transaction.id != transaction.id)
         .order_by(Transaction.date.desc())
-        .limit(5)
+        .limit(PAST_PATTERN_LIMIT)
     )
     past_result = await session.execute(past_query)
-    past_transactions = past_result.scalars().all()
-
-    past_patterns = [
-        {
-            "date": tx.date.strftime("%Y-%m-%d"),
-            "amount": tx.amount,
-            "counterparty": tx.counterparty,
-        }
-        for tx in past_transactions
-    ]
+    past_patterns = [transaction_to_past_pattern(tx) for tx in past_result.scalars()]
 
     # Generate questions
-    ai_service = AIService()
-    result = await ai_service.generate_smart_questions(tx_data, past_patterns)
+    result = await ai_service.generate_smart_questions(
+        transaction_to_ai_data(transaction), past_patterns
+    )
 
-    questions = [
-        QuestionOption(
-            id=q["id"],
-            text=q["text"],
-            options=q["options"],
-            type=q.get("type", "single_choice"),
+    return questions_to_response(request.transaction_id, result)
+
+
+@router.post("/questions/batch", response_model=list[GenerateQuestionsResponse])
+async def generate_questions_batch(
+    request: BatchGenerateQuestionsRequest,
+    session: AsyncSession = Depends(get_session),
+    ai_service: AIService = Depends(get_ai_service),
+):
+    """
+    Generate smart questions for several transactions at once.
+
+    Loads the transactions and their past patterns in two queries, then
+    generates the questions concurrently (see generate_smart_questions_batch).
+    """
+    tx_result = await session.execute(
+        select(Transaction).where(Transaction.id.in_(request.transaction_ids))
+    )
+    transactions = {tx.id: tx for tx in tx_result.scalars()}
+
+    missing = [tx_id for tx_id in request.transaction_ids if tx_id not in transactions]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Transactions not found: {missing}")
+
+    # Latest transactions per counterparty (enough to fill each pattern list after
+    # excluding the batch's own transactions)
+    counterparties = {tx.counterparty for tx in transactions.values() if tx.counterparty}
+    ranked = (
+        select(
+            Transaction,
+            func.row_number()
+            .over(partition_by=Transaction.counterparty, order_by=Transaction.date.desc())
+            .label("rank"),
         )
-        for q in result.get("questions", [])
-    ]
+        .where(Transaction.counterparty.in_(counterparties))
+        .subquery()
+    )
+    past_tx = aliased(Transaction, ranked)
+    past_result = await session.execute(
+        select(past_tx)
+        .where(ranked.c.rank <= PAST_PATTERN_LIMIT + len(transactions))
+        .order_by(ranked.c.rank)
+    )
+    by_counterparty: dict[Optional[str], list[Transaction]] = {}
+    for tx in past_result.scalars():
+        by_counterparty.setdefault(tx.counterparty, []).append(tx)
 
-    return GenerateQuestionsResponse(
-        transaction_id=request.transaction_id,
-        questions=questions,
-        confidence=result.get("confidence", 0.7),
-        category_suggestion=result.get("category_suggestion"),
+    ordered = [transactions[tx_id] for tx_id in request.transaction_ids]
+    past_patterns = [
+        [
+            transaction_to_past_pattern(past)
+            for past in by_counterparty.get(tx.counterparty, [])
+            if past.id != tx.id
+        ][:PAST_PATTERN_LIMIT]
+        for tx in ordered
+    ]
+    results = await ai_service.generate_smart_questions_batch(
+        [transaction_to_ai_data(tx) for tx in ordered], past_patterns
     )
 
+    return [questions_to_response(tx.id, result) for tx, result in zip(ordered, results)]
+
 
 @router.post("/answers", response_model=SubmitAnswersResponse)
 async def submit_answers(
     request: SubmitAnswersRequest,
     session: AsyncSession = Depends(get_session),
+    ai_service: AIService = Depends(get_ai_service),
 ):
     """
     Submit answers and create EnrichedContext.
@@ -217,7 +321,7 @@ async def submit_answers(
         raise HTTPException(status_code=404, detail="Transaction not found")
 
     # Check if context already exists
-    existing_query = select(EnrichedContext).where(
+    existing_query = select(EnrichedContext.id).where(
         EnrichedContext.transaction_id == request.transaction_id
     )
     existing_result = await session.execute(existing_query)
@@ -240,24 +344,19 @@ async def submit_answers(
     answers_data = [{"question_id": a.question_id, "answer": a.answer} for a in request.answers]
 
     # Generate AI summary
-    ai_service = AIService()
     summary_result = await ai_service.generate_ai_summary(tx_data, answers_data)
 
-    # Extract answers
-    is_recurring = any(
-        "매월" in a.answer or "매주" in a.answer
-        for a in request.answers
-        if a.question_id == "Q2"
-    )
-    frequency = next(
-        (a.answer for a in request.answers if a.question_id == "Q2" and is_recurring),
-        None,
-    )
-
-    # Check document status from answers
-    doc_received = any(
-        "받았" in a.answer for a in request.answers if a.question_id == "Q4"
-    )
+    # Extract recurrence (Q2) and document status (Q4) in one pass over the answers
+    is_recurring = False
+    frequency = None
+    doc_received = False
+    for a in request.answers:
+        if a.question_id == "Q2":
+            if not is_recurring and ("매월" in a.answer or "매주" in a.answer):
+                is_recurring = True
+                frequency = a.answer
+        elif a.question_id == "Q4" and "받았" in a.answer:
+            doc_received = True
     doc_status = "✅ 준비 완료" if doc_received else "⚠️ 준비 필요"
 
     # Create EnrichedContext
@@ -288,6 +387,8 @@ async def submit_answers(
     transaction.is_recurring = is_recurring
 
     await session.commit()
+    invalidate_cached_context(transaction.id)
+    invalidate_cached_transaction(transaction.id)
 
     return SubmitAnswersResponse(
         status="success",
@@ -314,37 +415,40 @@ async def upload_document(
         raise HTTPException(status_code=400, detail="No filename provided")
 
     # Check file extension
-    allowed_extensions = {".pdf", ".jpg", ".jpeg", ".png"}
-    ext = Path(file.filename).suffix.lower()
-    if ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File type not allowed. Allowed: {', '.join(allowed_extensions)}",
-        )
-
-    # Check file size (10MB max)
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large. Max 10MB.")
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in UPLOAD_ALLOWED_EXTENSIONS:
+        allowed = ", ".join(sorted(UPLOAD_ALLOWED_EXTENSIONS))
+        raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed: {allowed}")
 
     # Get transaction
     transaction = await session.get(Transaction, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
 
-    # Create storage directory
-    settings = get_settings()
-    docs_dir = settings.documents_dir
-    docs_dir.mkdir(parents=True, exist_ok=True)
+    # Storage directory is created at startup (see main.lifespan)
+    docs_dir = get_settings().documents_dir
 
     # Generate filename
     date_str = transaction.date.strftime("%Y-%m-%d")
-    new_filename = f"invoice_{transaction_id}_{date_str}{ext}"
+    safe_id = UNSAFE_FILENAME_CHARS.sub("_", transaction_id)
+    new_filename = f"invoice_{safe_id}_{date_str}{ext}"
     file_path = docs_dir / new_filename
 
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Stream to a partial file, enforcing the size cap as chunks arrive
+    partial_path = file_path.with_name(f"{new_filename}.part")
+    total = 0
+    async with aiofiles.open(partial_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > UPLOAD_MAX_SIZE:
+                break
+            await f.write(chunk)
+
+    if total > UPLOAD_MAX_SIZE:
+        await aiofiles.os.remove(partial_path)
+        raise HTTPException(status_code=400, detail="File too large. Max 10MB.")
+
+    await aiofiles.os.replace(partial_path, file_path)
 
     # Update EnrichedContext if exists
     context_query = select(EnrichedContext).where(
@@ -360,6 +464,7 @@ async def upload_document(
         docs["status"] = "✅ 준비 완료"
         context.documents = docs
         await session.commit()
+        invalidate_cached_context(transaction_id)
 
     return FileUploadResponse(
         status="success",
@@ -371,21 +476,45 @@ async def upload_document(
 @router.get("/context/{transaction_id}", response_model=EnrichedContextResponse)
 async def get_enriched_context(
     transaction_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Get EnrichedContext for a transaction.
 
+    Cached in-process until the context is written; a matching
+    If-None-Match returns 304.
+
     AC-003-01
     """
-    query = select(EnrichedContext).where(EnrichedContext.transaction_id == transaction_id)
-    result = await session.execute(query)
-    context = result.scalar_one_or_none()
+    cached = _context_cache.get(transaction_id)
+    if cached is None:
+        query = select(*CONTEXT_RESPONSE_COLUMNS).where(
+            EnrichedContext.transaction_id == transaction_id
+        )
+        result = await session.execute(query)
+        context = result.one_or_none()
 
-    if not context:
-        raise HTTPException(status_code=404, detail="EnrichedContext not found")
+        if not context:
+            raise HTTPException(status_code=404, detail="EnrichedContext not found")
+
+        payload = context_to_response(context)
+        cached = (payload, json_etag(payload))
+        _context_cache.set(transaction_id, cached)
+
+    payload, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={READ_MAX_AGE_SECONDS}"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    return payload
 
-    return context_to_response(context)
+
+def invalidate_cached_context(transaction_id: str) -> None:
+    """Drop a transaction's cached EnrichedContext response after it is written."""
+    _context_cache.pop(transaction_id)
 
 
 @router.put("/context/{transaction_id}", response_model=EnrichedContextResponse)
@@ -399,13 +528,6 @@ async def update_enriched_context(
 
     AC-003-03 - Related transaction linking
     """
-    query = select(EnrichedContext).where(EnrichedContext.transaction_id == transaction_id)
-    result = await session.execute(query)
-    context = result.scalar_one_or_none()
-
-    if not context:
-        raise HTTPException(status_code=404, detail="EnrichedContext not found")
-
     # Update allowed fields
     allowed_fields = [
         "user_memo",
@@ -416,30 +538,46 @@ async def update_enriched_context(
         "related_transaction_ids",
         "tax_notes",
     ]
+    clean_updates = {field: updates[field] for field in allowed_fields if field in updates}
+
+    if clean_updates:
+        # UPDATE ... RETURNING hydrates the context without a refresh SELECT
+        query: Executable = (
+            update(EnrichedContext)
+            .where(EnrichedContext.transaction_id == transaction_id)
+            .values(**clean_updates)
+            .returning(EnrichedContext)
+        )
+    else:
+        query = select(EnrichedContext).where(EnrichedContext.transaction_id == transaction_id)
+    result = await session.execute(query)
+    context = result.scalar_one_or_none()
 
-    for field in allowed_fields:
-        if field in updates:
-            setattr(context, field, updates[field])
+    if not context:
+        raise HTTPException(status_code=404, detail="EnrichedContext not found")
 
     # Handle bidirectional linking for related transactions
-    if "related_transaction_ids" in updates:
-        new_related = updates["related_transaction_ids"]
-        for related_id in new_related:
-            # Get related context
-            related_query = select(EnrichedContext).where(
-                EnrichedContext.transaction_id == related_id
-            )
-            related_result = await session.execute(related_query)
-            related_context = related_result.scalar_one_or_none()
-
-            if related_context:
-                # Add bidirectional link
-                related_ids = related_context.related_transaction_ids or []
-                if transaction_id not in related_ids:
-                    related_ids.append(transaction_id)
-                    related_context.related_transaction_ids = related_ids
+    new_related = set(clean_updates.get("related_transaction_ids") or []) - {transaction_id}
+    if new_related:
+        related_query = select(
+            EnrichedContext.id, EnrichedContext.related_transaction_ids
+        ).where(EnrichedContext.transaction_id.in_(new_related))
+        related_rows = (await session.execute(related_query)).all()
+
+        # Add bidirectional links with one executemany UPDATE by primary key
+        link_updates = []
+        for row in related_rows:
+            related_ids = row.related_transaction_ids or []
+            if transaction_id not in related_ids:
+                link_updates.append(
+                    {"id": row.id, "related_transaction_ids": [*related_ids, transaction_id]}
+                )
+        if link_updates:
+            await session.execute(update(EnrichedContext), link_updates)
 
     await session.commit()
-    await session.refresh(context)
+    invalidate_cached_context(transaction_id)
+    for related_id in new_related:
+        invalidate_cached_context(related_id)
 
     return context_to_response(context)
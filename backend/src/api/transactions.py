@@ -7,18 +7,31 @@ Handles transaction syncing, listing, and retrieval.
 from datetime import date, datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import BaseModel, field_validator
 from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
 from src.models import Transaction, TransactionStatus, TransactionType
 from src.services.popbill_service import PopbillService
-from src.utils import encrypt_value, mask_account_number
+from src.utils import TTLCache, encrypt_value, json_etag, mask_account_number, month_bounds
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+# Rows per INSERT statement (keeps bound parameters under SQLite's limit)
+SYNC_INSERT_BATCH_SIZE = 500
+
+# Direct value -> member lookups (skip the Enum call machinery in per-row loops)
+TRANSACTION_TYPES = {t.value: t for t in TransactionType}
+TRANSACTION_STATUSES = {s.value: s for s in TransactionStatus}
+
+# Single-transaction reads are polled while the user edits; browsers may reuse
+# a response this long, and the server keeps (response, ETag) a little longer
+READ_MAX_AGE_SECONDS = 5
+_transaction_cache = TTLCache(ttl_seconds=30, max_entries=1024)
+
 
 # === Pydantic Models ===
 
@@ -68,6 +81,17 @@ class TransactionResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("account_number_masked", mode="before")
+    @classmethod
+    def _masked_or_empty(cls, value: Optional[str]) -> str:
+        return value or ""
+
+
+# Columns selected for list responses, so rows validate without ORM hydration
+TRANSACTION_RESPONSE_COLUMNS = tuple(
+    Transaction.__table__.c[name] for name in TransactionResponse.model_fields
+)
+
 
 class TransactionListResponse(BaseModel):
     """Response for list transactions endpoint."""
@@ -78,29 +102,6 @@ class TransactionListResponse(BaseModel):
     page_size: int
 
 
-# === Helper Functions ===
-
-
-def transaction_to_response(tx: Transaction) -> TransactionResponse:
-    """Convert Transaction model to response."""
-    return TransactionResponse(
-        id=tx.id,
-        bank_name=tx.bank_name,
-        account_number_masked=tx.account_number_masked or "",
-        date=tx.date,
-        time=tx.time,
-        amount=tx.amount,
-        type=tx.type.value,
-        counterparty=tx.counterparty,
-        bank_memo=tx.bank_memo,
-        is_internal_transfer=tx.is_internal_transfer,
-        is_recurring=tx.is_recurring,
-        status=tx.status.value,
-        created_at=tx.created_at,
-        updated_at=tx.updated_at,
-    )
-
-
 # === Endpoints ===
 
 
@@ -131,44 +132,23 @@ async def sync_transactions(
             {"bank": "우리은행", "account": "987-654-321"},
         ]
 
-    # Fetch transactions from Popbill (or mock)
-    raw_transactions = await popbill.fetch_transactions_batch(
+    # Fetch, check and insert one date window at a time so memory stays bounded
+    new_count = 0
+    internal_transfer_count = 0
+    async for raw_transactions in popbill.fetch_transactions_chunked(
         corp_num="1234567890",  # Would come from UserConfig
         accounts=accounts,
         start_date=request.start_date,
         end_date=request.end_date,
-    )
-
-    # Detect internal transfers
-    internal_transfer_ids = popbill.detect_internal_transfers(raw_transactions)
+    ):
+        # Detect internal transfers (same-day pairs, so per chunk is enough)
+        internal_transfer_ids = set(popbill.detect_internal_transfers(raw_transactions))
+        internal_transfer_count += len(internal_transfer_ids)
 
-    # Save to database
-    new_count = 0
-    for tx_data in raw_transactions:
-        # Check if already exists
-        existing = await session.get(Transaction, tx_data["id"])
-        if existing:
-            continue
-
-        # Create new transaction
-        transaction = Transaction(
-            id=tx_data["id"],
-            bank_name=tx_data["bank_name"],
-            account_number=encrypt_value(tx_data["account_number"]),
-            account_number_masked=mask_account_number(tx_data["account_number"]),
-            date=tx_data["date"],
-            time=tx_data["time"],
-            amount=tx_data["amount"],
-            type=TransactionType(tx_data["type"]),
-            counterparty=tx_data.get("counterparty"),
-            bank_memo=tx_data.get("bank_memo"),
-            is_internal_transfer=tx_data["id"] in internal_transfer_ids,
-            status=TransactionStatus.PENDING_ENRICHMENT,
+        new_count += await _insert_new_transactions(
+            session, raw_transactions, internal_transfer_ids
         )
 
-        session.add(transaction)
-        new_count += 1
-
     await session.commit()
 
     # Get total count
@@ -179,10 +159,64 @@ async def sync_transactions(
         status="success",
         new_transactions=new_count,
         total_transactions=total_count,
-        internal_transfers_detected=len(internal_transfer_ids),
+        internal_transfers_detected=internal_transfer_count,
     )
 
 
+async def _insert_new_transactions(
+    session: AsyncSession,
+    raw_transactions: list[dict],
+    internal_transfer_ids: set[str],
+) -> int:
+    """
+    Insert fetched transactions that are not stored yet.
+
+    Args:
+        session: Database session
+        raw_transactions: Transactions from PopbillService
+        internal_transfer_ids: IDs to mark as internal transfers
+
+    Returns:
+        Number of rows inserted
+    """
+    # Find which fetched transactions are already stored (one query)
+    fetched_ids = [tx_data["id"] for tx_data in raw_transactions]
+    existing_result = await session.execute(
+        select(Transaction.id).where(Transaction.id.in_(fetched_ids))
+    )
+    existing_ids = set(existing_result.scalars())
+
+    # Build rows for new transactions (keyed by ID to drop duplicates within the batch)
+    new_rows = {
+        tx_data["id"]: {
+            "id": tx_data["id"],
+            "bank_name": tx_data["bank_name"],
+            "account_number": encrypt_value(tx_data["account_number"]),
+            "account_number_masked": mask_account_number(tx_data["account_number"]),
+            "date": tx_data["date"],
+            "time": tx_data["time"],
+            "amount": tx_data["amount"],
+            "type": TRANSACTION_TYPES[tx_data["type"]],
+            "counterparty": tx_data.get("counterparty"),
+            "bank_memo": tx_data.get("bank_memo"),
+            "is_internal_transfer": tx_data["id"] in internal_transfer_ids,
+            "status": TransactionStatus.PENDING_ENRICHMENT,
+        }
+        for tx_data in raw_transactions
+        if tx_data["id"] not in existing_ids
+    }
+    rows = list(new_rows.values())
+
+    # Save to database in batched multi-row inserts
+    for i in range(0, len(rows), SYNC_INSERT_BATCH_SIZE):
+        batch = rows[i : i + SYNC_INSERT_BATCH_SIZE]
+        await session.execute(
+            sqlite_insert(Transaction).values(batch).on_conflict_do_nothing(index_elements=["id"])
+        )
+
+    return len(rows)
+
+
 @router.get("/", response_model=TransactionListResponse)
 async def list_transactions(
     month: Optional[str] = Query(None, description="Filter by month (YYYY-MM)"),
@@ -198,48 +232,47 @@ async def list_transactions(
     Supports filtering by month, status, and bank.
     Returns paginated results.
     """
-    # Build query
-    query = select(Transaction)
-
     # Apply filters
+    filters = []
     if month:
         # Filter by year-month
         try:
-            year, mon = month.split("-")
-            start = datetime(int(year), int(mon), 1)
-            if int(mon) == 12:
-                end = datetime(int(year) + 1, 1, 1)
-            else:
-                end = datetime(int(year), int(mon) + 1, 1)
-            query = query.where(Transaction.date >= start, Transaction.date < end)
+            start, end = month_bounds(month)
+            filters += [Transaction.date >= start, Transaction.date < end]
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid month format. Use YYYY-MM")
 
     if status:
-        try:
-            status_enum = TransactionStatus(status)
-            query = query.where(Transaction.status == status_enum)
-        except ValueError:
+        status_enum = TRANSACTION_STATUSES.get(status)
+        if status_enum is None:
             raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+        filters.append(Transaction.status == status_enum)
 
     if bank:
-        query = query.where(Transaction.bank_name == bank)
-
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await session.execute(count_query)
-    total = total_result.scalar() or 0
+        filters.append(Transaction.bank_name == bank)
 
-    # Apply pagination and ordering
-    query = query.order_by(Transaction.date.desc(), Transaction.time.desc())
-    query = query.offset((page - 1) * page_size).limit(page_size)
-
-    # Execute query
+    # Fetch the page and the total match count in one query, as plain rows
+    query = (
+        select(*TRANSACTION_RESPONSE_COLUMNS, func.count().over().label("total"))
+        .where(*filters)
+        .order_by(Transaction.date.desc(), Transaction.time.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
     result = await session.execute(query)
-    transactions = result.scalars().all()
+    rows = result.mappings().all()
+
+    if rows:
+        total = rows[0]["total"]
+    elif page > 1:
+        # Page past the end: no row carries the total, so count separately
+        count_query = select(func.count()).select_from(Transaction).where(*filters)
+        total = (await session.execute(count_query)).scalar() or 0
+    else:
+        total = 0
 
     return TransactionListResponse(
-        transactions=[transaction_to_response(tx) for tx in transactions],
+        transactions=[TransactionResponse.model_validate(row) for row in rows],
         total=total,
         page=page,
         page_size=page_size,
@@ -258,30 +291,53 @@ async def get_pending_transactions(
 
     AC-001-04
     """
+    # Read-only: select plain rows rather than tracking ORM objects
     query = (
-        select(Transaction)
+        select(*TRANSACTION_RESPONSE_COLUMNS)
         .where(Transaction.status == TransactionStatus.PENDING_ENRICHMENT)
         .where(Transaction.is_internal_transfer == False)  # noqa: E712
         .order_by(Transaction.date.desc())
     )
 
     result = await session.execute(query)
-    transactions = result.scalars().all()
 
-    return [transaction_to_response(tx) for tx in transactions]
+    return [TransactionResponse.model_validate(row) for row in result.mappings()]
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
 async def get_transaction(
     transaction_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Get a single transaction by ID.
+
+    Cached in-process until the transaction changes; a matching
+    If-None-Match returns 304.
     """
-    transaction = await session.get(Transaction, transaction_id)
+    cached = _transaction_cache.get(transaction_id)
+    if cached is None:
+        query = select(*TRANSACTION_RESPONSE_COLUMNS).where(Transaction.id == transaction_id)
+        row = (await session.execute(query)).mappings().one_or_none()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+
+        transaction = TransactionResponse.model_validate(row)
+        cached = (transaction, json_etag(transaction))
+        _transaction_cache.set(transaction_id, cached)
+
+    transaction, etag = cached
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={READ_MAX_AGE_SECONDS}"}
+    if if_none_match == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    return transaction
 
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
 
-    return transaction_to_response(transaction)
+def invalidate_cached_transaction(transaction_id: str) -> None:
+    """Drop a transaction's cached response after it is modified."""
+    _transaction_cache.pop(transaction_id)
@@ -3,7 +3,7 @@ Application configuration using Pydantic Settings.
 Loads from environment variables and .env file.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -21,6 +21,10 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/ai_tax_assistant.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_recycle: int = 3600  # Seconds before a pooled connection is replaced
+    create_tables_on_startup: bool = True  # Off when the schema is applied by a deploy step
 
     # Popbill API
     popbill_link_id: str = ""
@@ -33,8 +37,14 @@ class Settings(BaseSettings):
     slack_channel_id: str = ""
     slack_signing_secret: str = ""
 
+    # Frontend
+    web_base_url: str = "http://localhost:3000"  # Linked from Slack messages
+
     # Anthropic API
     anthropic_api_key: str = ""
+    llm_cache_enabled: bool = True  # Reuse AI responses for similar transactions
+    llm_cache_ttl_days: int = 7
+    redis_url: str = ""  # e.g. redis://localhost:6379/0; shares the AI cache across workers
 
     # Email (SMTP)
     smtp_host: str = "smtp.gmail.com"
@@ -42,6 +52,7 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_password: str = ""
     smtp_from: str = ""
+    smtp_pool_size: int = 2  # Persistent SMTP sessions kept open for sends
 
     # Security
     encryption_key: str = ""
@@ -49,9 +60,9 @@ class Settings(BaseSettings):
     # File Storage
     documents_path: str = "~/ai-tax-assistant/documents"
 
-    @property
+    @cached_property
     def documents_dir(self) -> Path:
-        """Get resolved documents directory path."""
+        """Get resolved documents directory path (created at startup)."""
         return Path(self.documents_path).expanduser()
 
     def is_popbill_configured(self) -> bool:
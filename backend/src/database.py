@@ -3,9 +3,28 @@ Database configuration and session management.
 Uses SQLAlchemy 2.0 async with SQLite.
 """
 
+import enum
 from pathlib import Path
-from typing import AsyncGenerator
-
+from typing import Any, AsyncGenerator, Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Integer,
+    SmallInteger,
+    String,
+    Table,
+    TypeDecorator,
+    case,
+    event,
+    func,
+    inspect,
+    select,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -18,6 +37,50 @@ class Base(DeclarativeBase):
     pass
 
 
+class SmallIntEnum(TypeDecorator):
+    """
+    Enum stored as a SMALLINT code (the member's declaration position).
+
+    Narrower rows and indexes than the VARCHAR names sqlalchemy.Enum stores.
+    Only append new members: existing codes must not change.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: type[enum.Enum]):
+        super().__init__()
+        self.enum_class = enum_class
+        self.members = tuple(enum_class)
+        self.codes = {member: code for code, member in enumerate(self.members)}
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self.codes[self.enum_class(value)]
+
+    def process_result_value(self, value: Any, dialect) -> Optional[enum.Enum]:
+        if value is None:
+            return None
+        # int(): columns created as VARCHAR by older schemas return codes as text
+        return self.members[int(value)]
+
+
+# JSON column type: TEXT on SQLite, binary JSONB (parsed once on write) on PostgreSQL
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+# Bump when models change so existing databases get new tables/indexes on startup
+SCHEMA_VERSION = 2
+
+# Schema versions applied to this database
+schema_versions = Table(
+    "schema_versions",
+    Base.metadata,
+    Column("version", Integer, primary_key=True),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
 # Create async engine
 settings = get_settings()
 
@@ -26,12 +89,40 @@ db_path = settings.database_url.replace("sqlite+aiosqlite:///", "")
 if db_path.startswith("./"):
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
 
+is_sqlite = settings.database_url.startswith("sqlite")
+is_memory_db = ":memory:" in settings.database_url or settings.database_url.endswith("://")
+
+# In-memory SQLite uses a single shared connection (StaticPool), which takes no sizing
+pool_options = (
+    {}
+    if is_memory_db
+    else {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+)
+
 engine = create_async_engine(
     settings.database_url,
     echo=False,  # Set to True for SQL debugging
     future=True,
+    **pool_options,
 )
 
+
+if is_sqlite:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Use WAL so readers don't block on a writer."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
 # Create async session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -56,9 +147,55 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables and indexes unless the schema is already current."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_ensure_schema)
+
+
+def _ensure_schema(conn) -> bool:
+    """
+    Create tables and indexes if the database is behind SCHEMA_VERSION.
+
+    Skipping create_all on an up-to-date database avoids its per-table
+    catalog queries on every startup.
+
+    Returns:
+        True if the schema was (re)applied, False if it was already current
+    """
+    if inspect(conn).has_table(schema_versions.name):
+        current = conn.execute(select(func.max(schema_versions.c.version))).scalar()
+        if current is not None and current >= SCHEMA_VERSION:
+            return False
+
+    Base.metadata.create_all(conn)
+    # create_all skips indexes on tables that already exist
+    _create_missing_indexes(conn)
+    _convert_enum_names_to_codes(conn)
+    conn.execute(schema_versions.insert().values(version=SCHEMA_VERSION))
+    return True
+
+
+def _create_missing_indexes(conn) -> None:
+    """Create indexes added to models after their tables were created."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _convert_enum_names_to_codes(conn) -> None:
+    """Rewrite enum names stored by sqlalchemy.Enum columns to SmallIntEnum codes."""
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, SmallIntEnum):
+                continue
+            # Compare the raw stored text, bypassing the code conversion
+            stored = type_coerce(column, String)
+            names = {member.name: code for member, code in column.type.codes.items()}
+            conn.execute(
+                update(table)
+                .where(stored.in_(list(names)))
+                .values({column.name: case(names, value=stored)})
+            )
 
 
 async def close_db() -> None:
@@ -4,13 +4,19 @@ FastAPI application entry point.
 AI Tax Assistant - 월말 문서 작업 10시간 → 10분
 """
 
+import sys
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 from src.api import api_router
+from src.config import get_settings
 from src.database import close_db, init_db
+from src.services.ai_service import get_ai_service
+from src.services.email_service import EmailService
+from src.services.slack_service import close_slack_client, init_slack_client
 
 
 @asynccontextmanager
@@ -18,13 +24,21 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     print("🚀 Starting AI Tax Assistant...")
-    await init_db()
-    print("✅ Database initialized")
+    if get_settings().create_tables_on_startup:
+        await init_db()
+        print("✅ Database initialized")
+    get_settings().documents_dir.mkdir(parents=True, exist_ok=True)
+    app.state.email_service = EmailService()
+    await init_slack_client()
 
     yield
 
     # Shutdown
     print("👋 Shutting down AI Tax Assistant...")
+    await app.state.email_service.close()
+    await close_slack_client()
+    if get_ai_service.cache_info().currsize:
+        await get_ai_service().close()
     await close_db()
     print("✅ Database connections closed")
 
@@ -44,6 +58,8 @@ app = FastAPI(
     """,
     version="1.0.0",
     lifespan=lifespan,
+    # No default_response_class: routes with a response_model are serialized straight
+    # to JSON bytes by Pydantic, which a custom class (e.g. ORJSONResponse) would bypass
 )
 
 # CORS middleware for frontend
@@ -55,6 +71,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (document lists, Excel previews)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include API router
 app.include_router(api_router)
 
@@ -78,4 +97,12 @@ async def health():
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        # uvloop is not available on Windows
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
@@ -3,6 +3,7 @@ SQLAlchemy models for AI Tax Assistant.
 """
 
 from src.models.enriched_context import EnrichedContext
+from src.models.llm_cache import LLMCacheEntry
 from src.models.monthly_document import DocumentStatus, MonthlyDocument
 from src.models.transaction import Transaction, TransactionStatus, TransactionType
 from src.models.user_config import UserConfig
@@ -15,4 +16,5 @@ __all__ = [
     "MonthlyDocument",
     "DocumentStatus",
     "UserConfig",
+    "LLMCacheEntry",
 ]
@@ -5,7 +5,7 @@ EnrichedContext model for storing transaction context and metadata.
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
 from sqlalchemy.dialects.sqlite import JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -24,6 +24,8 @@ class EnrichedContext(Base):
     """
 
     __tablename__ = "enriched_contexts"
+    # Read database-generated timestamps back with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary Key - Format: "EC-2026-02-05-001"
     id: Mapped[str] = mapped_column(String(100), primary_key=True)
@@ -66,13 +68,17 @@ class EnrichedContext(Base):
         },
     )
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=datetime.utcnow)
+    # Timestamps - taken from the database clock; default renders CURRENT_TIMESTAMP
+    # inline so tables created before server_default existed still get a value
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=func.now())
 
-    # Relationships
+    # Relationships - lazy="raise" like Transaction.enriched_context: load it
+    # explicitly (selectinload) rather than one SELECT per context
     transaction: Mapped["Transaction"] = relationship(
-        "Transaction", back_populates="enriched_context"
+        "Transaction", back_populates="enriched_context", lazy="raise"
     )
 
     def __repr__(self) -> str:
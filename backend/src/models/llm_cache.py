@@ -0,0 +1,35 @@
+"""
+LLMCacheEntry model for caching AI responses.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+
+class LLMCacheEntry(Base):
+    """
+    Cached Claude API response.
+
+    Keyed by a SHA-256 of the canonicalized request, so repeated
+    questions/summaries for similar transactions skip the API call.
+    """
+
+    __tablename__ = "llm_cache"
+
+    # SHA-256 hex digest of the canonical request
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    # JSON-encoded response
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Set explicitly on write (LLMCache.set) so a refreshed entry restarts its TTL
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
+
+    def __repr__(self) -> str:
+        return f"<LLMCacheEntry {self.key[:12]}>"
@@ -6,7 +6,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.database import Base
@@ -28,6 +28,12 @@ class MonthlyDocument(Base):
     """
 
     __tablename__ = "monthly_documents"
+    __table_args__ = (
+        # Document list: user_id = ? ORDER BY month DESC, paginated by month
+        Index("ix_md_user_month", "user_id", "month"),
+    )
+    # Read database-generated timestamps back with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary Key - Format: "MD-2026-02"
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
@@ -53,8 +59,10 @@ class MonthlyDocument(Base):
         Enum(DocumentStatus), default=DocumentStatus.GENERATED
     )
 
-    # Timestamps
-    generated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Timestamps - generated_at comes from the database clock (see EnrichedContext)
+    generated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
     reviewed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
     sent_to_accountant_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
@@ -6,24 +6,24 @@ import enum
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import Boolean, DateTime, Enum, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.database import Base
+from src.database import Base, SmallIntEnum
 
 if TYPE_CHECKING:
     from src.models.enriched_context import EnrichedContext
 
 
 class TransactionType(str, enum.Enum):
-    """Transaction type - income or expense."""
+    """Transaction type - income or expense (stored as SmallIntEnum: append only)."""
 
     INCOME = "입금"
     EXPENSE = "지출"
 
 
 class TransactionStatus(str, enum.Enum):
-    """Transaction processing status."""
+    """Transaction processing status (stored as SmallIntEnum: append only)."""
 
     PENDING_ENRICHMENT = "pending_enrichment"  # 맥락 입력 대기
     ENRICHED = "enriched"  # 맥락 입력 완료
@@ -40,6 +40,19 @@ class Transaction(Base):
     """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Monthly queries: is_internal_transfer = false AND date in range ORDER BY date
+        Index("ix_tx_active_date", "is_internal_transfer", "date"),
+        # Pending list: status = ? AND is_internal_transfer = false ORDER BY date DESC
+        Index("ix_tx_status_internal_date", "status", "is_internal_transfer", "date"),
+        # Past patterns: counterparty = ? ORDER BY date DESC
+        Index("ix_tx_counterparty_date", "counterparty", "date"),
+        # Transaction list: date range / ORDER BY date DESC, bank filter
+        Index("ix_tx_date", "date"),
+        Index("ix_tx_bank", "bank_name"),
+    )
+    # Read database-generated timestamps back with RETURNING instead of a refresh
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary Key - Format: "2026-02-05-IBK-AWS-001"
     id: Mapped[str] = mapped_column(String(100), primary_key=True)
@@ -53,7 +66,7 @@ class Transaction(Base):
     date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     time: Mapped[Optional[str]] = mapped_column(String(10))  # "14:30:00"
     amount: Mapped[int] = mapped_column(Integer, nullable=False)  # 원 단위
-    type: Mapped[TransactionType] = mapped_column(Enum(TransactionType), nullable=False)
+    type: Mapped[TransactionType] = mapped_column(SmallIntEnum(TransactionType), nullable=False)
     counterparty: Mapped[Optional[str]] = mapped_column(String(255))  # "AWS Korea"
     bank_memo: Mapped[Optional[str]] = mapped_column(Text)  # 은행 앱 메모
 
@@ -61,16 +74,19 @@ class Transaction(Base):
     is_internal_transfer: Mapped[bool] = mapped_column(Boolean, default=False)
     is_recurring: Mapped[bool] = mapped_column(Boolean, default=False)
     status: Mapped[TransactionStatus] = mapped_column(
-        Enum(TransactionStatus), default=TransactionStatus.PENDING_ENRICHMENT
+        SmallIntEnum(TransactionStatus), default=TransactionStatus.PENDING_ENRICHMENT
     )
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=datetime.utcnow)
+    # Timestamps - SQL defaults, so bulk inserts render CURRENT_TIMESTAMP in the
+    # statement instead of calling Python once per row
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=func.now())
 
     # Relationships
     enriched_context: Mapped[Optional["EnrichedContext"]] = relationship(
-        "EnrichedContext", back_populates="transaction", uselist=False
+        "EnrichedContext", back_populates="transaction", uselist=False, lazy="raise"
     )
 
     def __repr__(self) -> str:
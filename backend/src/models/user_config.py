@@ -5,11 +5,10 @@ UserConfig model for storing user settings.
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import DateTime, String
-from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy import DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
-from src.database import Base
+from src.database import Base, JSONDocument
 
 
 class UserConfig(Base):
@@ -35,7 +34,7 @@ class UserConfig(Base):
     #   {"bank": "기업은행", "account_number_encrypted": "...", "popbill_quick_query": true},
     #   {"bank": "우리은행", "account_number_encrypted": "...", "popbill_quick_query": true}
     # ]
-    accounts: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list)
+    accounts: Mapped[list[dict[str, Any]]] = mapped_column(JSONDocument, default=list)
 
     # Query Settings
     query_interval: Mapped[str] = mapped_column(String(20), default="daily")
@@ -51,9 +50,11 @@ class UserConfig(Base):
     # File Storage - None = auto (home directory based)
     documents_path: Mapped[Optional[str]] = mapped_column(String(500))
 
-    # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=datetime.utcnow)
+    # Timestamps - taken from the database clock (UTC), like the other models
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.now(), server_default=func.now()
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, onupdate=func.now())
 
     def __repr__(self) -> str:
         return f"<UserConfig {self.id}: {len(self.accounts)} accounts>"
@@ -5,10 +5,18 @@ Uses Claude API (Anthropic) with tax law context for accurate questions.
 Includes hallucination prevention techniques.
 """
 
-import json
-from typing import Any, Optional
+import asyncio
+import importlib.util
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+import httpx
+import orjson
 
 from src.config import get_settings
+from src.services.llm_cache import LLMCache, create_llm_cache
 
 
 # System prompt for hallucination prevention
@@ -21,89 +29,221 @@ SYSTEM_PROMPT = """당신은 한국 세무/회계 전문 AI 어시스턴트입
 4. 모든 응답에 신뢰도(confidence)를 포함하세요
 
 응답 형식:
-- 항상 JSON 형식으로 응답하세요
-- questions 배열에 질문들을 포함하세요
+- 요청된 도구(tool) 또는 JSON 형식으로만 응답하세요
 - 각 질문에는 id, text, options, type 필드가 필요합니다"""
 
+# Static instructions for question generation. Kept in the system prompt,
+# byte-identical on every call, so the prefix can be served from the prompt cache.
+QUESTION_INSTRUCTIONS = """거래 정보를 분석하고 세무사가 필요로 할 맥락 정보를 수집하기 위한 질문을 생성해주세요.
+
+## 요청사항
+1. 세무사가 이 거래를 이해하는 데 필요한 질문 3-5개를 생성해주세요
+2. 각 질문은 객관식(2-4개 옵션)으로 만들어주세요
+3. 증빙 서류 관련 질문을 반드시 포함해주세요
+4. emit_questions 도구로 응답해주세요"""
+
+QUESTION_SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_PROMPT},
+    {"type": "text", "text": QUESTION_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}},
+]
+
+# Static summary instructions, cached the same way as QUESTION_INSTRUCTIONS
+SUMMARY_INSTRUCTIONS = """거래 정보와 유저 답변을 바탕으로 세무사에게 전달할 요약을 작성해주세요.
+
+## 요청사항
+세무사가 이해할 수 있는 2-3문장 요약을 작성해주세요.
+계정 분류, 세무 처리 관련 메모도 포함해주세요.
+
+응답 형식 (JSON만):
+{
+  "summary": "요약 내용",
+  "account_classification": "계정 분류",
+  "tax_notes": "세무 처리 메모"
+}"""
+
+SUMMARY_SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_PROMPT},
+    {"type": "text", "text": SUMMARY_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}},
+]
+
+# Tool the model must call, so nested question lists arrive as schema-validated
+# input instead of JSON embedded in prose
+QUESTIONS_TOOL = {
+    "name": "emit_questions",
+    "description": "거래 맥락 수집을 위한 객관식 질문을 반환합니다.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "questions": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "string"},
+                        "text": {"type": "string"},
+                        "options": {"type": "array", "items": {"type": "string"}},
+                        "type": {"type": "string", "enum": ["single_choice", "file_upload"]},
+                    },
+                    "required": ["id", "text", "options", "type"],
+                },
+            },
+            "confidence": {"type": "number"},
+            "category_suggestion": {"type": "string"},
+        },
+        "required": ["questions", "confidence"],
+    },
+}
+
+QUESTION_FIELDS = ("id", "text", "options", "type")
+
+# Output caps. Routine transactions (known category) go to the faster, cheaper
+# model with a smaller cap; only ambiguous ones get the full model.
+QUESTION_MAX_TOKENS = 2048
+FAST_QUESTION_MAX_TOKENS = 768
+RELATIONSHIP_MAX_TOKENS = 256  # 2-3 sentences
+
+# Concurrent API calls when generating questions for several transactions
+QUESTION_CONCURRENCY = 8
+
+# Connections kept open to the API; covers QUESTION_CONCURRENCY plus other requests.
+# Kept alive, so concurrent calls reuse warm TLS connections instead of reconnecting.
+API_MAX_CONNECTIONS = 32
+
+SUMMARY_FIELDS = ("summary", "account_classification", "tax_notes")
+
+# Summaries are a flat object, so the assistant turn is prefilled with "{" instead
+# of using a tool: cheaper and faster, and the reply is the JSON body as-is
+SUMMARY_PREFILL = "{"
+
+
+def _freeze_questions(questions: list[dict]) -> tuple[Mapping[str, Any], ...]:
+    """Make template questions read-only so callers cannot alter the shared copies."""
+    return tuple(MappingProxyType({**q, "options": tuple(q["options"])}) for q in questions)
+
 
 # Question templates for common transaction types
 QUESTION_TEMPLATES = {
-    "expense": [
-        {
-            "id": "Q1",
-            "text": "이 지출의 주요 목적은 무엇인가요?",
-            "options": ["사업운영", "개발/연구", "마케팅", "인건비", "기타"],
-            "type": "single_choice",
-        },
-        {
-            "id": "Q2",
-            "text": "정기적으로 발생하는 지출인가요?",
-            "options": ["네, 매월 반복", "네, 매주 반복", "아니오, 일회성", "불규칙"],
-            "type": "single_choice",
-        },
-        {
-            "id": "Q3",
-            "text": "다른 거래와 관련이 있나요?",
-            "options": ["별개 거래", "관련 있음 (직접 입력)", "모르겠음"],
-            "type": "single_choice",
-        },
-        {
-            "id": "Q4",
-            "text": "📎 계산서/영수증을 받으셨나요?",
-            "options": ["네, 받았어요", "아니오", "요청 예정"],
-            "type": "single_choice",
-        },
-        {
-            "id": "Q5",
-            "text": "📤 증빙 서류를 업로드하시겠어요?",
-            "options": ["파일 업로드", "나중에", "증빙 없음"],
-            "type": "file_upload",
-        },
-    ],
-    "income": [
-        {
-            "id": "Q1",
-            "text": "이 입금의 출처는 무엇인가요?",
-            "options": ["매출 (서비스/제품)", "투자금", "대출", "환불", "기타"],
-            "type": "single_choice",
-        },
-        {
-            "id": "Q2",
-            "text": "세금계산서 발행이 필요한가요?",
-            "options": ["이미 발행함", "발행 예정", "발행 불필요", "확인 필요"],
-            "type": "single_choice",
-        },
-    ],
+    "expense": _freeze_questions(
+        [
+            {
+                "id": "Q1",
+                "text": "이 지출의 주요 목적은 무엇인가요?",
+                "options": ["사업운영", "개발/연구", "마케팅", "인건비", "기타"],
+                "type": "single_choice",
+            },
+            {
+                "id": "Q2",
+                "text": "정기적으로 발생하는 지출인가요?",
+                "options": ["네, 매월 반복", "네, 매주 반복", "아니오, 일회성", "불규칙"],
+                "type": "single_choice",
+            },
+            {
+                "id": "Q3",
+                "text": "다른 거래와 관련이 있나요?",
+                "options": ["별개 거래", "관련 있음 (직접 입력)", "모르겠음"],
+                "type": "single_choice",
+            },
+            {
+                "id": "Q4",
+                "text": "📎 계산서/영수증을 받으셨나요?",
+                "options": ["네, 받았어요", "아니오", "요청 예정"],
+                "type": "single_choice",
+            },
+            {
+                "id": "Q5",
+                "text": "📤 증빙 서류를 업로드하시겠어요?",
+                "options": ["파일 업로드", "나중에", "증빙 없음"],
+                "type": "file_upload",
+            },
+        ]
+    ),
+    "income": _freeze_questions(
+        [
+            {
+                "id": "Q1",
+                "text": "이 입금의 출처는 무엇인가요?",
+                "options": ["매출 (서비스/제품)", "투자금", "대출", "환불", "기타"],
+                "type": "single_choice",
+            },
+            {
+                "id": "Q2",
+                "text": "세금계산서 발행이 필요한가요?",
+                "options": ["이미 발행함", "발행 예정", "발행 불필요", "확인 필요"],
+                "type": "single_choice",
+            },
+        ]
+    ),
 }
 
 # Category-specific questions
 CATEGORY_QUESTIONS = {
-    "AWS": [
-        {
-            "id": "Q_AWS",
-            "text": "AWS 비용의 주 용도는?",
-            "options": ["개발 서버", "프로덕션 서버", "데이터 저장", "AI/ML 서비스"],
-            "type": "single_choice",
-        },
-    ],
-    "급여": [
-        {
-            "id": "Q_SALARY",
-            "text": "이 급여 지급 대상은?",
-            "options": ["정규직", "계약직", "프리랜서", "아르바이트"],
-            "type": "single_choice",
-        },
-    ],
-    "마케팅": [
-        {
-            "id": "Q_MARKETING",
-            "text": "마케팅 유형은?",
-            "options": ["온라인 광고", "오프라인 광고", "이벤트/프로모션", "콘텐츠 제작"],
-            "type": "single_choice",
-        },
-    ],
+    "AWS": _freeze_questions(
+        [
+            {
+                "id": "Q_AWS",
+                "text": "AWS 비용의 주 용도는?",
+                "options": ["개발 서버", "프로덕션 서버", "데이터 저장", "AI/ML 서비스"],
+                "type": "single_choice",
+            },
+        ]
+    ),
+    "급여": _freeze_questions(
+        [
+            {
+                "id": "Q_SALARY",
+                "text": "이 급여 지급 대상은?",
+                "options": ["정규직", "계약직", "프리랜서", "아르바이트"],
+                "type": "single_choice",
+            },
+        ]
+    ),
+    "마케팅": _freeze_questions(
+        [
+            {
+                "id": "Q_MARKETING",
+                "text": "마케팅 유형은?",
+                "options": ["온라인 광고", "오프라인 광고", "이벤트/프로모션", "콘텐츠 제작"],
+                "type": "single_choice",
+            },
+        ]
+    ),
 }
 
+# Counterparties confidently routed to the fast model: a CATEGORY_QUESTIONS keyword,
+# with Latin keywords only as whole words ("AWS Korea", not "LAWSON")
+ROUTINE_PATTERN = re.compile(
+    "|".join(
+        rf"\b{re.escape(keyword)}\b" if keyword.isascii() else re.escape(keyword)
+        for keyword in CATEGORY_QUESTIONS
+    ),
+    re.IGNORECASE,
+)
+
+# Keywords (lowercase) for template category suggestions, in priority order
+CATEGORY_KEYWORDS = {
+    "개발비 - 클라우드": ["aws", "azure", "gcp", "네이버클라우드", "서버"],
+    "인건비 - 급여": ["급여", "월급", "salary"],
+    "마케팅비": ["광고", "마케팅", "marketing", "ad"],
+    "임차료": ["월세", "임대", "사무실"],
+    "통신비": ["통신", "인터넷", "kt", "skt", "lg"],
+    "소모품비": ["사무용품", "소모품", "문구"],
+    "식대": ["식대", "점심", "저녁", "식사"],
+}
+CATEGORIES = tuple(CATEGORY_KEYWORDS)
+DEFAULT_CATEGORY = "기타 경비"
+
+# One compiled pattern for all keywords. Each alternative is a lookahead for one
+# category, tried in order at the start of the text, so the first category with
+# any keyword anywhere wins (not whichever keyword appears earliest); the number
+# of its empty group (index + 1) names the category.
+CATEGORY_PATTERN = re.compile(
+    "|".join(
+        f"(?=.*(?:{'|'.join(map(re.escape, keywords))}))()"
+        for keywords in CATEGORY_KEYWORDS.values()
+    ),
+    re.DOTALL,
+)
+
 
 class AIService:
     """
@@ -111,6 +251,9 @@ class AIService:
 
     Uses Claude API when configured, falls back to template-based questions
     when API is not available.
+
+    Use get_ai_service() for the shared instance, so the API client and its
+    connection pool are reused across requests.
     """
 
     def __init__(self, api_key: Optional[str] = None):
@@ -120,16 +263,38 @@ class AIService:
 
         if not self.is_mock:
             try:
-                from anthropic import AsyncAnthropic
-
-                self.client = AsyncAnthropic(api_key=self.api_key)
+                from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+                self.client = AsyncAnthropic(
+                    api_key=self.api_key,
+                    http_client=DefaultAsyncHttpxClient(
+                        limits=httpx.Limits(
+                            max_connections=API_MAX_CONNECTIONS,
+                            max_keepalive_connections=API_MAX_CONNECTIONS,
+                        ),
+                        # One multiplexed connection for concurrent requests, if h2 is installed
+                        http2=importlib.util.find_spec("h2") is not None,
+                    ),
+                )
                 self.model = "claude-3-5-sonnet-20241022"
+                self.fast_model = "claude-3-5-haiku-20241022"
             except ImportError:
                 self.is_mock = True
                 self.client = None
         else:
             self.client = None
 
+        self.cache = create_llm_cache(settings) if settings.llm_cache_enabled else None
+        # In-flight question requests by cache key (see generate_smart_questions)
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def close(self) -> None:
+        """Close the API client's and the cache's connection pools."""
+        if self.client is not None:
+            await self.client.close()
+        if self.cache is not None:
+            await self.cache.close()
+
     async def generate_smart_questions(
         self,
         transaction: dict,
@@ -150,37 +315,150 @@ class AIService:
         if self.is_mock:
             return self._generate_template_questions(transaction, past_patterns)
 
-        # Build prompt for Claude
-        prompt = self._build_question_prompt(transaction, past_patterns, tax_context)
+        cache_key = LLMCache.make_key(
+            "questions", self._question_cache_payload(transaction, past_patterns, tax_context)
+        )
+        if self.cache:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Single-flight: concurrent callers for the same request share one API call.
+        # shield() keeps the shared call running if one of its callers is cancelled.
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._request_questions(cache_key, transaction, past_patterns, tax_context)
+            )
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        return await asyncio.shield(inflight)
 
+    async def _request_questions(
+        self,
+        cache_key: str,
+        transaction: dict,
+        past_patterns: Optional[list[dict]],
+        tax_context: Optional[dict],
+    ) -> dict:
+        """Call the API for questions and cache the result; templates on error."""
         try:
             response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                system=SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,  # Deterministic for consistency
+                **self._question_request_params(transaction, past_patterns, tax_context)
             )
 
-            # Parse response
-            content = response.content[0].text
-            return self._parse_ai_response(content, transaction)
+            result = self._parse_questions(
+                _tool_input(response, QUESTIONS_TOOL["name"]), transaction
+            )
+            if self.cache and result.get("source") == "ai":
+                await self.cache.set(cache_key, result)
+            return result
 
         except Exception as e:
             # Fallback to templates on error
             print(f"AI API error: {e}")
             return self._generate_template_questions(transaction, past_patterns)
 
+    async def generate_smart_questions_batch(
+        self,
+        transactions: list[dict],
+        past_patterns: Optional[list[Optional[list[dict]]]] = None,
+        tax_context: Optional[dict] = None,
+    ) -> list[dict]:
+        """
+        Generate smart questions for several transactions.
+
+        Runs up to QUESTION_CONCURRENCY requests concurrently, so connection
+        setup and latency overlap.
+
+        Args:
+            transactions: Transaction data
+            past_patterns: Similar past transactions, aligned with transactions
+            tax_context: Relevant tax law context (shared by all transactions)
+
+        Returns:
+            Question results, in the same order as transactions
+        """
+        past_patterns = past_patterns or [None] * len(transactions)
+
+        semaphore = asyncio.Semaphore(QUESTION_CONCURRENCY)
+
+        async def generate(transaction: dict, patterns: Optional[list[dict]]) -> dict:
+            async with semaphore:
+                return await self.generate_smart_questions(transaction, patterns, tax_context)
+
+        return await asyncio.gather(
+            *(generate(tx, patterns) for tx, patterns in zip(transactions, past_patterns))
+        )
+
+    def _question_request_params(
+        self,
+        transaction: dict,
+        past_patterns: Optional[list[dict]],
+        tax_context: Optional[dict],
+    ) -> dict:
+        """Build Messages API parameters for question generation."""
+        routine = self._is_routine(transaction)
+        return {
+            "model": self.fast_model if routine else self.model,
+            "max_tokens": FAST_QUESTION_MAX_TOKENS if routine else QUESTION_MAX_TOKENS,
+            "system": QUESTION_SYSTEM_BLOCKS,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": self._build_question_prompt(transaction, past_patterns, tax_context),
+                }
+            ],
+            "tools": [QUESTIONS_TOOL],
+            "tool_choice": {"type": "tool", "name": QUESTIONS_TOOL["name"]},
+            "temperature": 0.0,  # Deterministic for consistency
+        }
+
+    def _is_routine(self, transaction: dict) -> bool:
+        """
+        Whether the counterparty confidently matches a known category.
+
+        Loose substring hits from CATEGORY_KEYWORDS ("ad" in "Adobe") are not
+        enough; those transactions still go to the full model.
+        """
+        return ROUTINE_PATTERN.search(transaction.get("counterparty") or "") is not None
+
+    def _question_cache_payload(
+        self,
+        transaction: dict,
+        past_patterns: Optional[list[dict]],
+        tax_context: Optional[dict],
+    ) -> dict:
+        """
+        Canonical question request for cache keys.
+
+        Drops the ID, date and time and rounds amounts to 100원, so recurring
+        transactions (e.g., monthly AWS bills) share one cached response.
+        """
+        return {
+            "tx": {
+                "type": transaction.get("type"),
+                "counterparty": transaction.get("counterparty"),
+                "bank_memo": transaction.get("bank_memo"),
+                "bank_name": transaction.get("bank_name"),
+                "amount": round(transaction.get("amount", 0), -2),
+            },
+            "past": [
+                [p.get("counterparty"), round(p.get("amount") or 0, -2)]
+                for p in (past_patterns or [])[:3]
+            ],
+            "tax_context": (tax_context or {}).get("summary"),
+        }
+
     def _build_question_prompt(
         self,
         transaction: dict,
         past_patterns: Optional[list[dict]],
         tax_context: Optional[dict],
     ) -> str:
-        """Build prompt for AI question generation."""
-        prompt = f"""거래 정보를 분석하고 세무사가 필요로 할 맥락 정보를 수집하기 위한 질문을 생성해주세요.
-
-## 거래 정보
+        """Build the transaction-specific prompt (instructions are in the system prompt)."""
+        parts = [
+            f"""## 거래 정보
 - 날짜: {transaction.get('date', '')}
 - 시간: {transaction.get('time', '')}
 - 금액: {transaction.get('amount', 0):,}원
@@ -189,62 +467,34 @@ class AIService:
 - 은행 메모: {transaction.get('bank_memo', '')}
 - 은행: {transaction.get('bank_name', '')}
 """
+        ]
 
         if past_patterns:
-            prompt += "\n## 과거 유사 거래\n"
-            for p in past_patterns[:3]:
-                prompt += f"- {p.get('date')}: {p.get('counterparty')} {p.get('amount'):,}원\n"
+            parts.append("\n## 과거 유사 거래\n")
+            parts.extend(
+                f"- {p.get('date')}: {p.get('counterparty')} {p.get('amount'):,}원\n"
+                for p in past_patterns[:3]
+            )
 
         if tax_context:
-            prompt += f"\n## 관련 세법 컨텍스트\n{tax_context.get('summary', '')}\n"
-
-        prompt += """
-## 요청사항
-1. 세무사가 이 거래를 이해하는 데 필요한 질문 3-5개를 생성해주세요
-2. 각 질문은 객관식(2-4개 옵션)으로 만들어주세요
-3. 증빙 서류 관련 질문을 반드시 포함해주세요
-4. JSON 형식으로 응답해주세요
-
-응답 형식:
-{
-  "questions": [
-    {"id": "Q1", "text": "질문 내용", "options": ["옵션1", "옵션2"], "type": "single_choice"},
-    ...
-  ],
-  "confidence": 0.9,
-  "category_suggestion": "추천 카테고리"
-}"""
+            parts.append(f"\n## 관련 세법 컨텍스트\n{tax_context.get('summary', '')}\n")
 
-        return prompt
+        return "".join(parts)
 
-    def _parse_ai_response(self, content: str, transaction: dict) -> dict:
-        """Parse AI response and validate."""
-        try:
-            # Try to extract JSON from response
-            start = content.find("{")
-            end = content.rfind("}") + 1
-            if start >= 0 and end > start:
-                json_str = content[start:end]
-                data = json.loads(json_str)
-
-                # Validate questions
-                questions = data.get("questions", [])
-                valid_questions = []
-                for q in questions:
-                    if all(k in q for k in ["id", "text", "options", "type"]):
-                        valid_questions.append(q)
-
-                return {
-                    "questions": valid_questions,
-                    "confidence": data.get("confidence", 0.8),
-                    "category_suggestion": data.get("category_suggestion"),
-                    "source": "ai",
-                }
-        except json.JSONDecodeError:
-            pass
+    def _parse_questions(self, data: Optional[dict], transaction: dict) -> dict:
+        """Validate emit_questions tool input, falling back to templates."""
+        questions = [
+            q for q in (data or {}).get("questions", []) if all(k in q for k in QUESTION_FIELDS)
+        ]
+        if not questions:
+            return self._generate_template_questions(transaction, None)
 
-        # Fallback to templates if parsing fails
-        return self._generate_template_questions(transaction, None)
+        return {
+            "questions": questions,
+            "confidence": data.get("confidence", 0.8),
+            "category_suggestion": data.get("category_suggestion"),
+            "source": "ai",
+        }
 
     def _generate_template_questions(
         self,
@@ -255,11 +505,8 @@ class AIService:
         tx_type = transaction.get("type", "지출")
         counterparty = transaction.get("counterparty", "").upper()
 
-        # Base questions based on type
-        if tx_type == "입금":
-            questions = QUESTION_TEMPLATES["income"].copy()
-        else:
-            questions = QUESTION_TEMPLATES["expense"].copy()
+        # Base questions based on type (read-only templates, shared, never mutated)
+        questions = list(QUESTION_TEMPLATES["income" if tx_type == "입금" else "expense"])
 
         # Add category-specific questions
         for keyword, cat_questions in CATEGORY_QUESTIONS.items():
@@ -269,10 +516,12 @@ class AIService:
 
         # Customize based on patterns
         if past_patterns and len(past_patterns) > 2:
-            # Likely recurring - adjust question
-            for q in questions:
-                if q["id"] == "Q2":
-                    q["options"][0] = f"네, 매월 반복 (이전 {len(past_patterns)}건 확인)"
+            # Likely recurring - adjust question (a new dict; the template stays as is)
+            first_option = f"네, 매월 반복 (이전 {len(past_patterns)}건 확인)"
+            questions = [
+                {**q, "options": (first_option, *q["options"][1:])} if q["id"] == "Q2" else q
+                for q in questions
+            ]
 
         return {
             "questions": questions[:7],  # Max 7 questions
@@ -283,25 +532,9 @@ class AIService:
 
     def _suggest_category(self, transaction: dict) -> str:
         """Suggest category based on transaction data."""
-        counterparty = transaction.get("counterparty", "").lower()
-        memo = transaction.get("bank_memo", "").lower()
-
-        keywords = {
-            "개발비 - 클라우드": ["aws", "azure", "gcp", "네이버클라우드", "서버"],
-            "인건비 - 급여": ["급여", "월급", "salary"],
-            "마케팅비": ["광고", "마케팅", "marketing", "ad"],
-            "임차료": ["월세", "임대", "사무실"],
-            "통신비": ["통신", "인터넷", "kt", "skt", "lg"],
-            "소모품비": ["사무용품", "소모품", "문구"],
-            "식대": ["식대", "점심", "저녁", "식사"],
-        }
-
-        combined = f"{counterparty} {memo}"
-        for category, kws in keywords.items():
-            if any(kw in combined for kw in kws):
-                return category
-
-        return "기타 경비"
+        return _suggest_category_cached(
+            transaction.get("counterparty") or "", transaction.get("bank_memo") or ""
+        )
 
     async def generate_ai_summary(
         self,
@@ -321,9 +554,27 @@ class AIService:
         if self.is_mock:
             return self._generate_template_summary(transaction, answers)
 
-        prompt = f"""거래 정보와 유저 답변을 바탕으로 세무사에게 전달할 요약을 작성해주세요.
+        cache_key = None
+        if self.cache:
+            # The summary can quote the amount and date, so both are keyed exactly
+            cache_key = LLMCache.make_key(
+                "summary",
+                {
+                    "tx": {
+                        "date": transaction.get("date"),
+                        "type": transaction.get("type"),
+                        "counterparty": transaction.get("counterparty"),
+                        "bank_memo": transaction.get("bank_memo"),
+                        "amount": transaction.get("amount"),
+                    },
+                    "answers": answers,
+                },
+            )
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-## 거래 정보
+        prompt = f"""## 거래 정보
 - 날짜: {transaction.get('date', '')}
 - 금액: {transaction.get('amount', 0):,}원
 - 유형: {transaction.get('type', '')}
@@ -331,33 +582,26 @@ class AIService:
 - 은행 메모: {transaction.get('bank_memo', '')}
 
 ## 유저 답변
-{json.dumps(answers, ensure_ascii=False, indent=2)}
-
-## 요청사항
-세무사가 이해할 수 있는 2-3문장 요약을 작성해주세요.
-계정 분류, 세무 처리 관련 메모도 포함해주세요.
-
-응답 형식:
-{{
-  "summary": "요약 내용",
-  "account_classification": "계정 분류",
-  "tax_notes": "세무 처리 메모"
-}}"""
+{orjson.dumps(answers, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()}
+"""
 
         try:
             response = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1024,
-                system=SYSTEM_PROMPT,
-                messages=[{"role": "user", "content": prompt}],
+                system=SUMMARY_SYSTEM_BLOCKS,
+                messages=[
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": SUMMARY_PREFILL},
+                ],
                 temperature=0.0,
             )
 
-            content = response.content[0].text
-            start = content.find("{")
-            end = content.rfind("}") + 1
-            if start >= 0 and end > start:
-                return json.loads(content[start:end])
+            summary = orjson.loads(SUMMARY_PREFILL + response.content[0].text.rstrip().rstrip("`"))
+            if isinstance(summary, dict) and all(k in summary for k in SUMMARY_FIELDS):
+                if cache_key:
+                    await self.cache.set(cache_key, summary)
+                return summary
 
         except Exception as e:
             print(f"AI summary error: {e}")
@@ -432,7 +676,7 @@ class AIService:
         try:
             response = await self.client.messages.create(
                 model=self.model,
-                max_tokens=512,
+                max_tokens=RELATIONSHIP_MAX_TOKENS,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.0,
             )
@@ -441,3 +685,36 @@ class AIService:
             print(f"Relationship generation error: {e}")
             total = sum(tx.get("amount", 0) for tx in transactions)
             return f"관련 거래 {len(transactions)}건, 총 {total:,}원"
+
+
+@lru_cache(maxsize=4096)
+def _suggest_category_cached(counterparty: str, memo: str) -> str:
+    """
+    Suggest a category from counterparty and memo.
+
+    Memoized on the raw strings: the same pairs recur every month (cloud bills,
+    payroll, rent), so a hit skips lowercasing as well as the keyword match.
+    """
+    match = CATEGORY_PATTERN.match(f"{counterparty} {memo}".lower())
+    if match and match.lastindex:
+        return CATEGORIES[match.lastindex - 1]
+
+    return DEFAULT_CATEGORY
+
+
+def _tool_input(response: Any, tool_name: str) -> Optional[dict]:
+    """Get the input of the named tool_use block from a Messages API response."""
+    return next(
+        (
+            block.input
+            for block in response.content
+            if block.type == "tool_use" and block.name == tool_name
+        ),
+        None,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_ai_service() -> AIService:
+    """Get the shared AIService instance."""
+    return AIService()
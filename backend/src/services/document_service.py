@@ -4,14 +4,88 @@ Document generation service for monthly tax reports.
 Generates markdown documents from transaction data and enriched contexts.
 """
 
+import asyncio
 from datetime import datetime
-from typing import Any, Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Optional
 
-from sqlalchemy import and_, select
+from sqlalchemy import Row, bindparam, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.models import EnrichedContext, MonthlyDocument, Transaction, TransactionStatus
-from src.services.ai_service import AIService
+from sqlalchemy.orm import selectinload
+
+from src.models import (
+    EnrichedContext,
+    MonthlyDocument,
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+)
+from src.services.ai_service import get_ai_service
+from src.utils import month_bounds
+
+# Rows fetched per round trip when streaming a month's transactions
+MONTH_STREAM_BATCH_SIZE = 500
+
+# Concurrent AI calls when explaining related-transaction groups
+RELATIONSHIP_CONCURRENCY = 8
+
+# A month's transactions (excluding internal transfers), bound with {"start", "end"}.
+# Built once so SQLAlchemy's compiled-statement cache is hit on every call.
+MONTH_TRANSACTIONS_STMT = (
+    select(Transaction)
+    .where(Transaction.date >= bindparam("start"))
+    .where(Transaction.date < bindparam("end"))
+    .where(Transaction.is_internal_transfer == False)  # noqa: E712
+    .order_by(Transaction.date)
+)
+MONTH_TRANSACTIONS_WITH_CONTEXT_STMT = MONTH_TRANSACTIONS_STMT.options(
+    selectinload(Transaction.enriched_context)
+)
+# Only the columns the markdown document reads, as plain rows: no ORM objects to
+# hydrate or track, and no encrypted account number, timestamps or time fetched
+MONTH_DOCUMENT_TRANSACTIONS_STMT = MONTH_TRANSACTIONS_STMT.with_only_columns(
+    Transaction.id,
+    Transaction.date,
+    Transaction.amount,
+    Transaction.bank_name,
+    Transaction.counterparty,
+    Transaction.bank_memo,
+    Transaction.status,
+    Transaction.is_recurring,
+)
+
+# Enriched contexts for a list of transaction IDs, bound with {"ids"}
+CONTEXTS_BY_TRANSACTION_STMT = select(EnrichedContext).where(
+    EnrichedContext.transaction_id.in_(bindparam("ids", expanding=True))
+)
+
+# A transaction as the document sections read it (ORM object or column row)
+TransactionRow = Transaction | Row
+
+# Statuses that put a transaction in the non-recurring or pending section
+ENRICHED = TransactionStatus.ENRICHED
+PENDING_STATUSES = frozenset(
+    {TransactionStatus.PENDING_ENRICHMENT, TransactionStatus.PENDING_MANUAL_REVIEW}
+)
+
+# Income/expense totals and counts for the same rows, in one aggregate query
+_is_income = Transaction.type == TransactionType.INCOME
+_is_expense = Transaction.type == TransactionType.EXPENSE
+MONTH_TOTALS_STMT = (
+    select(
+        func.coalesce(func.sum(case((_is_income, Transaction.amount), else_=0)), 0).label(
+            "total_income"
+        ),
+        func.coalesce(func.sum(case((_is_expense, Transaction.amount), else_=0)), 0).label(
+            "total_expense"
+        ),
+        func.count(case((_is_income, 1))).label("income_count"),
+        func.count(case((_is_expense, 1))).label("expense_count"),
+    )
+    .where(Transaction.date >= bindparam("start"))
+    .where(Transaction.date < bindparam("end"))
+    .where(Transaction.is_internal_transfer == False)  # noqa: E712
+)
 
 
 class DocumentService:
@@ -28,7 +102,7 @@ class DocumentService:
 
     def __init__(self, session: AsyncSession):
         self.session = session
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
 
     async def generate_monthly_document(
         self,
@@ -48,51 +122,47 @@ class DocumentService:
             Generated MonthlyDocument
         """
         # Get date range
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1)
-        else:
-            end_date = datetime(year, month + 1, 1)
-
         month_str = f"{year}-{month:02d}"
+        start_date, end_date = month_bounds(month_str)
 
         # Fetch all transactions for the month
-        query = (
-            select(Transaction)
-            .where(
-                and_(
-                    Transaction.date >= start_date,
-                    Transaction.date < end_date,
-                    Transaction.is_internal_transfer == False,  # noqa: E712
-                )
-            )
-            .order_by(Transaction.date)
+        result = await self.session.execute(
+            MONTH_DOCUMENT_TRANSACTIONS_STMT, {"start": start_date, "end": end_date}
         )
-        result = await self.session.execute(query)
-        transactions = result.scalars().all()
+        transactions = result.all()
 
         if not transactions:
             # Create empty document
             return await self._create_empty_document(user_id, month_str)
 
         # Fetch enriched contexts
-        tx_ids = [tx.id for tx in transactions]
-        context_query = select(EnrichedContext).where(
-            EnrichedContext.transaction_id.in_(tx_ids)
+        context_result = await self.session.execute(
+            CONTEXTS_BY_TRANSACTION_STMT, {"ids": [tx.id for tx in transactions]}
         )
-        context_result = await self.session.execute(context_query)
         contexts = {ctx.transaction_id: ctx for ctx in context_result.scalars().all()}
 
-        # Categorize transactions
-        recurring = [tx for tx in transactions if tx.is_recurring]
-        non_recurring = [tx for tx in transactions if not tx.is_recurring and tx.status == TransactionStatus.ENRICHED]
-        pending = [tx for tx in transactions if tx.status in (TransactionStatus.PENDING_ENRICHMENT, TransactionStatus.PENDING_MANUAL_REVIEW)]
-
-        # Calculate stats
-        income_txs = [tx for tx in transactions if tx.type.value == "입금"]
-        expense_txs = [tx for tx in transactions if tx.type.value == "지출"]
-        total_income = sum(tx.amount for tx in income_txs)
-        total_expense = sum(tx.amount for tx in expense_txs)
+        # Categorize transactions in one pass
+        recurring: list[TransactionRow] = []
+        non_recurring: list[TransactionRow] = []
+        pending: list[TransactionRow] = []
+        banks: set[str] = set()
+        for tx in transactions:
+            status = tx.status
+            if tx.is_recurring:
+                recurring.append(tx)
+            elif status == ENRICHED:
+                non_recurring.append(tx)
+            if status in PENDING_STATUSES:
+                pending.append(tx)
+            banks.add(tx.bank_name)
+
+        # Calculate stats in SQL
+        totals_result = await self.session.execute(
+            MONTH_TOTALS_STMT, {"start": start_date, "end": end_date}
+        )
+        totals = totals_result.one()
+        total_income = totals.total_income
+        total_expense = totals.total_expense
 
         # Generate document sections
         markdown_parts = []
@@ -105,9 +175,9 @@ class DocumentService:
             total_transactions=len(transactions),
             total_income=total_income,
             total_expense=total_expense,
-            income_count=len(income_txs),
-            expense_count=len(expense_txs),
-            banks=list({tx.bank_name for tx in transactions}),
+            income_count=totals.income_count,
+            expense_count=totals.expense_count,
+            banks=list(banks),
         ))
 
         # Document Checklist
@@ -126,8 +196,9 @@ class DocumentService:
         if pending:
             markdown_parts.append(self._generate_pending_section(pending))
 
-        # Combine all parts
+        # Combine all parts; drop the parts so only one copy is held while saving
         document_markdown = "\n\n".join(markdown_parts)
+        del markdown_parts
 
         # Create or update MonthlyDocument
         doc_id = f"MD-{month_str}"
@@ -142,7 +213,7 @@ class DocumentService:
             existing.recurring_count = len(recurring)
             existing.non_recurring_count = len(non_recurring)
             existing.pending_count = len(pending)
-            existing.generated_at = datetime.utcnow()
+            existing.generated_at = func.now()
             document = existing
         else:
             document = MonthlyDocument(
@@ -162,6 +233,49 @@ class DocumentService:
         await self.session.commit()
         return document
 
+    async def get_month_transactions(self, month: str) -> list[Transaction]:
+        """
+        Fetch a month's transactions with their enriched contexts eager-loaded.
+
+        Internal transfers are excluded. Each transaction's context is
+        available as `tx.enriched_context` without further queries.
+
+        Args:
+            month: Month string (e.g., "2026-02")
+
+        Returns:
+            Transactions ordered by date
+        """
+        start_date, end_date = month_bounds(month)
+
+        tx_result = await self.session.execute(
+            MONTH_TRANSACTIONS_WITH_CONTEXT_STMT, {"start": start_date, "end": end_date}
+        )
+        return list(tx_result.scalars().all())
+
+    async def stream_month_transactions(self, month: str) -> AsyncIterator[Transaction]:
+        """
+        Stream a month's transactions in batches of MONTH_STREAM_BATCH_SIZE.
+
+        Same rows as get_month_transactions, but only one batch (and its
+        enriched contexts) is loaded at a time.
+
+        Args:
+            month: Month string (e.g., "2026-02")
+
+        Yields:
+            Transactions ordered by date
+        """
+        start_date, end_date = month_bounds(month)
+
+        tx_result = await self.session.stream(
+            MONTH_TRANSACTIONS_WITH_CONTEXT_STMT,
+            {"start": start_date, "end": end_date},
+            execution_options={"yield_per": MONTH_STREAM_BATCH_SIZE},
+        )
+        async for tx in tx_result.scalars():
+            yield tx
+
     async def _create_empty_document(self, user_id: str, month_str: str) -> MonthlyDocument:
         """Create empty document when no transactions exist."""
         doc_id = f"MD-{month_str}"
@@ -214,47 +328,41 @@ class DocumentService:
 
     def _generate_checklist(
         self,
-        transactions: list[Transaction],
+        transactions: list[TransactionRow],
         contexts: dict[str, EnrichedContext],
     ) -> dict[str, Any]:
         """Generate document checklist."""
-        ready = []
-        needs_preparation = []
-        not_available = []
+        ready: list[TransactionRow] = []
+        needs_preparation: list[TransactionRow] = []
+        not_available: list[TransactionRow] = []
+
+        # Document statuses start with their glyph ("✅ 준비 완료", "❌ 증빙 불가", ...),
+        # so dispatch on the first character
+        by_glyph = {"✅": ready, "❌": not_available}
 
         for tx in transactions:
             ctx = contexts.get(tx.id)
-            if ctx:
-                docs = ctx.documents or {}
-                status = docs.get("status", "⚠️ 준비 필요")
-
-                if "✅" in status:
-                    ready.append(tx)
-                elif "❌" in status:
-                    not_available.append(tx)
-                else:
-                    needs_preparation.append(tx)
-            else:
-                needs_preparation.append(tx)
+            status = (ctx.documents or {}).get("status") if ctx else None
+            by_glyph.get(status[:1] if status else "", needs_preparation).append(tx)
 
         # Build markdown
-        markdown = f"""## 📋 증빙 서류 체크리스트
+        parts = [f"""## 📋 증빙 서류 체크리스트
 
 | 상태 | 건수 | 설명 |
 |------|------|------|
 | ✅ 준비 완료 | {len(ready)}건 | 계산서/영수증 수집 완료 |
 | ⚠️ 준비 필요 | {len(needs_preparation)}건 | 계산서 미수령, 요청 필요 |
-| ❌ 증빙 불가 | {len(not_available)}건 | 개인 간 거래 (증빙 없음) |"""
+| ❌ 증빙 불가 | {len(not_available)}건 | 개인 간 거래 (증빙 없음) |"""]
 
         if needs_preparation:
-            markdown += "\n\n**준비 필요 항목**:\n"
+            parts.append("\n\n**준비 필요 항목**:\n")
             for i, tx in enumerate(needs_preparation[:10], 1):
                 ctx = contexts.get(tx.id)
                 memo = ctx.user_memo if ctx else tx.bank_memo
-                markdown += f"{i}. {tx.date.strftime('%m월 %d일')} - {tx.counterparty or '알 수 없음'} ({tx.amount:,}원) - {memo or '메모 없음'}\n"
+                parts.append(f"{i}. {_month_day(tx.date)} - {tx.counterparty or '알 수 없음'} ({tx.amount:,}원) - {memo or '메모 없음'}\n")
 
         return {
-            "markdown": markdown,
+            "markdown": "".join(parts),
             "ready": ready,
             "needs_preparation": needs_preparation,
             "not_available": not_available,
@@ -262,19 +370,19 @@ class DocumentService:
 
     def _generate_recurring_section(
         self,
-        transactions: list[Transaction],
+        transactions: list[TransactionRow],
         contexts: dict[str, EnrichedContext],
     ) -> str:
         """Generate recurring transactions section."""
         # Group by counterparty
-        by_counterparty: dict[str, list[Transaction]] = {}
+        by_counterparty: dict[str, list[TransactionRow]] = {}
         for tx in transactions:
             key = tx.counterparty or "기타"
             if key not in by_counterparty:
                 by_counterparty[key] = []
             by_counterparty[key].append(tx)
 
-        markdown = "## 🔄 정기 지출\n"
+        parts = ["## 🔄 정기 지출\n"]
 
         for counterparty, txs in by_counterparty.items():
             ctx = contexts.get(txs[0].id)
@@ -290,46 +398,47 @@ class DocumentService:
 
             total = sum(tx.amount for tx in txs)
 
-            markdown += f"""
+            parts.append(f"""
 ### [{counterparty}]
 
 **거래 내역**:
-"""
+""")
             for tx in txs[:5]:  # Show max 5
-                markdown += f"- {tx.date.strftime('%m월 %d일')}: {tx.amount:,}원 ({tx.bank_name})\n"
+                parts.append(f"- {_month_day(tx.date)}: {tx.amount:,}원 ({tx.bank_name})\n")
 
             if len(txs) > 5:
-                markdown += f"- ... 외 {len(txs) - 5}건\n"
+                parts.append(f"- ... 외 {len(txs) - 5}건\n")
 
-            markdown += f"""
+            parts.append(f"""
 **총 금액**: {total:,}원 ({len(txs)}건)
 
 **카테고리**: {category}
-"""
+""")
             if account_class:
-                markdown += f"**계정 분류**: {account_class}\n"
+                parts.append(f"**계정 분류**: {account_class}\n")
             if tax_notes:
-                markdown += f"**세무 처리**: {tax_notes}\n"
+                parts.append(f"**세무 처리**: {tax_notes}\n")
             if summary:
-                markdown += f"**설명**: {summary}\n"
+                parts.append(f"**설명**: {summary}\n")
 
-            markdown += f"**증빙**: {doc_status}\n"
-            markdown += "\n---\n"
+            parts.append(f"**증빙**: {doc_status}\n")
+            parts.append("\n---\n")
 
-        return markdown
+        return "".join(parts)
 
     async def _generate_non_recurring_section(
         self,
-        transactions: list[Transaction],
+        transactions: list[TransactionRow],
         contexts: dict[str, EnrichedContext],
     ) -> str:
         """Generate non-recurring transactions section with relationship grouping."""
-        markdown = "## ⚡ 비정기 지출\n"
+        parts = ["## ⚡ 비정기 지출\n"]
 
         # Group by related transactions
-        grouped: list[list[Transaction]] = []
-        ungrouped: list[Transaction] = []
+        grouped: list[list[TransactionRow]] = []
+        ungrouped: list[TransactionRow] = []
         processed_ids: set[str] = set()
+        by_id = {tx.id: tx for tx in transactions}
 
         for tx in transactions:
             if tx.id in processed_ids:
@@ -344,10 +453,10 @@ class DocumentService:
                 processed_ids.add(tx.id)
 
                 for related_id in related_ids:
-                    for other_tx in transactions:
-                        if other_tx.id == related_id and other_tx.id not in processed_ids:
-                            group.append(other_tx)
-                            processed_ids.add(other_tx.id)
+                    other_tx = by_id.get(related_id)
+                    if other_tx is not None and related_id not in processed_ids:
+                        group.append(other_tx)
+                        processed_ids.add(related_id)
 
                 if len(group) > 1:
                     grouped.append(group)
@@ -357,34 +466,42 @@ class DocumentService:
                 ungrouped.append(tx)
                 processed_ids.add(tx.id)
 
+        # Explain all groups concurrently (each is an independent AI call)
+        semaphore = asyncio.Semaphore(RELATIONSHIP_CONCURRENCY)
+
+        async def explain(group: list[TransactionRow]) -> str:
+            async with semaphore:
+                return await self.ai_service.generate_transaction_relationship(
+                    [{"date": tx.date.strftime("%Y-%m-%d"), "counterparty": tx.counterparty, "amount": tx.amount}
+                     for tx in group]
+                )
+
+        relationships = await asyncio.gather(*(explain(group) for group in grouped))
+
         # Generate grouped sections
-        for i, group in enumerate(grouped, 1):
+        for i, (group, relationship) in enumerate(zip(grouped, relationships), 1):
             total = sum(tx.amount for tx in group)
-            relationship = await self.ai_service.generate_transaction_relationship(
-                [{"date": tx.date.strftime("%Y-%m-%d"), "counterparty": tx.counterparty, "amount": tx.amount}
-                 for tx in group]
-            )
 
-            markdown += f"""
+            parts.append(f"""
 ### [그룹 {i}: 관련 거래]
 
 **거래 관계**:
 {relationship}
 
 **거래 내역**:
-"""
+""")
             for tx in group:
                 ctx = contexts.get(tx.id)
                 memo = ctx.user_memo if ctx else tx.bank_memo
-                markdown += f"- {tx.date.strftime('%m월 %d일')}: {tx.amount:,}원 - {tx.counterparty or '알 수 없음'} ({tx.bank_name})\n"
+                parts.append(f"- {_month_day(tx.date)}: {tx.amount:,}원 - {tx.counterparty or '알 수 없음'} ({tx.bank_name})\n")
                 if memo:
-                    markdown += f"  메모: {memo}\n"
+                    parts.append(f"  메모: {memo}\n")
 
-            markdown += f"\n**총 금액**: {total:,}원 ({len(group)}건)\n\n---\n"
+            parts.append(f"\n**총 금액**: {total:,}원 ({len(group)}건)\n\n---\n")
 
         # Generate ungrouped section
         if ungrouped:
-            markdown += "\n### [개별 거래]\n\n"
+            parts.append("\n### [개별 거래]\n\n")
             for tx in ungrouped:
                 ctx = contexts.get(tx.id)
                 category = ctx.category if ctx else "미분류"
@@ -393,20 +510,32 @@ class DocumentService:
                 if ctx and ctx.documents:
                     doc_status = "✅" if ctx.documents.get("invoice_received") else "⚠️"
 
-                markdown += f"- {tx.date.strftime('%m월 %d일')}: {tx.amount:,}원 - {tx.counterparty or '알 수 없음'}"
-                markdown += f" [{category}] {doc_status}\n"
+                parts.append(f"- {_month_day(tx.date)}: {tx.amount:,}원 - {tx.counterparty or '알 수 없음'}")
+                parts.append(f" [{category}] {doc_status}\n")
                 if summary:
-                    markdown += f"  → {summary}\n"
+                    parts.append(f"  → {summary}\n")
 
-        return markdown
+        return "".join(parts)
 
-    def _generate_pending_section(self, transactions: list[Transaction]) -> str:
+    def _generate_pending_section(self, transactions: list[TransactionRow]) -> str:
         """Generate pending transactions section."""
-        markdown = "## ⚠️ 확인 필요 (미답변 거래)\n\n"
+        parts = ["## ⚠️ 확인 필요 (미답변 거래)\n\n"]
 
         for tx in transactions:
-            markdown += f"- {tx.date.strftime('%m월 %d일')}: {tx.amount:,}원"
-            markdown += f" ({tx.counterparty or '거래처 불명'})\n"
-            markdown += f"  상태: 맥락 정보 없음, 수동 확인 필요\n"
+            parts.append(f"- {_month_day(tx.date)}: {tx.amount:,}원")
+            parts.append(f" ({tx.counterparty or '거래처 불명'})\n")
+            parts.append(f"  상태: 맥락 정보 없음, 수동 확인 필요\n")
+
+        return "".join(parts)
+
+
+@lru_cache(maxsize=512)
+def _month_day(value: datetime) -> str:
+    """
+    Format a date as "MM월 DD일".
+
+    Memoized: a month has at most 31 distinct dates, and each transaction's
+    date is formatted in up to three sections.
+    """
+    return value.strftime("%m월 %d일")
 
-        return markdown
@@ -4,12 +4,15 @@ Email service for sending documents to accountant.
 Supports real SMTP and mock mode for development.
 """
 
+import asyncio
 from datetime import datetime
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from typing import Optional
 
+import aiosmtplib
+
 from src.config import get_settings
 
 
@@ -19,6 +22,9 @@ class EmailService:
 
     When SMTP is not configured, uses mock implementation
     that logs emails instead of sending them.
+
+    Meant to be shared across requests: authenticated SMTP sessions are
+    kept open and reused, with at most `pool_size` sends in flight.
     """
 
     def __init__(
@@ -28,6 +34,7 @@ class EmailService:
         user: Optional[str] = None,
         password: Optional[str] = None,
         from_addr: Optional[str] = None,
+        pool_size: Optional[int] = None,
     ):
         settings = get_settings()
         self.host = host or settings.smtp_host
@@ -38,6 +45,10 @@ class EmailService:
 
         self.is_mock = not all([self.host, self.user, self.password])
 
+        # SMTP session pool
+        self._pool_slots = asyncio.Semaphore(pool_size or settings.smtp_pool_size)
+        self._idle_clients: list[aiosmtplib.SMTP] = []
+
     async def send_to_accountant(
         self,
         to_email: str,
@@ -95,8 +106,6 @@ class EmailService:
 
         # Real SMTP send
         try:
-            import aiosmtplib
-
             # Create message
             msg = MIMEMultipart()
             msg["From"] = self.from_addr
@@ -112,14 +121,7 @@ class EmailService:
             msg.attach(attachment)
 
             # Send
-            await aiosmtplib.send(
-                msg,
-                hostname=self.host,
-                port=self.port,
-                username=self.user,
-                password=self.password,
-                start_tls=True,
-            )
+            await self._send_message(msg)
 
             return {
                 "status": "sent",
@@ -134,6 +136,71 @@ class EmailService:
                 "to": to_email,
             }
 
+    async def prepare(self) -> None:
+        """
+        Open an SMTP session ahead of a send, if none is idle.
+
+        Lets the connect/STARTTLS/login exchange overlap with other work.
+        Connection errors are ignored here and reported by the send.
+        """
+        if self.is_mock or self._idle_clients:
+            return
+        try:
+            self._idle_clients.append(await self._connect())
+        except (aiosmtplib.SMTPException, OSError):
+            pass
+
+    async def close(self) -> None:
+        """Close all pooled SMTP sessions."""
+        clients, self._idle_clients = self._idle_clients, []
+        for client in clients:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+    async def _send_message(self, msg: MIMEMultipart) -> None:
+        """
+        Send a message over a pooled SMTP session.
+
+        A session dropped by the server is replaced and the send retried once.
+        """
+        async with self._pool_slots:
+            client = await self._acquire_client()
+            try:
+                try:
+                    await client.send_message(msg)
+                except aiosmtplib.SMTPServerDisconnected:
+                    client = await self._connect()
+                    await client.send_message(msg)
+            except Exception:
+                client.close()
+                raise
+            self._idle_clients.append(client)
+
+    async def _acquire_client(self) -> aiosmtplib.SMTP:
+        """Get an idle live SMTP session, or open a new one."""
+        while self._idle_clients:
+            client = self._idle_clients.pop()
+            try:
+                await client.noop()
+                return client
+            except aiosmtplib.SMTPException:
+                client.close()
+        return await self._connect()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        """Open an authenticated SMTP session."""
+        client = aiosmtplib.SMTP(
+            hostname=self.host,
+            port=self.port,
+            username=self.user,
+            password=self.password,
+            start_tls=True,
+        )
+        await client.connect()
+        return client
+
     async def _mock_send(
         self,
         to_email: str,
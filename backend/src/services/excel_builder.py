@@ -0,0 +1,141 @@
+"""
+Excel export builder for monthly documents (US-005, US-006).
+
+Builds the three-sheet workbook shared by the download endpoint
+and the accountant email attachment.
+"""
+
+import asyncio
+from typing import IO, AsyncIterable, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+from src.models import EnrichedContext, MonthlyDocument, Transaction
+
+# Sheet layout and header styles, shared by every export
+TRANSACTION_HEADERS = ("날짜", "금액", "거래처", "구분", "설명", "계정 분류", "세무 처리")
+TRANSACTION_COLUMN_WIDTHS = {"A": 12, "B": 15, "C": 20, "D": 10, "E": 40, "F": 20, "G": 30}
+SUMMARY_HEADERS = ("항목", "금액")
+TAX_NOTE_HEADERS = ("거래처", "금액", "세무 처리 메모")
+
+HEADER_FONT = Font(bold=True)
+TRANSACTION_HEADER_FILL = PatternFill(start_color="CCE5FF", end_color="CCE5FF", fill_type="solid")
+
+
+class ExcelBuilder:
+    """
+    Builder for the monthly Excel export.
+
+    Uses openpyxl write-only mode, so transaction rows are streamed
+    to the workbook as they are added instead of kept as cell objects.
+
+    Sheets:
+    - 거래 내역: one row per transaction
+    - 요약: monthly totals
+    - 세무 처리 메모: transactions with tax notes
+    """
+
+    def __init__(self, document: MonthlyDocument):
+        self.document = document
+        self.wb = Workbook(write_only=True)
+
+        # Create all sheets up front to keep the sheet order stable
+        self.ws_transactions = self._create_sheet(
+            "거래 내역",
+            TRANSACTION_HEADERS,
+            header_fill=TRANSACTION_HEADER_FILL,
+            widths=TRANSACTION_COLUMN_WIDTHS,
+        )
+        self.ws_summary = self._create_sheet("요약", SUMMARY_HEADERS)
+        self.ws_tax_notes = self._create_sheet("세무 처리 메모", TAX_NOTE_HEADERS)
+
+        # Tax note rows are few, so they are buffered until save
+        self._tax_rows: list[list] = []
+
+    def add_transaction(self, tx: Transaction, ctx: Optional[EnrichedContext]) -> None:
+        """Append a transaction row (and its tax note, if any)."""
+        self.ws_transactions.append(transaction_row(tx, ctx))
+        if ctx and ctx.tax_notes:
+            self._tax_rows.append([tx.counterparty or "", tx.amount, ctx.tax_notes])
+
+    async def add_transactions(self, transactions: AsyncIterable[Transaction]) -> None:
+        """
+        Append rows from an async transaction stream.
+
+        Transactions are expected to have `enriched_context` loaded.
+        """
+        async for tx in transactions:
+            self.add_transaction(tx, tx.enriched_context)
+
+    def save(self, target: IO[bytes]) -> None:
+        """Write the summary and tax note sheets and save the workbook."""
+        document = self.document
+        for row in [
+            ["총 입금", document.total_income],
+            ["총 지출", document.total_expense],
+            ["순 현금흐름", document.total_income - document.total_expense],
+            ["총 거래 건수", document.total_transactions],
+        ]:
+            self.ws_summary.append(row)
+
+        for row in self._tax_rows:
+            self.ws_tax_notes.append(row)
+
+        self.wb.save(target)
+
+    async def save_async(self, target: IO[bytes]) -> None:
+        """
+        Save the workbook in the default thread pool.
+
+        Assembling and compressing the xlsx archive is CPU-bound, so it is
+        kept off the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.save, target)
+
+    def _create_sheet(
+        self,
+        title: str,
+        headers: tuple[str, ...],
+        header_fill: Optional[PatternFill] = None,
+        widths: Optional[dict[str, int]] = None,
+    ):
+        """Create a write-only worksheet with a bold header row."""
+        ws = self.wb.create_sheet(title)
+
+        # Column widths must be set before rows are appended
+        for column, width in (widths or {}).items():
+            ws.column_dimensions[column].width = width
+
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.font = HEADER_FONT
+            if header_fill:
+                cell.fill = header_fill
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        return ws
+
+
+def transaction_row(tx: Transaction, ctx: Optional[EnrichedContext]) -> list:
+    """
+    Build the 거래 내역 row for a transaction.
+
+    Columns: date, signed amount, counterparty, 정기/비정기, description,
+    account classification, tax notes. Expenses are negative.
+    """
+    sign = -1 if tx.type.value == "지출" else 1
+
+    return [
+        tx.date.strftime("%Y-%m-%d"),
+        tx.amount * sign,
+        tx.counterparty or "",
+        "정기" if tx.is_recurring else "비정기",
+        (ctx.ai_generated_summary if ctx else tx.bank_memo) or "",
+        (ctx.account_classification if ctx else "") or "",
+        (ctx.tax_notes if ctx else "") or "",
+    ]
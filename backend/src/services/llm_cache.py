@@ -0,0 +1,171 @@
+"""
+Exact-match cache for AI responses.
+
+Stores Claude responses in the llm_cache table (or Redis, when REDIS_URL is
+set), keyed by a hash of the canonicalized request, so recurring transactions
+skip the API round trip.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import Settings
+from src.database import async_session_maker
+from src.models import LLMCacheEntry
+
+
+class LLMCache:
+    """
+    SQLite-backed cache of AI responses with a fixed TTL.
+
+    Cache failures never fail the caller: errors are logged and
+    treated as a miss.
+    """
+
+    def __init__(
+        self,
+        session_maker: Optional[async_sessionmaker[AsyncSession]] = None,
+        ttl: timedelta = timedelta(days=7),
+    ):
+        self.session_maker = session_maker or async_session_maker
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(kind: str, payload: dict[str, Any]) -> str:
+        """
+        Build a cache key from a request kind and its canonical payload.
+
+        Args:
+            kind: Request type (e.g., "questions", "summary")
+            payload: JSON-serializable canonical request data
+
+        Returns:
+            SHA-256 hex digest
+        """
+        # stdlib json on purpose: the key bytes must stay stable for existing entries
+        raw = json.dumps({"kind": kind, **payload}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Decoded response, or None if missing or expired
+        """
+        try:
+            async with self.session_maker() as session:
+                entry = await session.get(LLMCacheEntry, key)
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            return None
+
+        if entry is None or entry.created_at < datetime.utcnow() - self.ttl:
+            return None
+        return orjson.loads(entry.value)
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable response
+        """
+        try:
+            async with self.session_maker() as session:
+                await session.merge(
+                    LLMCacheEntry(
+                        key=key,
+                        value=orjson.dumps(value).decode(),
+                        created_at=datetime.utcnow(),
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    async def close(self) -> None:
+        """Release cache resources (sessions are per call, so nothing to do)."""
+
+
+class RedisLLMCache(LLMCache):
+    """
+    Redis-backed cache of AI responses, shared by all workers and hosts.
+
+    Entries expire through Redis TTLs. Same key scheme and failure handling
+    as LLMCache.
+    """
+
+    KEY_PREFIX = "ai:"
+
+    def __init__(self, redis_url: str, ttl: timedelta = timedelta(days=7), client: Any = None):
+        if client is None:
+            from redis.asyncio import Redis
+
+            client = Redis.from_url(redis_url)
+        self.client = client
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Decoded response, or None if missing or expired
+        """
+        try:
+            raw = await self.client.get(self.KEY_PREFIX + key)
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            return None
+
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a response for the cache TTL.
+
+        Args:
+            key: Cache key from make_key()
+            value: JSON-serializable response
+        """
+        try:
+            await self.client.set(
+                self.KEY_PREFIX + key,
+                orjson.dumps(value),
+                ex=int(self.ttl.total_seconds()),
+            )
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.client.aclose()
+
+
+def create_llm_cache(settings: Settings) -> LLMCache:
+    """
+    Create the configured AI response cache.
+
+    Uses Redis when REDIS_URL is set and the redis package is installed,
+    otherwise the llm_cache table.
+    """
+    ttl = timedelta(days=settings.llm_cache_ttl_days)
+    if settings.redis_url:
+        try:
+            return RedisLLMCache(settings.redis_url, ttl=ttl)
+        except ImportError:
+            print("redis package not installed; using the database LLM cache")
+    return LLMCache(ttl=ttl)
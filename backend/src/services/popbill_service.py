@@ -6,8 +6,10 @@ Includes mock implementation for development without actual API credentials.
 
 import asyncio
 import random
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from src.config import get_settings
 
@@ -23,6 +25,21 @@ BANK_CODES = {
 # Reverse mapping
 BANK_NAMES = {v: k for k, v in BANK_CODES.items()}
 
+# Days of transactions fetched per chunk when syncing long date ranges
+FETCH_CHUNK_DAYS = 31
+
+# Blocking Popbill API calls in flight at once, across all requests
+POPBILL_MAX_CONCURRENCY = 8
+_popbill_executor = ThreadPoolExecutor(
+    max_workers=POPBILL_MAX_CONCURRENCY, thread_name_prefix="popbill"
+)
+
+# Mock transaction times: any minute from 09:00 to 18:59
+MOCK_MINUTES_OF_DAY = range(9 * 60, 19 * 60)
+
+# Max time between the two sides of an internal transfer (±5 minutes)
+TRANSFER_WINDOW_SECONDS = 300
+
 
 class PopbillService:
     """
@@ -92,6 +109,42 @@ class PopbillService:
 
         return transactions
 
+    async def fetch_transactions_chunked(
+        self,
+        corp_num: str,
+        accounts: list[dict],
+        start_date: date,
+        end_date: date,
+        chunk_days: int = FETCH_CHUNK_DAYS,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Fetch transactions in consecutive date windows.
+
+        Keeps memory bounded for long ranges. Chunks never split a day, and
+        internal transfers only pair transactions on the same date, so each
+        chunk can be passed to detect_internal_transfers on its own.
+
+        Args:
+            corp_num: Corporation registration number
+            accounts: List of account configs [{"bank": "기업은행", "account": "123-456"}]
+            start_date: Start date for query
+            end_date: End date for query
+            chunk_days: Days covered by each chunk
+
+        Yields:
+            Lists of transaction dictionaries, one per date window
+        """
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(window_start + timedelta(days=chunk_days - 1), end_date)
+            yield await self.fetch_transactions_batch(
+                corp_num=corp_num,
+                accounts=accounts,
+                start_date=window_start,
+                end_date=window_end,
+            )
+            window_start = window_end + timedelta(days=1)
+
     async def _fetch_single_account(
         self,
         corp_num: str,
@@ -104,10 +157,11 @@ class PopbillService:
         if not bank_code:
             raise ValueError(f"Unknown bank: {account['bank']}")
 
-        # Run sync Popbill call in thread pool
-        loop = asyncio.get_event_loop()
+        # Run the blocking Popbill call on its own bounded pool, so a wide fan-out
+        # can't take over the default executor other work relies on
+        loop = asyncio.get_running_loop()
         response = await loop.run_in_executor(
-            None,
+            _popbill_executor,
             lambda: self.service.search(
                 CorpNum=corp_num,
                 BankCode=bank_code,
@@ -123,15 +177,26 @@ class PopbillService:
     def _parse_transactions(self, response: dict, account: dict) -> list[dict]:
         """Parse Popbill API response into transaction dictionaries."""
         transactions = []
+        bank_code = BANK_CODES.get(account["bank"], "000")
+
+        # Parsed date and "YYYY-MM-DD" per trdate: a response covers few distinct days
+        days: dict[str, tuple[datetime, str]] = {}
 
         for item in response.get("list", []):
-            tx_date = datetime.strptime(item["trdate"], "%Y%m%d")
+            trdate = item["trdate"]
+            day = days.get(trdate)
+            if day is None:
+                day = days[trdate] = (
+                    datetime.strptime(trdate, "%Y%m%d"),
+                    f"{trdate[:4]}-{trdate[4:6]}-{trdate[6:]}",
+                )
+            tx_date, date_str = day
             tx_time = item.get("trtime", "00:00:00")
 
             # Generate unique ID
             tx_id = self._generate_transaction_id(
-                tx_date,
-                account["bank"],
+                date_str,
+                bank_code,
                 item.get("remark", ""),
                 len(transactions),
             )
@@ -192,38 +257,50 @@ class PopbillService:
             {"counterparty": "서비스료", "amount": 1500000, "type": "입금", "recurring": False},
         ]
 
+        # Per-account values, looked up once rather than per transaction
+        account_info = [
+            (
+                account["bank"],
+                BANK_CODES.get(account["bank"], "000"),
+                account.get("account", "123-456-789"),
+            )
+            for account in accounts
+        ]
+
         # Generate transactions for each day in range
         current_date = start_date
         while current_date <= end_date:
-            # Generate 2-5 transactions per day
-            num_transactions = random.randint(2, 5)
+            date_str = current_date.strftime("%Y-%m-%d")
+            tx_date = datetime.combine(current_date, datetime.min.time())
 
-            for _ in range(num_transactions):
-                template = random.choice(templates)
-                account = random.choice(accounts)
+            # Generate 2-5 transactions per day, drawing each field for the whole day at once
+            num_transactions = random.randint(2, 5)
+            draws = zip(
+                random.choices(templates, k=num_transactions),
+                random.choices(account_info, k=num_transactions),
+                random.choices(MOCK_MINUTES_OF_DAY, k=num_transactions),
+            )
 
+            for template, (bank_name, bank_code, account_number), minute_of_day in draws:
                 # Add some variation to amounts
-                amount_variation = random.uniform(0.9, 1.1)
-                amount = int(template["amount"] * amount_variation)
+                amount = int(template["amount"] * random.uniform(0.9, 1.1))
 
                 # Generate unique ID
-                bank_code = BANK_CODES.get(account["bank"], "000")
-                key = f"{current_date.strftime('%Y-%m-%d')}-{bank_code}"
+                key = f"{date_str}-{bank_code}"
                 transaction_counter[key] = transaction_counter.get(key, 0) + 1
 
-                tx_id = f"{current_date.strftime('%Y-%m-%d')}-{bank_code}-{template['counterparty'][:3]}-{transaction_counter[key]:03d}"
+                tx_id = f"{key}-{template['counterparty'][:3]}-{transaction_counter[key]:03d}"
 
                 # Random time
-                hour = random.randint(9, 18)
-                minute = random.randint(0, 59)
+                hour, minute = divmod(minute_of_day, 60)
                 tx_time = f"{hour:02d}:{minute:02d}:00"
 
                 mock_transactions.append(
                     {
                         "id": tx_id,
-                        "bank_name": account["bank"],
-                        "account_number": account.get("account", "123-456-789"),
-                        "date": datetime.combine(current_date, datetime.min.time()),
+                        "bank_name": bank_name,
+                        "account_number": account_number,
+                        "date": tx_date,
                         "time": tx_time,
                         "amount": amount,
                         "type": template["type"],
@@ -238,15 +315,14 @@ class PopbillService:
 
     def _generate_transaction_id(
         self,
-        tx_date: datetime,
-        bank_name: str,
+        date_str: str,
+        bank_code: str,
         counterparty: str,
         index: int,
     ) -> str:
-        """Generate unique transaction ID."""
-        bank_code = BANK_CODES.get(bank_name, "000")
+        """Generate unique transaction ID ("2026-02-05-003-AWS-001")."""
         party_code = counterparty[:3] if counterparty else "UNK"
-        return f"{tx_date.strftime('%Y-%m-%d')}-{bank_code}-{party_code}-{index:03d}"
+        return f"{date_str}-{bank_code}-{party_code}-{index:03d}"
 
     def detect_internal_transfers(self, transactions: list[dict]) -> list[str]:
         """
@@ -260,42 +336,46 @@ class PopbillService:
         Returns:
             List of transaction IDs to exclude (duplicates)
         """
-        internal_transfer_ids = []
-
-        # Group transactions by amount
-        by_amount: dict[int, list[dict]] = {}
+        # Only same-amount, same-day pairs can match: bucket by (amount, date).
+        # Times are parsed once, to seconds since midnight.
+        income_seconds: dict[tuple, list[int]] = {}
+        expenses: list[tuple[tuple, int, str]] = []
         for tx in transactions:
-            amount = tx["amount"]
-            if amount not in by_amount:
-                by_amount[amount] = []
-            by_amount[amount].append(tx)
-
-        # Find matching pairs
-        for amount, txs in by_amount.items():
-            if len(txs) < 2:
+            seconds = _seconds_of_day(tx["time"])
+            if seconds is None:
                 continue
-
-            incomes = [tx for tx in txs if tx["type"] == "입금"]
-            expenses = [tx for tx in txs if tx["type"] == "지출"]
-
-            for income in incomes:
-                for expense in expenses:
-                    # Check if same date (handle both datetime and date objects)
-                    income_date = income["date"].date() if hasattr(income["date"], 'date') else income["date"]
-                    expense_date = expense["date"].date() if hasattr(expense["date"], 'date') else expense["date"]
-                    if income_date != expense_date:
-                        continue
-
-                    # Check time window (±5 minutes)
-                    try:
-                        income_time = datetime.strptime(income["time"], "%H:%M:%S")
-                        expense_time = datetime.strptime(expense["time"], "%H:%M:%S")
-                        time_diff = abs((income_time - expense_time).total_seconds())
-
-                        if time_diff <= 300:  # 5 minutes
-                            # Mark one as internal transfer (keep income, mark expense)
-                            internal_transfer_ids.append(expense["id"])
-                    except (ValueError, TypeError):
-                        continue
+            tx_date = tx["date"].date() if hasattr(tx["date"], "date") else tx["date"]
+            key = (tx["amount"], tx_date)
+            if tx["type"] == "입금":
+                income_seconds.setdefault(key, []).append(seconds)
+            elif tx["type"] == "지출":
+                expenses.append((key, seconds, tx["id"]))
+
+        for times in income_seconds.values():
+            times.sort()
+
+        # Mark an expense (keep the income) if any income in its bucket is within the
+        # window: binary search for the first income at or after the window start
+        internal_transfer_ids = []
+        for key, seconds, tx_id in expenses:
+            income_times = income_seconds.get(key)
+            if not income_times:
+                continue
+            i = bisect_left(income_times, seconds - TRANSFER_WINDOW_SECONDS)
+            if i < len(income_times) and income_times[i] <= seconds + TRANSFER_WINDOW_SECONDS:
+                internal_transfer_ids.append(tx_id)
 
         return internal_transfer_ids
+
+
+def _seconds_of_day(time_str: Optional[str]) -> Optional[int]:
+    """Parse "HH:MM:SS" to seconds since midnight, or None if missing or malformed."""
+    if time_str is None:
+        return None
+    try:
+        hours, minutes, seconds = map(int, time_str.split(":"))
+    except ValueError:
+        return None
+    if not (0 <= hours < 24 and 0 <= minutes < 60 and 0 <= seconds < 60):
+        return None
+    return hours * 3600 + minutes * 60 + seconds
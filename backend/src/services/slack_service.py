@@ -4,12 +4,106 @@ Slack service for sending notifications and handling interactions.
 Supports real Slack API and mock mode for development.
 """
 
-import json
-from datetime import datetime
+import asyncio
+import re
+import time
+from datetime import datetime, timezone
 from typing import Any, Optional
 
+import orjson
+
 from src.config import get_settings
 
+# Slack rejects messages with more than 50 blocks
+SLACK_MAX_BLOCKS = 50
+
+# chat.postMessage limits: at most this many requests in flight, started at
+# least SLACK_POST_INTERVAL seconds apart (Slack allows ~1 message/second)
+SLACK_POST_CONCURRENCY = 3
+SLACK_POST_INTERVAL = 1.0
+
+# Shared by every SlackService, since the limit applies per app, not per instance
+_post_semaphore = asyncio.Semaphore(SLACK_POST_CONCURRENCY)
+_next_post_at = 0.0
+
+# action_id of answer buttons: answer_{tx_id}_{q_id}_{option}
+ANSWER_ACTION_ID = re.compile(
+    r"answer_(?P<tx_id>[^_]*)_(?P<q_id>[^_]*)_(?P<answer>.*)\Z", re.DOTALL
+)
+
+# Retries of a rate-limited (429) Slack call before it is reported as an error
+SLACK_MAX_RETRIES = 3
+
+# Constant blocks, shared by every message (the SDK only reads them)
+DIVIDER = {"type": "divider"}
+REVIEW_TIME_CONTEXT = {
+    "type": "context",
+    "elements": [
+        {"type": "mrkdwn", "text": "예상 소요 시간: 10분"},
+    ],
+}
+
+# App-wide Slack client, created at startup by init_slack_client()
+_shared_client: Optional[Any] = None
+
+
+async def init_slack_client() -> None:
+    """
+    Create the shared Slack client with a long-lived aiohttp session.
+
+    Without a session AsyncWebClient opens a new one (and a new TLS
+    connection) per API call. Does nothing when Slack is not configured.
+    """
+    global _shared_client
+    token = get_settings().slack_bot_token
+    if _shared_client is not None or not token:
+        return
+    try:
+        import aiohttp
+        import slack_sdk  # noqa: F401
+    except ImportError:
+        return
+    _shared_client = _create_client(token, session=aiohttp.ClientSession())
+
+
+def _create_client(token: str, **kwargs: Any) -> Any:
+    """
+    Create an AsyncWebClient that retries rate-limited (429) calls.
+
+    The rate-limit handler waits for Slack's Retry-After before retrying,
+    so a burst of sends is delayed instead of dropped.
+
+    Raises:
+        ImportError: slack_sdk is not installed
+    """
+    from slack_sdk.http_retry.builtin_async_handlers import (
+        AsyncConnectionErrorRetryHandler,
+        AsyncRateLimitErrorRetryHandler,
+    )
+    from slack_sdk.web.async_client import AsyncWebClient
+
+    return AsyncWebClient(
+        token=token,
+        retry_handlers=[
+            AsyncConnectionErrorRetryHandler(),
+            AsyncRateLimitErrorRetryHandler(max_retry_count=SLACK_MAX_RETRIES),
+        ],
+        **kwargs,
+    )
+
+
+def get_slack_client() -> Optional[Any]:
+    """Get the shared Slack client, or None before startup / in mock mode."""
+    return _shared_client
+
+
+async def close_slack_client() -> None:
+    """Close the shared Slack client's HTTP session."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.session.close()
+        _shared_client = None
+
 
 class SlackService:
     """
@@ -28,15 +122,21 @@ class SlackService:
         self.bot_token = bot_token or settings.slack_bot_token
         self.channel_id = channel_id or settings.slack_channel_id
         self.is_mock = not (self.bot_token and self.channel_id)
+        self.web_base_url = settings.web_base_url.rstrip("/")
 
         if not self.is_mock:
-            try:
-                from slack_sdk import WebClient
-
-                self.client = WebClient(token=self.bot_token)
-            except ImportError:
-                self.is_mock = True
-                self.client = None
+            # The app-wide client keeps its connections open across requests;
+            # a service with its own token (or created outside the app) builds one
+            shared_client = get_slack_client()
+            if shared_client is not None and self.bot_token == settings.slack_bot_token:
+                self.client = shared_client
+            else:
+                try:
+                    # Async client: sends don't block the event loop during the HTTP call
+                    self.client = _create_client(self.bot_token)
+                except ImportError:
+                    self.is_mock = True
+                    self.client = None
         else:
             self.client = None
 
@@ -64,21 +164,60 @@ class SlackService:
         if self.is_mock:
             return await self._mock_send(blocks, "daily_questions")
 
-        # Real Slack API call
+        # Real Slack API call - one message per SLACK_MAX_BLOCKS blocks, posted in
+        # order so the questions read top to bottom in the channel
+        text = f"어제 거래 {len(transactions)}건 확인 필요"
         try:
-            response = self.client.chat_postMessage(
-                channel=self.channel_id,
-                blocks=blocks,
-                text=f"어제 거래 {len(transactions)}건 확인 필요",
-            )
+            responses = [
+                await self._post_message(channel=self.channel_id, blocks=chunk, text=text)
+                for chunk in _chunk_blocks(blocks)
+            ]
             return {
                 "status": "sent",
-                "ts": response["ts"],
-                "channel": response["channel"],
+                "ts": responses[0]["ts"],
+                "channel": responses[0]["channel"],
+                "messages": len(responses),
             }
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
+    async def send_many(self, channels: list[str], blocks: list[dict], text: str) -> list[dict]:
+        """
+        Post the same message to several channels concurrently.
+
+        Args:
+            channels: Channel IDs
+            blocks: Slack Block Kit blocks (split into messages of SLACK_MAX_BLOCKS)
+            text: Notification fallback text
+
+        Returns:
+            Per-channel results, in the same order as channels
+        """
+        if self.is_mock:
+            return [await self._mock_send(blocks, "broadcast") for _ in channels]
+
+        async def post(channel: str) -> dict:
+            try:
+                for chunk in _chunk_blocks(blocks):
+                    response = await self._post_message(channel=channel, blocks=chunk, text=text)
+                return {"status": "sent", "channel": channel, "ts": response["ts"]}
+            except Exception as e:
+                return {"status": "error", "channel": channel, "error": str(e)}
+
+        return await asyncio.gather(*(post(channel) for channel in channels))
+
+    async def _post_message(self, **kwargs: Any) -> Any:
+        """Call chat.postMessage within the app-wide concurrency and rate limit."""
+        global _next_post_at
+        async with _post_semaphore:
+            # Reserve the next send slot before sleeping so concurrent callers queue up
+            now = time.monotonic()
+            send_at = max(now, _next_post_at)
+            _next_post_at = send_at + SLACK_POST_INTERVAL
+            if send_at > now:
+                await asyncio.sleep(send_at - now)
+            return await self.client.chat_postMessage(**kwargs)
+
     def _build_question_blocks(
         self,
         transactions: list[dict],
@@ -93,7 +232,7 @@ class SlackService:
                     "text": f"📊 *어제 거래 {len(transactions)}건 확인 필요* (예상 소요: {len(transactions)}분)",
                 },
             },
-            {"type": "divider"},
+            DIVIDER,
         ]
 
         for i, tx in enumerate(transactions, 1):
@@ -119,7 +258,9 @@ class SlackService:
             # Questions for this transaction
             questions = questions_by_transaction.get(tx["id"], [])
             for q in questions:
-                # Create button elements for options
+                # Create button elements for options. Each value is the JSON object
+                # {"tx_id", "q_id", "answer"}; only the answer differs between buttons.
+                value_prefix = orjson.dumps({"tx_id": tx["id"], "q_id": q["id"]})[:-1].decode()
                 elements = []
                 for opt in q.get("options", [])[:5]:  # Max 5 buttons per row
                     elements.append(
@@ -127,13 +268,7 @@ class SlackService:
                             "type": "button",
                             "text": {"type": "plain_text", "text": opt[:20]},  # Max 20 chars
                             "action_id": f"answer_{tx['id']}_{q['id']}_{opt[:20]}",
-                            "value": json.dumps(
-                                {
-                                    "tx_id": tx["id"],
-                                    "q_id": q["id"],
-                                    "answer": opt,
-                                }
-                            ),
+                            "value": f'{value_prefix},"answer":{orjson.dumps(opt).decode()}}}',
                         }
                     )
 
@@ -155,7 +290,7 @@ class SlackService:
                         }
                     )
 
-            blocks.append({"type": "divider"})
+            blocks.append(DIVIDER)
 
         return blocks
 
@@ -194,7 +329,7 @@ class SlackService:
                     {
                         "type": "button",
                         "text": {"type": "plain_text", "text": "답변하러 가기 →"},
-                        "url": f"http://localhost:3000/transactions/{transaction_id}",
+                        "url": f"{self.web_base_url}/transactions/{transaction_id}",
                         "style": "primary",
                     },
                     {
@@ -210,7 +345,7 @@ class SlackService:
             return await self._mock_send(blocks, "reminder")
 
         try:
-            response = self.client.chat_postMessage(
+            response = await self._post_message(
                 channel=self.channel_id,
                 blocks=blocks,
                 text=f"리마인더: {transaction_summary}",
@@ -266,24 +401,19 @@ class SlackService:
                     {
                         "type": "button",
                         "text": {"type": "plain_text", "text": "문서 확인하기 →"},
-                        "url": f"http://localhost:3000/documents/{document_id}",
+                        "url": f"{self.web_base_url}/documents/{document_id}",
                         "style": "primary",
                     },
                 ],
             },
-            {
-                "type": "context",
-                "elements": [
-                    {"type": "mrkdwn", "text": "예상 소요 시간: 10분"},
-                ],
-            },
+            REVIEW_TIME_CONTEXT,
         ]
 
         if self.is_mock:
             return await self._mock_send(blocks, "document_ready")
 
         try:
-            response = self.client.chat_postMessage(
+            response = await self._post_message(
                 channel=self.channel_id,
                 blocks=blocks,
                 text=f"{month} 부가세 신고 문서 준비 완료!",
@@ -306,52 +436,74 @@ class SlackService:
         value = action.get("value", "{}")
 
         try:
-            data = json.loads(value)
+            data = orjson.loads(value)
             return {
                 "status": "success",
                 "transaction_id": data.get("tx_id"),
                 "question_id": data.get("q_id"),
                 "answer": data.get("answer"),
                 "user_id": payload.get("user", {}).get("id"),
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
             }
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Fallback: parse from action_id
-            action_id = action.get("action_id", "")
-            parts = action_id.split("_")
-            if len(parts) >= 4 and parts[0] == "answer":
+            match = ANSWER_ACTION_ID.match(action.get("action_id", ""))
+            if match:
                 return {
                     "status": "success",
-                    "transaction_id": parts[1],
-                    "question_id": parts[2],
-                    "answer": "_".join(parts[3:]),
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "transaction_id": match["tx_id"],
+                    "question_id": match["q_id"],
+                    "answer": match["answer"],
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
 
         return {"status": "error", "error": "Could not parse interaction"}
 
     async def _mock_send(self, blocks: list[dict], message_type: str) -> dict:
         """Mock send - logs message instead of sending to Slack."""
-        print(f"\n{'='*60}")
-        print(f"🔔 MOCK SLACK MESSAGE ({message_type})")
-        print(f"{'='*60}")
+        # Collect the lines and print once, so concurrent mock sends don't interleave
+        lines = ["", "=" * 60, f"🔔 MOCK SLACK MESSAGE ({message_type})", "=" * 60]
         for block in blocks:
             if block.get("type") == "section":
                 text = block.get("text", {}).get("text", "")
-                print(f"  {text}")
+                lines.append(f"  {text}")
             elif block.get("type") == "actions":
                 buttons = [
                     e.get("text", {}).get("text", "")
                     for e in block.get("elements", [])
                     if e.get("type") == "button"
                 ]
-                print(f"  [Buttons: {', '.join(buttons)}]")
+                lines.append(f"  [Buttons: {', '.join(buttons)}]")
             elif block.get("type") == "divider":
-                print(f"  {'─'*40}")
-        print(f"{'='*60}\n")
+                lines.append(f"  {'─'*40}")
+        lines.append("=" * 60)
+        print("\n".join(lines) + "\n")
 
         return {
             "status": "mock_sent",
             "message_type": message_type,
             "blocks_count": len(blocks),
         }
+
+
+def _chunk_blocks(blocks: list[dict]) -> list[list[dict]]:
+    """
+    Split blocks into messages of at most SLACK_MAX_BLOCKS.
+
+    Splits only after a divider, so a transaction's header, questions and
+    buttons stay in one message.
+    """
+    chunks: list[list[dict]] = [[]]
+    segment: list[dict] = []
+    for block in blocks:
+        segment.append(block)
+        if block.get("type") == "divider":
+            if chunks[-1] and len(chunks[-1]) + len(segment) > SLACK_MAX_BLOCKS:
+                chunks.append([])
+            chunks[-1].extend(segment)
+            segment = []
+    if segment:
+        if chunks[-1] and len(chunks[-1]) + len(segment) > SLACK_MAX_BLOCKS:
+            chunks.append([])
+        chunks[-1].extend(segment)
+    return chunks
@@ -2,7 +2,16 @@
 Utility functions for AI Tax Assistant.
 """
 
+from src.utils.cache import TTLCache, json_etag
+from src.utils.dates import month_bounds
 from src.utils.encryption import decrypt_value, encrypt_value
 from src.utils.masking import mask_account_number
 
-__all__ = ["encrypt_value", "decrypt_value", "mask_account_number"]
+__all__ = [
+    "encrypt_value",
+    "decrypt_value",
+    "mask_account_number",
+    "month_bounds",
+    "TTLCache",
+    "json_etag",
+]
@@ -0,0 +1,86 @@
+"""
+In-memory cache with per-entry expiry.
+"""
+
+import hashlib
+import time
+from typing import Any, Hashable, Optional
+
+from pydantic import BaseModel
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after a fixed TTL.
+
+    Not shared across worker processes; meant for read-mostly responses
+    that are cheap to rebuild on a miss.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value for the cache's TTL.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if len(self._entries) >= self.max_entries and key not in self._entries:
+            self._evict()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Drop expired entries, or the oldest entry if none have expired."""
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+        if not expired:
+            del self._entries[next(iter(self._entries))]
+
+
+def json_etag(payload: BaseModel) -> str:
+    """
+    Build a strong ETag from a response model's JSON.
+
+    Args:
+        payload: Response model
+
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.md5(payload.model_dump_json().encode(), usedforsecurity=False)
+    return f'"{digest.hexdigest()}"'
@@ -0,0 +1,36 @@
+"""
+Date utilities for month-based queries.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=128)
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    """
+    Get the [start, end) datetime range for a month.
+
+    Examples:
+        "2026-02" -> (datetime(2026, 2, 1), datetime(2026, 3, 1))
+        "2026-12" -> (datetime(2026, 12, 1), datetime(2027, 1, 1))
+
+    Args:
+        month: Month string in YYYY-MM format
+
+    Returns:
+        Tuple of (first day of month, first day of next month)
+
+    Raises:
+        ValueError: If month is not a valid YYYY-MM string
+    """
+    year_str, month_str = month.split("-")
+    year, mon = int(year_str), int(month_str)
+
+    start = datetime(year, mon, 1)
+    if mon == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, mon + 1, 1)
+
+    return start, end
@@ -1,46 +1,58 @@
 """
 Encryption utilities for sensitive data.
 
-Uses AES-256 encryption for storing API keys and account numbers.
+Uses AES-256-GCM for storing API keys and account numbers. Values written
+by earlier versions with Fernet (AES-128-CBC + HMAC) still decrypt.
 """
 
 import base64
 import os
+import threading
 from typing import Optional
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from src.config import get_settings
 
-# Cache for Fernet instance
-_fernet: Optional[Fernet] = None
+# Leading byte of AES-GCM tokens; Fernet tokens start with 0x80
+GCM_VERSION = b"\x01"
+GCM_NONCE_SIZE = 12
 
+# Cache for the cipher instances (AES-GCM for new values, Fernet for old ones)
+_ciphers: Optional[tuple[AESGCM, Fernet]] = None
 
-def _get_fernet() -> Fernet:
-    """Get or create Fernet encryption instance."""
-    global _fernet
+# Guards the one-time PBKDF2 derivation when worker threads race on first use
+_ciphers_lock = threading.Lock()
 
-    if _fernet is None:
-        settings = get_settings()
-        key = settings.encryption_key
 
-        if not key:
-            # Generate a default key for development (not secure for production)
-            key = "development-key-do-not-use-in-production"
+def _get_ciphers() -> tuple[AESGCM, Fernet]:
+    """Get or create the AES-GCM and legacy Fernet instances."""
+    global _ciphers
 
-        # Derive a proper key from the provided key
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b"ai-tax-assistant-salt",  # Fixed salt for consistency
-            iterations=100000,
-        )
-        derived_key = base64.urlsafe_b64encode(kdf.derive(key.encode()))
-        _fernet = Fernet(derived_key)
+    if _ciphers is None:
+        with _ciphers_lock:
+            if _ciphers is None:
+                settings = get_settings()
+                key = settings.encryption_key
 
-    return _fernet
+                if not key:
+                    # Generate a default key for development (not secure for production)
+                    key = "development-key-do-not-use-in-production"
+
+                # Derive a proper key from the provided key
+                kdf = PBKDF2HMAC(
+                    algorithm=hashes.SHA256(),
+                    length=32,
+                    salt=b"ai-tax-assistant-salt",  # Fixed salt for consistency
+                    iterations=100000,
+                )
+                derived_key = kdf.derive(key.encode())
+                _ciphers = (AESGCM(derived_key), Fernet(base64.urlsafe_b64encode(derived_key)))
+
+    return _ciphers
 
 
 def encrypt_value(value: str) -> str:
@@ -53,9 +65,10 @@ def encrypt_value(value: str) -> str:
     Returns:
         Base64-encoded encrypted string
     """
-    fernet = _get_fernet()
-    encrypted = fernet.encrypt(value.encode())
-    return encrypted.decode()
+    aesgcm, _ = _get_ciphers()
+    nonce = os.urandom(GCM_NONCE_SIZE)
+    encrypted = aesgcm.encrypt(nonce, value.encode(), None)
+    return base64.urlsafe_b64encode(GCM_VERSION + nonce + encrypted).decode()
 
 
 def decrypt_value(encrypted_value: str) -> str:
@@ -68,6 +81,10 @@ def decrypt_value(encrypted_value: str) -> str:
     Returns:
         Decrypted plain text value
     """
-    fernet = _get_fernet()
-    decrypted = fernet.decrypt(encrypted_value.encode())
+    aesgcm, fernet = _get_ciphers()
+    token = base64.urlsafe_b64decode(encrypted_value.encode())
+    if not token.startswith(GCM_VERSION):
+        return fernet.decrypt(encrypted_value.encode()).decode()
+    nonce = token[1 : 1 + GCM_NONCE_SIZE]
+    decrypted = aesgcm.decrypt(nonce, token[1 + GCM_NONCE_SIZE :], None)
     return decrypted.decode()
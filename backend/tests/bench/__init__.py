@@ -0,0 +1 @@
+# Benchmarks (make bench)
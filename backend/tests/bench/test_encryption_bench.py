@@ -0,0 +1,35 @@
+"""
+Benchmarks for encryption utilities.
+
+Run with `make bench`; a normal test run executes each benchmark once.
+"""
+
+import pytest
+
+from src.utils.encryption import _get_ciphers, decrypt_value, encrypt_value
+
+
+@pytest.fixture(scope="module", autouse=True)
+def derived_key():
+    """Derive the key before timing, so PBKDF2 doesn't land in the first benchmark."""
+    _get_ciphers()
+
+
+@pytest.mark.parametrize("size", [16, 256, 4096])
+class TestEncryptionBench:
+    """Encrypt/decrypt cost by payload size (setup vs. cipher throughput)."""
+
+    def test_encrypt(self, benchmark, size):
+        """Benchmark encrypt_value."""
+        payload = "x" * size
+
+        encrypted = benchmark(encrypt_value, payload)
+
+        assert decrypt_value(encrypted) == payload
+
+    def test_decrypt(self, benchmark, size):
+        """Benchmark decrypt_value."""
+        payload = "x" * size
+        encrypted = encrypt_value(payload)
+
+        assert benchmark(decrypt_value, encrypted) == payload
@@ -0,0 +1,47 @@
+"""
+Benchmarks for masking utilities.
+
+Cases come from the unit-test tables, so every benchmarked input is also
+checked for correctness there.
+"""
+
+import tracemalloc
+
+import pytest
+
+from src.utils.masking import mask_account_number, mask_email
+from tests.unit.test_utils import MASK_ACCOUNT_CASES, MASK_EMAIL_CASES
+
+
+class TestMaskingBench:
+    """Per-call cost of display masking, grouped per function."""
+
+    @pytest.mark.benchmark(group="mask_account_number")
+    @pytest.mark.parametrize("account_number,expected", MASK_ACCOUNT_CASES)
+    def test_mask_account_number(self, benchmark, account_number, expected):
+        """Benchmark masking an account number."""
+        result = benchmark.pedantic(
+            mask_account_number, args=(account_number,), rounds=1000, iterations=500
+        )
+
+        assert result == expected
+
+    @pytest.mark.benchmark(group="mask_email")
+    @pytest.mark.parametrize("email,expected", MASK_EMAIL_CASES)
+    def test_mask_email(self, benchmark, email, expected):
+        """Benchmark masking an email address."""
+        result = benchmark.pedantic(mask_email, args=(email,), rounds=1000, iterations=500)
+
+        assert result == expected
+
+    def test_mask_email_allocation_budget(self):
+        """Test masking keeps no memory alive between calls (peak stays flat)."""
+        tracemalloc.start()
+        try:
+            for _ in range(10_000):
+                mask_email("user@example.com")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 200 * 1024
@@ -2,15 +2,15 @@
 Pytest configuration and fixtures.
 """
 
-import asyncio
 from datetime import date, datetime
 from typing import AsyncGenerator
 
-import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
+from src.api import enrichment, transactions
 from src.database import Base, get_session
 from src.main import app
 from src.models import Transaction, TransactionStatus, TransactionType
@@ -20,30 +20,33 @@ from src.models import Transaction, TransactionStatus, TransactionType
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
-@pytest_asyncio.fixture(scope="function")
-async def test_engine():
-    """Create test database engine."""
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+@pytest_asyncio.fixture(scope="session")
+async def database_engine():
+    """Create the test database engine and schema once per session."""
+    # One shared connection: every session (including those opened by background
+    # tasks) must see the same in-memory database
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False, poolclass=StaticPool)
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
     yield engine
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-
     await engine.dispose()
 
 
+@pytest_asyncio.fixture(scope="function")
+async def test_engine(database_engine):
+    """Provide the shared test engine, emptying every table after the test."""
+    yield database_engine
+
+    # Tests and background tasks commit through their own sessions, so rows are
+    # cleared with DELETE rather than rolled back from a per-test SAVEPOINT
+    async with database_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
+
+
 @pytest_asyncio.fixture(scope="function")
 async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
@@ -73,6 +76,9 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
         yield client
 
     app.dependency_overrides.clear()
+    # In-process response caches are keyed by IDs that every test reuses
+    enrichment._context_cache.clear()
+    transactions._transaction_cache.clear()
 
 
 @pytest_asyncio.fixture
@@ -126,9 +132,7 @@ async def sample_transactions(test_session: AsyncSession) -> list[Transaction]:
         ),
     ]
 
-    for tx in transactions:
-        test_session.add(tx)
-
+    test_session.add_all(transactions)
     await test_session.commit()
 
     return transactions
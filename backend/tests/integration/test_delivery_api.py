@@ -0,0 +1,102 @@
+"""
+Integration tests for Delivery API.
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from src.services.email_service import EmailService
+
+
+class TestDeliveryAPI:
+    """Integration tests for /api/v1/delivery endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_delivery_status_etag(self, client: AsyncClient, sample_transactions):
+        """Test status polling with If-None-Match returns 304 until the status changes."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.get("/api/v1/delivery/status/MD-2026-02")
+        assert response.status_code == 200
+        assert response.json()["status"] == "generated"
+        etag = response.headers["etag"]
+
+        cached = await client.get(
+            "/api/v1/delivery/status/MD-2026-02", headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+        await client.post("/api/v1/documents/MD-2026-02/review")
+        changed = await client.get(
+            "/api/v1/delivery/status/MD-2026-02", headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.json()["status"] == "reviewed"
+
+    @pytest.mark.asyncio
+    async def test_send_requires_review(self, client: AsyncClient, sample_transactions):
+        """Test unreviewed documents cannot be sent."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.post(
+            "/api/v1/delivery/send",
+            json={"document_id": "MD-2026-02", "accountant_email": "tax@example.com"},
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_send_with_idempotency_key_sends_once(
+        self, client: AsyncClient, sample_transactions, monkeypatch
+    ):
+        """Test a retried send with the same Idempotency-Key is not re-sent."""
+        sends = []
+
+        async def fake_send(self, **kwargs):
+            sends.append(kwargs["to_email"])
+            return {"status": "mock_sent", "sent_at": "2026-03-01T09:00:00"}
+
+        monkeypatch.setattr(EmailService, "send_to_accountant", fake_send)
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+        await client.post("/api/v1/documents/MD-2026-02/review")
+
+        payload = {"document_id": "MD-2026-02", "accountant_email": "tax@example.com"}
+        headers = {"Idempotency-Key": "send-1"}
+        first = await client.post("/api/v1/delivery/send", json=payload, headers=headers)
+        retry = await client.post("/api/v1/delivery/send", json=payload, headers=headers)
+
+        assert first.status_code == retry.status_code == 200
+        assert retry.json() == first.json()
+        assert sends == ["tax@example.com"]
+
+    @pytest.mark.asyncio
+    async def test_delivery_status_etag_changes_on_resend(
+        self, client: AsyncClient, sample_transactions, monkeypatch
+    ):
+        """Test resending a sent document to another accountant invalidates the ETag."""
+
+        async def fake_send(self, **kwargs):
+            return {"status": "mock_sent", "sent_at": "2026-03-01T09:00:00"}
+
+        monkeypatch.setattr(EmailService, "send_to_accountant", fake_send)
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+        await client.post("/api/v1/documents/MD-2026-02/review")
+        await client.post(
+            "/api/v1/delivery/send",
+            json={"document_id": "MD-2026-02", "accountant_email": "tax@example.com"},
+        )
+
+        sent = await client.get("/api/v1/delivery/status/MD-2026-02")
+        assert sent.json()["status"] == "sent"
+        etag = sent.headers["etag"]
+
+        await client.post(
+            "/api/v1/delivery/send",
+            json={"document_id": "MD-2026-02", "accountant_email": "other@example.com"},
+        )
+        resent = await client.get(
+            "/api/v1/delivery/status/MD-2026-02", headers={"If-None-Match": etag}
+        )
+
+        assert resent.status_code == 200
+        assert resent.json()["accountant_email"] == "other@example.com"
@@ -0,0 +1,239 @@
+"""
+Integration tests for Documents API.
+"""
+
+from io import BytesIO
+
+import pytest
+from httpx import AsyncClient
+from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.api import documents
+from src.models import MonthlyDocument
+
+
+@pytest.fixture(autouse=True)
+def clear_preview_cache():
+    """Keep cached previews from leaking between tests."""
+    documents._preview_cache.clear()
+
+
+class TestDocumentsAPI:
+    """Integration tests for /api/v1/documents endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_generate_document(self, client: AsyncClient, sample_transactions):
+        """Test generating a monthly document."""
+        response = await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["document_id"] == "MD-2026-02"
+        assert data["total_transactions"] == 3
+
+        document = (await client.get("/api/v1/documents/MD-2026-02")).json()
+        assert document["total_income"] == 5000000
+        assert document["total_expense"] == 62000
+        assert "| **총 지출** | 62,000원 | 2건 |" in document["document_markdown"]
+
+    @pytest.mark.asyncio
+    async def test_generated_at_set_by_database(self, client: AsyncClient, test_session):
+        """Test generated_at is filled from the database clock on insert."""
+        document = MonthlyDocument(id="MD-2026-01", month="2026-01", document_markdown="")
+        test_session.add(document)
+        await test_session.commit()
+
+        # Read back via RETURNING; no refresh (and no lazy load) needed
+        assert document.generated_at is not None
+
+        response = await client.get("/api/v1/documents/MD-2026-01")
+        assert response.json()["generated_at"].startswith(str(document.generated_at.date()))
+
+    @pytest.mark.asyncio
+    async def test_mark_reviewed(self, client: AsyncClient, sample_transactions):
+        """Test marking a document reviewed returns the review timestamp."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.post("/api/v1/documents/MD-2026-02/review")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["status"] == "success"
+        assert data["reviewed_at"].startswith("20")
+
+    @pytest.mark.asyncio
+    async def test_list_documents_paginated(self, client: AsyncClient, test_session):
+        """Test month-cursor pagination of the document list."""
+        for month in ["2026-01", "2026-02", "2026-03"]:
+            test_session.add(MonthlyDocument(id=f"MD-{month}", month=month, document_markdown=""))
+        await test_session.commit()
+
+        first = await client.get("/api/v1/documents/", params={"limit": 2})
+        assert [doc["month"] for doc in first.json()] == ["2026-03", "2026-02"]
+        cursor = first.headers["x-next-cursor"]
+
+        second = await client.get("/api/v1/documents/", params={"limit": 2, "before_month": cursor})
+        assert [doc["month"] for doc in second.json()] == ["2026-01"]
+        assert "x-next-cursor" not in second.headers
+
+    @pytest.mark.asyncio
+    async def test_large_response_is_gzipped(self, client: AsyncClient, sample_transactions):
+        """Test JSON responses above the size threshold are compressed."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.get(
+            "/api/v1/documents/MD-2026-02", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["id"] == "MD-2026-02"
+
+    @pytest.mark.asyncio
+    async def test_download_excel(self, client: AsyncClient, sample_transactions):
+        """Test downloading the document as an Excel file."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.get("/api/v1/documents/MD-2026-02/download")
+
+        assert response.status_code == 200
+        assert "filename*=UTF-8''" in response.headers["content-disposition"]
+
+        wb = load_workbook(BytesIO(response.content))
+        assert wb.sheetnames[0] == "거래 내역"
+        assert wb["거래 내역"].max_row == 4  # Header + 3 transactions
+
+    @pytest.mark.asyncio
+    async def test_excel_preview_invalidated_on_update(
+        self, client: AsyncClient, test_session, sample_transactions
+    ):
+        """Test cached preview is dropped when the document is edited."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+        first = await client.get("/api/v1/documents/MD-2026-02/excel-preview")
+        assert first.status_code == 200
+        assert len(first.json()["rows"]) == 3
+
+        await client.put(
+            "/api/v1/documents/MD-2026-02/batch",
+            json={
+                "updates": [
+                    {
+                        "transaction_id": "2026-02-05-003-AWS-001",
+                        "updates": {"account_classification": "지급수수료"},
+                    }
+                ]
+            },
+        )
+        # The test client shares one session across requests; drop loaded relationships
+        test_session.expire_all()
+
+        rows = (await client.get("/api/v1/documents/MD-2026-02/excel-preview")).json()["rows"]
+        assert "지급수수료" in [row["account_classification"] for row in rows]
+
+    @pytest.mark.asyncio
+    async def test_download_excel_not_found(self, client: AsyncClient):
+        """Test downloading a non-existent document."""
+        response = await client.get("/api/v1/documents/nonexistent-id/download")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_update_document_regenerates_in_background(
+        self, client: AsyncClient, test_engine, sample_transactions, monkeypatch
+    ):
+        """Test inline edit is applied and the document regenerated after the response."""
+        monkeypatch.setattr(documents, "REGENERATE_DEBOUNCE_SECONDS", 0)
+        monkeypatch.setattr(
+            documents,
+            "async_session_maker",
+            async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False),
+        )
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.put(
+            "/api/v1/documents/MD-2026-02",
+            json={
+                "transaction_id": "2026-02-05-003-AWS-001",
+                "updates": {"category": "서버비", "tax_notes": "부가세 공제 가능"},
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["document_version"] == 1
+        assert response.json()["regeneration"] == "scheduled"
+
+        async with async_sessionmaker(test_engine, class_=AsyncSession)() as session:
+            document = await session.get(MonthlyDocument, "MD-2026-02")
+        assert document.document_version == 2
+        assert "부가세 공제 가능" in document.document_markdown
+
+    @pytest.mark.asyncio
+    async def test_update_document_returns_pre_edit_version(
+        self, client: AsyncClient, sample_transactions, monkeypatch
+    ):
+        """Test single edit reports the pre-edit version until regeneration runs."""
+        regenerations = []
+
+        async def fake_regenerate(*args):
+            regenerations.append(args)
+
+        monkeypatch.setattr(documents, "_regenerate_document", fake_regenerate)
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.put(
+            "/api/v1/documents/MD-2026-02",
+            json={"transaction_id": "2026-02-05-003-AWS-001", "updates": {"category": "서버비"}},
+        )
+
+        assert response.json() == {
+            "status": "success",
+            "document_version": 1,
+            "regeneration": "scheduled",
+        }
+        assert len(regenerations) == 1
+        document = (await client.get("/api/v1/documents/MD-2026-02")).json()
+        assert document["document_version"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_update_document(self, client: AsyncClient, sample_transactions):
+        """Test applying several edits with a single regeneration."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.put(
+            "/api/v1/documents/MD-2026-02/batch",
+            json={
+                "updates": [
+                    {
+                        "transaction_id": "2026-02-05-003-AWS-001",
+                        "updates": {"category": "서버비"},
+                    },
+                    {
+                        "transaction_id": "2026-02-05-003-AWS-001",
+                        "updates": {"tax_notes": "부가세 공제 가능"},
+                    },
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.json()["document_version"] == 2
+        assert response.json()["regeneration"] == "completed"
+
+        document = (await client.get("/api/v1/documents/MD-2026-02")).json()
+        assert "**카테고리**: 서버비" in document["document_markdown"]
+        assert "부가세 공제 가능" in document["document_markdown"]
+
+    @pytest.mark.asyncio
+    async def test_batch_update_unknown_transaction(self, client: AsyncClient, sample_transactions):
+        """Test batch with an unknown transaction is rejected."""
+        await client.post("/api/v1/documents/generate", json={"month": "2026-02"})
+
+        response = await client.put(
+            "/api/v1/documents/MD-2026-02/batch",
+            json={"updates": [{"transaction_id": "missing", "updates": {"category": "x"}}]},
+        )
+
+        assert response.status_code == 404
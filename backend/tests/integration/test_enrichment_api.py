@@ -0,0 +1,284 @@
+"""
+Integration tests for Enrichment API.
+"""
+
+from datetime import datetime
+
+import pytest
+from httpx import AsyncClient
+
+from src.config import get_settings
+from src.main import app
+from src.models import EnrichedContext, Transaction, TransactionStatus, TransactionType
+from src.services.ai_service import get_ai_service
+
+
+class FakeAIService:
+    """AIService stand-in that records question and summary requests."""
+
+    def __init__(self):
+        self.calls: list[tuple[dict, list[dict]]] = []
+        self.summary_calls: list[dict] = []
+
+    async def generate_smart_questions(self, transaction, past_patterns=None, tax_context=None):
+        self.calls.append((transaction, past_patterns))
+        return {
+            "questions": [
+                {
+                    "id": "Q1",
+                    "text": "용도는?",
+                    "options": ["사업운영", "기타"],
+                    "type": "single_choice",
+                }
+            ],
+            "confidence": 0.9,
+        }
+
+    async def generate_smart_questions_batch(self, transactions, past_patterns):
+        return [
+            await self.generate_smart_questions(tx, past)
+            for tx, past in zip(transactions, past_patterns)
+        ]
+
+    async def generate_ai_summary(self, transaction, answers):
+        self.summary_calls.append(transaction)
+        return {"summary": "AWS 서버비", "account_classification": "경비 - 통신비"}
+
+
+class TestEnrichmentAPI:
+    """Integration tests for /api/v1/enrichment endpoints."""
+
+    @pytest.fixture
+    def ai_service(self, client):
+        """Override the AIService dependency with a fake."""
+        fake = FakeAIService()
+        app.dependency_overrides[get_ai_service] = lambda: fake
+        return fake
+
+    @pytest.fixture
+    async def previous_aws_bill(self, test_session, sample_transactions):
+        """Add last month's AWS bill as a past pattern."""
+        tx = Transaction(
+            id="2026-01-05-003-AWS-001",
+            bank_name="기업은행",
+            account_number="encrypted_123",
+            account_number_masked="***-**-789",
+            date=datetime(2026, 1, 5),
+            amount=48000,
+            type=TransactionType.EXPENSE,
+            counterparty="AWS Korea",
+            status=TransactionStatus.ENRICHED,
+        )
+        test_session.add(tx)
+        await test_session.commit()
+        return tx
+
+    @pytest.mark.asyncio
+    async def test_generate_questions(
+        self, client: AsyncClient, ai_service, sample_transactions, previous_aws_bill
+    ):
+        """Test questions for one transaction include its past patterns."""
+        response = await client.post(
+            "/api/v1/enrichment/questions",
+            json={"transaction_id": "2026-02-05-003-AWS-001"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["questions"][0]["id"] == "Q1"
+        _, past_patterns = ai_service.calls[0]
+        assert past_patterns == [
+            {"date": "2026-01-05", "amount": 48000, "counterparty": "AWS Korea"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_batch(
+        self, client: AsyncClient, ai_service, sample_transactions, previous_aws_bill
+    ):
+        """Test batch questions keep request order and exclude each transaction itself."""
+        ids = ["2026-02-05-003-AWS-001", "2026-01-05-003-AWS-001", "2026-02-05-003-점심-002"]
+        response = await client.post(
+            "/api/v1/enrichment/questions/batch", json={"transaction_ids": ids}
+        )
+
+        assert response.status_code == 200
+        assert [item["transaction_id"] for item in response.json()] == ids
+
+        past_by_id = {tx["id"]: past for tx, past in ai_service.calls}
+        assert [p["date"] for p in past_by_id[ids[0]]] == ["2026-01-05"]
+        assert [p["date"] for p in past_by_id[ids[1]]] == ["2026-02-05"]
+        assert past_by_id[ids[2]] == []
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_batch_unknown_transaction(
+        self, client: AsyncClient, ai_service, sample_transactions
+    ):
+        """Test batch with an unknown transaction is rejected."""
+        response = await client.post(
+            "/api/v1/enrichment/questions/batch",
+            json={"transaction_ids": ["2026-02-05-003-AWS-001", "missing"]},
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("count", [0, 101])
+    async def test_generate_questions_batch_size_limited(
+        self, client: AsyncClient, ai_service, count
+    ):
+        """Test empty and oversized batches are rejected before any AI request."""
+        response = await client.post(
+            "/api/v1/enrichment/questions/batch",
+            json={"transaction_ids": [f"tx-{i}" for i in range(count)]},
+        )
+
+        assert response.status_code == 422
+        assert ai_service.calls == []
+
+    @pytest.fixture
+    def documents_dir(self, tmp_path, monkeypatch):
+        """Point document storage at a temporary directory."""
+        monkeypatch.setattr(get_settings(), "documents_dir", tmp_path)
+        return tmp_path
+
+    @pytest.mark.asyncio
+    async def test_upload_document(self, client: AsyncClient, sample_transactions, documents_dir):
+        """Test uploaded file is written to document storage."""
+        response = await client.post(
+            "/api/v1/enrichment/files/2026-02-05-003-AWS-001",
+            files={"file": ("invoice.pdf", b"%PDF-1.4 test", "application/pdf")},
+        )
+
+        assert response.status_code == 200
+        saved = documents_dir / response.json()["file_name"]
+        assert saved.read_bytes() == b"%PDF-1.4 test"
+        assert list(documents_dir.iterdir()) == [saved]
+
+    @pytest.mark.asyncio
+    async def test_upload_document_rejects_extension(
+        self, client: AsyncClient, sample_transactions, documents_dir
+    ):
+        """Test files outside the allowed types are rejected."""
+        response = await client.post(
+            "/api/v1/enrichment/files/2026-02-05-003-AWS-001",
+            files={"file": ("invoice.pdf.exe", b"MZ", "application/octet-stream")},
+        )
+
+        assert response.status_code == 400
+        assert ".pdf" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_upload_document_too_large(
+        self, client: AsyncClient, sample_transactions, documents_dir, monkeypatch
+    ):
+        """Test oversized upload is rejected and leaves no file behind."""
+        monkeypatch.setattr("src.api.enrichment.UPLOAD_MAX_SIZE", 8)
+        monkeypatch.setattr("src.api.enrichment.UPLOAD_CHUNK_SIZE", 4)
+
+        response = await client.post(
+            "/api/v1/enrichment/files/2026-02-05-003-AWS-001",
+            files={"file": ("invoice.pdf", b"0123456789", "application/pdf")},
+        )
+
+        assert response.status_code == 400
+        assert list(documents_dir.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_update_context_links_related(
+        self, client: AsyncClient, test_session, sample_transactions, previous_aws_bill
+    ):
+        """Test context update returns new values and links related contexts both ways."""
+        for tx_id in ["2026-02-05-003-AWS-001", "2026-01-05-003-AWS-001"]:
+            test_session.add(EnrichedContext(id=f"EC-{tx_id}", transaction_id=tx_id))
+        await test_session.commit()
+
+        response = await client.put(
+            "/api/v1/enrichment/context/2026-02-05-003-AWS-001",
+            json={"category": "개발비", "related_transaction_ids": ["2026-01-05-003-AWS-001"]},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["category"] == "개발비"
+        assert data["related_transaction_ids"] == ["2026-01-05-003-AWS-001"]
+        assert data["updated_at"] is not None
+
+        related = await client.get("/api/v1/enrichment/context/2026-01-05-003-AWS-001")
+        assert related.json()["related_transaction_ids"] == ["2026-02-05-003-AWS-001"]
+
+    @pytest.mark.asyncio
+    async def test_update_context_not_found(self, client: AsyncClient, sample_transactions):
+        """Test updating a missing context returns 404."""
+        response = await client.put(
+            "/api/v1/enrichment/context/2026-02-05-003-AWS-001", json={"category": "개발비"}
+        )
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_submit_answers(
+        self, client: AsyncClient, ai_service, test_session, sample_transactions
+    ):
+        """Test answers set recurrence and document status on the new context."""
+        response = await client.post(
+            "/api/v1/enrichment/answers",
+            json={
+                "transaction_id": "2026-02-05-003-AWS-001",
+                "answers": [
+                    {"question_id": "Q1", "answer": "사업운영"},
+                    {"question_id": "Q2", "answer": "매월 5일"},
+                    {"question_id": "Q4", "answer": "네, 받았어요"},
+                ],
+            },
+        )
+
+        assert response.status_code == 200
+        context = await client.get("/api/v1/enrichment/context/2026-02-05-003-AWS-001")
+        data = context.json()
+        assert data["is_recurring"] is True
+        assert data["frequency"] == "매월 5일"
+        assert data["documents"]["invoice_received"] is True
+        assert data["account_classification"] == "경비 - 통신비"
+
+    @pytest.mark.asyncio
+    async def test_get_context_etag_and_invalidation(
+        self, client: AsyncClient, test_session, sample_transactions
+    ):
+        """Test cached context returns 304 until a PUT changes it."""
+        tx_id = "2026-02-05-003-AWS-001"
+        test_session.add(EnrichedContext(id=f"EC-{tx_id}", transaction_id=tx_id))
+        await test_session.commit()
+
+        first = await client.get(f"/api/v1/enrichment/context/{tx_id}")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "private, max-age=5"
+        etag = first.headers["etag"]
+
+        cached = await client.get(
+            f"/api/v1/enrichment/context/{tx_id}", headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+        await client.put(f"/api/v1/enrichment/context/{tx_id}", json={"category": "개발비"})
+
+        changed = await client.get(
+            f"/api/v1/enrichment/context/{tx_id}", headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.json()["category"] == "개발비"
+        assert changed.headers["etag"] != etag
+
+    @pytest.mark.asyncio
+    async def test_submit_answers_twice_rejected(
+        self, client: AsyncClient, ai_service, sample_transactions
+    ):
+        """Test a second submission is rejected without requesting a summary."""
+        body = {
+            "transaction_id": "2026-02-05-003-AWS-001",
+            "answers": [{"question_id": "Q1", "answer": "사업운영"}],
+        }
+        assert (await client.post("/api/v1/enrichment/answers", json=body)).status_code == 200
+
+        response = await client.post("/api/v1/enrichment/answers", json=body)
+
+        assert response.status_code == 400
+        assert len(ai_service.summary_calls) == 1
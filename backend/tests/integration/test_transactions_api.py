@@ -2,15 +2,18 @@
 Integration tests for Transaction API.
 """
 
-from datetime import date
+from datetime import date, datetime
 
 import pytest
 from httpx import AsyncClient
 
+from src.services.popbill_service import PopbillService
+
 
 class TestTransactionsAPI:
     """Integration tests for /api/v1/transactions endpoints."""
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_sync_transactions(self, client: AsyncClient):
         """Test syncing transactions from mock Popbill API."""
@@ -28,6 +31,7 @@ class TestTransactionsAPI:
         assert data["new_transactions"] >= 0
         assert data["total_transactions"] >= 0
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_sync_transactions_with_accounts(self, client: AsyncClient):
         """Test syncing with specific accounts."""
@@ -46,6 +50,47 @@ class TestTransactionsAPI:
         data = response.json()
         assert data["status"] == "success"
 
+    @pytest.mark.asyncio
+    async def test_sync_skips_existing_and_duplicate_transactions(
+        self, client: AsyncClient, sample_transactions, monkeypatch
+    ):
+        """Test already-stored and repeated IDs are inserted once."""
+
+        def fetched(tx_id: str) -> dict:
+            return {
+                "id": tx_id,
+                "bank_name": "기업은행",
+                "account_number": "123-456-789",
+                "date": datetime(2026, 2, 6),
+                "time": "09:00:00",
+                "amount": 30000,
+                "type": "지출",
+                "counterparty": "문구점",
+                "bank_memo": "사무용품",
+            }
+
+        async def fake_fetch(self, **kwargs):
+            return [
+                fetched(sample_transactions[0].id),
+                fetched("2026-02-06-003-문구점-001"),
+                fetched("2026-02-06-003-문구점-001"),
+            ]
+
+        monkeypatch.setattr(PopbillService, "fetch_transactions_batch", fake_fetch)
+
+        response = await client.post(
+            "/api/v1/transactions/sync",
+            json={"start_date": "2026-02-06", "end_date": "2026-02-06"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["new_transactions"] == 1
+        assert data["total_transactions"] == 4
+
+        inserted = await client.get("/api/v1/transactions/2026-02-06-003-문구점-001")
+        assert inserted.json()["created_at"] is not None
+
     @pytest.mark.asyncio
     async def test_list_transactions_empty(self, client: AsyncClient):
         """Test listing transactions when empty."""
@@ -93,6 +138,13 @@ class TestTransactionsAPI:
         data = response.json()
         assert data["total"] == 2  # 2 pending, 1 enriched
 
+    @pytest.mark.asyncio
+    async def test_list_transactions_invalid_status(self, client: AsyncClient):
+        """Test an unknown status filter is rejected."""
+        response = await client.get("/api/v1/transactions/?status=archived")
+
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_list_transactions_filter_by_bank(
         self, client: AsyncClient, sample_transactions
@@ -118,6 +170,18 @@ class TestTransactionsAPI:
         assert data["page"] == 1
         assert data["page_size"] == 2
 
+    @pytest.mark.asyncio
+    async def test_list_transactions_page_past_end(
+        self, client: AsyncClient, sample_transactions
+    ):
+        """Test a page past the last one still reports the total."""
+        response = await client.get("/api/v1/transactions/?page=3&page_size=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["transactions"] == []
+        assert data["total"] == 3
+
     @pytest.mark.asyncio
     async def test_get_single_transaction(
         self, client: AsyncClient, sample_transactions
@@ -132,6 +196,18 @@ class TestTransactionsAPI:
         assert data["amount"] == 50000
         assert data["counterparty"] == "AWS Korea"
 
+    @pytest.mark.asyncio
+    async def test_get_single_transaction_not_modified(
+        self, client: AsyncClient, sample_transactions
+    ):
+        """Test a matching If-None-Match returns 304."""
+        url = f"/api/v1/transactions/{sample_transactions[0].id}"
+        first = await client.get(url)
+
+        response = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+        assert response.status_code == 304
+
     @pytest.mark.asyncio
     async def test_get_single_transaction_not_found(self, client: AsyncClient):
         """Test getting non-existent transaction."""
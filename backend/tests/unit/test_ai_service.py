@@ -0,0 +1,303 @@
+"""
+Unit tests for AIService.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.services.ai_service import (
+    FAST_QUESTION_MAX_TOKENS,
+    QUESTION_INSTRUCTIONS,
+    QUESTION_MAX_TOKENS,
+    QUESTIONS_TOOL,
+    SUMMARY_INSTRUCTIONS,
+    AIService,
+    _suggest_category_cached,
+)
+from src.services.llm_cache import LLMCache, RedisLLMCache
+
+
+class FakeMessages:
+    """Stand-in for the Anthropic messages API that records requests."""
+
+    def __init__(self, reply: dict):
+        self.reply = reply
+        self.calls: list[dict] = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if "tool_choice" in kwargs:
+            block = SimpleNamespace(
+                type="tool_use", name=kwargs["tool_choice"]["name"], input=self.reply
+            )
+        else:
+            # Continue the prefilled assistant turn
+            prefill = kwargs["messages"][-1]["content"]
+            block = SimpleNamespace(type="text", text=json.dumps(self.reply)[len(prefill) :])
+        return SimpleNamespace(content=[block])
+
+
+class FakeRedis:
+    """Minimal stand-in for a redis.asyncio client."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        entry = self.data.get(key)
+        return entry[0] if entry else None
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = (value, ex)
+
+
+class TestAIService:
+    """Tests for AIService."""
+
+    @pytest.fixture
+    def transaction(self):
+        return {
+            "id": "2026-02-05-003-AWS-001",
+            "date": "2026-02-05",
+            "time": "14:30:00",
+            "amount": 50000,
+            "type": "지출",
+            "counterparty": "AWS Korea",
+            "bank_memo": "AWS 서버비",
+            "bank_name": "기업은행",
+        }
+
+    @pytest.fixture
+    def service(self, test_engine):
+        """Create AIService with a fake API client and a test-database cache."""
+        service = AIService(api_key="test-key")
+        service.cache = LLMCache(
+            async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+        )
+        reply = {
+            "questions": [
+                {
+                    "id": "Q1",
+                    "text": "용도는?",
+                    "options": ["서버", "기타"],
+                    "type": "single_choice",
+                }
+            ],
+            "confidence": 0.9,
+        }
+        service.client = SimpleNamespace(messages=FakeMessages(reply))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_questions_use_cacheable_system_prefix(self, service, transaction):
+        """Test static instructions are sent as a cached system block."""
+        result = await service.generate_smart_questions(transaction)
+
+        assert result["source"] == "ai"
+        assert result["questions"][0]["id"] == "Q1"
+
+        call = service.client.messages.calls[0]
+        assert call["system"][-1]["text"] == QUESTION_INSTRUCTIONS
+        assert call["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        # Only the transaction-specific part is sent as the user message
+        assert "AWS Korea" in call["messages"][0]["content"]
+        assert QUESTION_INSTRUCTIONS not in call["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_questions_forced_through_tool(self, service, transaction):
+        """Test questions are requested via the emit_questions tool."""
+        await service.generate_smart_questions(transaction)
+
+        call = service.client.messages.calls[0]
+        assert call["tools"] == [QUESTIONS_TOOL]
+        assert call["tool_choice"] == {"type": "tool", "name": "emit_questions"}
+
+    @pytest.mark.asyncio
+    async def test_questions_model_routed_by_category(self, service, transaction):
+        """Test known-category transactions use the fast model with a smaller cap."""
+        await service.generate_smart_questions(transaction)
+        await service.generate_smart_questions(
+            {**transaction, "counterparty": "주식회사 한빛", "bank_memo": "이체"}
+        )
+
+        routine, ambiguous = service.client.messages.calls
+        assert routine["model"] == service.fast_model
+        assert routine["max_tokens"] == FAST_QUESTION_MAX_TOKENS
+        assert ambiguous["model"] == service.model
+        assert ambiguous["max_tokens"] == QUESTION_MAX_TOKENS
+
+    @pytest.mark.parametrize(
+        "counterparty, routine",
+        [
+            ("aws korea", True),
+            ("3월 급여", True),
+            ("Adobe", False),
+            ("Trade Co", False),
+            ("LAWSON", False),
+            ("주식회사 한빛", False),
+        ],
+    )
+    def test_routine_needs_a_confident_match(self, service, transaction, counterparty, routine):
+        """Test loose keyword substrings are not routed to the fast model."""
+        assert service._is_routine({**transaction, "counterparty": counterparty}) is routine
+
+    @pytest.mark.asyncio
+    async def test_invalid_tool_questions_fall_back_to_templates(self, service, transaction):
+        """Test tool input without usable questions falls back and is not cached."""
+        service.client.messages.reply = {"questions": [{"id": "Q1"}], "confidence": 0.9}
+
+        result = await service.generate_smart_questions(transaction)
+        await service.generate_smart_questions(transaction)
+
+        assert result["source"] == "template"
+        assert len(service.client.messages.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_questions_cached_for_recurring_transaction(self, service, transaction):
+        """Test a similar transaction on another date reuses the cached questions."""
+        first = await service.generate_smart_questions(transaction)
+        next_month = {
+            **transaction,
+            "id": "2026-03-05-003-AWS-001",
+            "date": "2026-03-05",
+            "amount": 50020,
+        }
+        second = await service.generate_smart_questions(next_month)
+
+        assert second == first
+        assert len(service.client.messages.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_questions_share_one_call(self, service, transaction):
+        """Test concurrent requests for the same transaction make one API call."""
+        first, second = await asyncio.gather(
+            service.generate_smart_questions(transaction),
+            service.generate_smart_questions(transaction),
+        )
+
+        assert first == second
+        assert len(service.client.messages.calls) == 1
+        assert service._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_questions_cached_in_redis(self, service, transaction):
+        """Test the Redis cache backend stores entries under a TTL."""
+        redis = FakeRedis()
+        service.cache = RedisLLMCache("redis://test", client=redis)
+
+        first = await service.generate_smart_questions(transaction)
+        second = await service.generate_smart_questions(transaction)
+
+        assert second == first
+        assert len(service.client.messages.calls) == 1
+        ((key, (value, ttl)),) = redis.data.items()
+        assert key.startswith("ai:")
+        assert json.loads(value)["questions"] == first["questions"]
+        assert ttl == 7 * 24 * 3600
+
+    @pytest.mark.asyncio
+    async def test_questions_batch_keeps_order(self, service, transaction):
+        """Test concurrent batch generation returns one result per transaction, in order."""
+        income = {**transaction, "id": "2026-02-06-003-매출-001", "type": "입금"}
+        service.is_mock = True
+
+        results = await service.generate_smart_questions_batch([transaction, income])
+
+        assert [r["questions"][0]["text"] for r in results] == [
+            "이 지출의 주요 목적은 무엇인가요?",
+            "이 입금의 출처는 무엇인가요?",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_summary_cache_keyed_by_exact_amount(self, service, transaction):
+        """Test summaries are not shared between different amounts or dates."""
+        service.client.messages.reply = {
+            "summary": "AWS 서버비",
+            "account_classification": "경비 - 통신비",
+            "tax_notes": "",
+        }
+        answers = [{"question_id": "Q1", "answer": "사업운영"}]
+
+        await service.generate_ai_summary(transaction, answers)
+        await service.generate_ai_summary(transaction, answers)
+        await service.generate_ai_summary({**transaction, "amount": 50020}, answers)
+        await service.generate_ai_summary({**transaction, "date": "2026-03-05"}, answers)
+
+        assert len(service.client.messages.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_summary_parsed_from_prefilled_reply(self, service, transaction):
+        """Test the summary reply continues a prefilled "{" and parses as JSON."""
+        reply = {"summary": "AWS 서버비", "account_classification": "통신비", "tax_notes": ""}
+        service.client.messages.reply = reply
+
+        result = await service.generate_ai_summary(transaction, [])
+
+        assert result == reply
+        call = service.client.messages.calls[0]
+        assert call["messages"][-1] == {"role": "assistant", "content": "{"}
+        assert "tools" not in call
+
+    @pytest.mark.asyncio
+    async def test_summary_uses_cacheable_system_prefix(self, service, transaction):
+        """Test static summary instructions are sent as a cached system block."""
+        await service.generate_ai_summary(transaction, [])
+
+        call = service.client.messages.calls[0]
+        assert call["system"][-1]["text"] == SUMMARY_INSTRUCTIONS
+        assert call["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert SUMMARY_INSTRUCTIONS not in call["messages"][0]["content"]
+
+    @pytest.mark.asyncio
+    async def test_mock_mode_uses_templates(self, transaction):
+        """Test template questions are returned in mock mode."""
+        service = AIService()
+        service.is_mock = True
+
+        result = await service.generate_smart_questions(transaction)
+
+        assert result["questions"]
+
+    def test_template_questions_do_not_mutate_templates(self, transaction):
+        """Test recurring customization leaves the shared templates untouched."""
+        service = AIService()
+        past = [{"date": "2026-01-05", "amount": 50000, "counterparty": "AWS Korea"}] * 3
+
+        customized = service._generate_template_questions(transaction, past)
+        plain = service._generate_template_questions(transaction, None)
+
+        assert customized["questions"][1]["options"][0] == "네, 매월 반복 (이전 3건 확인)"
+        assert plain["questions"][1]["options"][0] == "네, 매월 반복"
+
+    @pytest.mark.parametrize(
+        "counterparty,memo,expected",
+        [
+            ("AWS Korea", "", "개발비 - 클라우드"),
+            ("광고대행사", "서버 광고", "개발비 - 클라우드"),  # Earlier category wins
+            ("김밥천국", "점심 식사", "식대"),
+            ("알 수 없음", "", "기타 경비"),
+            (None, None, "기타 경비"),  # Nullable columns
+        ],
+    )
+    def test_suggest_category(self, counterparty, memo, expected):
+        """Test keyword category suggestion keeps category priority order."""
+        service = AIService()
+
+        category = service._suggest_category({"counterparty": counterparty, "bank_memo": memo})
+
+        assert category == expected
+
+    def test_suggest_category_memoized(self):
+        """Test repeated counterparty/memo pairs are served from the memo cache."""
+        service = AIService()
+        transaction = {"counterparty": "사무실월세 테스트", "bank_memo": "3월분"}
+        before = _suggest_category_cached.cache_info().hits
+
+        service._suggest_category(transaction)
+        service._suggest_category(transaction)
+
+        assert _suggest_category_cached.cache_info().hits == before + 1
@@ -0,0 +1,71 @@
+"""
+Unit tests for database schema setup.
+"""
+
+import pytest
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src import database
+from src.models import Transaction, TransactionStatus, TransactionType
+
+
+class TestEnsureSchema:
+    """Tests for the SCHEMA_VERSION-gated create_all."""
+
+    @pytest.fixture
+    async def engine(self):
+        """Empty in-memory database."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        yield engine
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_creates_schema_once(self, engine):
+        """Test tables are created on first run and skipped when current."""
+        async with engine.begin() as conn:
+            assert await conn.run_sync(database._ensure_schema) is True
+            tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+            assert "transactions" in tables
+
+        async with engine.begin() as conn:
+            assert await conn.run_sync(database._ensure_schema) is False
+
+    @pytest.mark.asyncio
+    async def test_reapplies_when_version_bumped(self, engine, monkeypatch):
+        """Test a newer SCHEMA_VERSION re-runs create_all and records the version."""
+        async with engine.begin() as conn:
+            await conn.run_sync(database._ensure_schema)
+
+        monkeypatch.setattr(database, "SCHEMA_VERSION", database.SCHEMA_VERSION + 1)
+        async with engine.begin() as conn:
+            assert await conn.run_sync(database._ensure_schema) is True
+            assert await conn.run_sync(database._ensure_schema) is False
+
+    @pytest.mark.asyncio
+    async def test_converts_legacy_enum_names(self, engine):
+        """Test enum names stored as VARCHAR by older schemas become SmallIntEnum codes."""
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(
+                "CREATE TABLE transactions (id VARCHAR(100) PRIMARY KEY, bank_name VARCHAR(50),"
+                " account_number VARCHAR(255), account_number_masked VARCHAR(50),"
+                " date DATETIME, time VARCHAR(10), amount INTEGER, type VARCHAR(7),"
+                " counterparty VARCHAR(255), bank_memo TEXT, is_internal_transfer BOOLEAN,"
+                " is_recurring BOOLEAN, status VARCHAR(21), created_at DATETIME,"
+                " updated_at DATETIME)"
+            )
+            await conn.exec_driver_sql(
+                "INSERT INTO transactions (id, bank_name, account_number, date, amount, type,"
+                " status) VALUES ('TX-1', '기업은행', 'x', '2026-02-05 00:00:00', 1000,"
+                " 'EXPENSE', 'ENRICHED')"
+            )
+            await conn.run_sync(database._ensure_schema)
+
+            row = (
+                await conn.execute(
+                    select(Transaction.type, Transaction.status).where(
+                        Transaction.status == TransactionStatus.ENRICHED
+                    )
+                )
+            ).one()
+            assert row == (TransactionType.EXPENSE, TransactionStatus.ENRICHED)
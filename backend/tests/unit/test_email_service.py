@@ -0,0 +1,103 @@
+"""
+Unit tests for EmailService.
+"""
+
+import aiosmtplib
+import pytest
+
+from src.services.email_service import EmailService
+
+
+class FakeSMTP:
+    """Stand-in for aiosmtplib.SMTP that records calls."""
+
+    def __init__(self, drop_on_send: bool = False):
+        self.drop_on_send = drop_on_send
+        self.sent = 0
+        self.closed = False
+
+    async def noop(self):
+        if self.closed:
+            raise aiosmtplib.SMTPServerDisconnected("closed")
+
+    async def send_message(self, msg):
+        if self.drop_on_send:
+            raise aiosmtplib.SMTPServerDisconnected("dropped")
+        self.sent += 1
+
+    async def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestEmailService:
+    """Tests for EmailService SMTP session reuse."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Create a configured EmailService whose connections are FakeSMTP."""
+        service = EmailService(host="smtp.test", user="user", password="pw", from_addr="a@b.c")
+        service.connections = []
+
+        async def fake_connect():
+            client = FakeSMTP()
+            service.connections.append(client)
+            return client
+
+        monkeypatch.setattr(service, "_connect", fake_connect)
+        return service
+
+    async def _send(self, service):
+        return await service.send_to_accountant(
+            to_email="tax@example.com",
+            user_name="사용자",
+            month="2026-02",
+            total_transactions=1,
+            total_income=0,
+            total_expense=1000,
+            attachment_content=b"xlsx",
+            attachment_filename="report.xlsx",
+        )
+
+    @pytest.mark.asyncio
+    async def test_reuses_connection(self, service):
+        """Test consecutive sends share one SMTP session."""
+        assert (await self._send(service))["status"] == "sent"
+        assert (await self._send(service))["status"] == "sent"
+
+        assert len(service.connections) == 1
+        assert service.connections[0].sent == 2
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_disconnect(self, service):
+        """Test a dropped session is replaced and the send retried."""
+        await self._send(service)
+        service.connections[0].drop_on_send = True
+
+        result = await self._send(service)
+
+        assert result["status"] == "sent"
+        assert len(service.connections) == 2
+        assert service.connections[1].sent == 1
+
+    @pytest.mark.asyncio
+    async def test_prepare_opens_session_used_by_send(self, service):
+        """Test prepare() pre-opens the session the next send uses."""
+        await service.prepare()
+        await service.prepare()  # Already has an idle session
+        assert len(service.connections) == 1
+
+        await self._send(service)
+
+        assert len(service.connections) == 1
+        assert service.connections[0].sent == 1
+
+    @pytest.mark.asyncio
+    async def test_close_quits_sessions(self, service):
+        """Test close() quits idle sessions."""
+        await self._send(service)
+        await service.close()
+
+        assert service.connections[0].closed
@@ -0,0 +1,97 @@
+"""
+Unit tests for the Excel export builder.
+"""
+
+from datetime import datetime
+from io import BytesIO
+
+import pytest
+from openpyxl import load_workbook
+
+from src.models import EnrichedContext, MonthlyDocument, Transaction, TransactionType
+from src.services.excel_builder import ExcelBuilder
+
+
+class TestExcelBuilder:
+    """Tests for ExcelBuilder."""
+
+    def _make_transaction(self, tx_id: str, amount: int, tx_type: TransactionType) -> Transaction:
+        return Transaction(
+            id=tx_id,
+            bank_name="기업은행",
+            account_number="encrypted",
+            date=datetime(2026, 2, 5),
+            amount=amount,
+            type=tx_type,
+            counterparty="AWS Korea",
+            bank_memo="AWS 서버비",
+            is_recurring=True,
+        )
+
+    def _save(self, builder: ExcelBuilder):
+        """Save the workbook into memory and load it back."""
+        buffer = BytesIO()
+        builder.save(buffer)
+        buffer.seek(0)
+        return load_workbook(buffer)
+
+    def test_workbook_sheets(self):
+        """Test that all three sheets are generated with expected rows."""
+        document = MonthlyDocument(
+            id="MD-2026-02",
+            month="2026-02",
+            total_transactions=2,
+            total_income=100000,
+            total_expense=50000,
+        )
+        transactions = [
+            self._make_transaction("tx-1", 50000, TransactionType.EXPENSE),
+            self._make_transaction("tx-2", 100000, TransactionType.INCOME),
+        ]
+        transactions[0].enriched_context = EnrichedContext(
+            id="EC-1",
+            transaction_id="tx-1",
+            account_classification="경비 - 통신비",
+            tax_notes="연구개발비 세액공제 대상",
+            ai_generated_summary="AWS 서버비",
+        )
+
+        builder = ExcelBuilder(document)
+        for tx in transactions:
+            builder.add_transaction(tx, tx.enriched_context)
+        wb = self._save(builder)
+
+        assert wb.sheetnames == ["거래 내역", "요약", "세무 처리 메모"]
+
+        tx_rows = list(wb["거래 내역"].values)
+        assert len(tx_rows) == 3  # Header + 2 transactions
+        assert tx_rows[1][1] == -50000  # Expense is negative
+        assert tx_rows[2][1] == 100000
+        assert wb["거래 내역"]["A1"].font.b
+
+        summary = dict(list(wb["요약"].values)[1:])
+        assert summary["순 현금흐름"] == 50000
+
+        tax_rows = list(wb["세무 처리 메모"].values)
+        assert tax_rows[1] == ("AWS Korea", 50000, "연구개발비 세액공제 대상")
+
+    @pytest.mark.asyncio
+    async def test_add_transactions_from_stream(self):
+        """Test rows can be appended from an async transaction stream."""
+        document = MonthlyDocument(
+            id="MD-2026-02",
+            month="2026-02",
+            total_transactions=3,
+            total_income=0,
+            total_expense=3000,
+        )
+
+        async def stream():
+            for i in range(3):
+                yield self._make_transaction(f"tx-{i}", 1000, TransactionType.EXPENSE)
+
+        builder = ExcelBuilder(document)
+        await builder.add_transactions(stream())
+        wb = self._save(builder)
+
+        assert wb["거래 내역"].max_row == 4  # Header + 3 transactions
@@ -2,7 +2,7 @@
 Unit tests for PopbillService.
 """
 
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 import pytest
 
@@ -17,6 +17,7 @@ class TestPopbillService:
         """Create PopbillService instance (mock mode)."""
         return PopbillService()
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_fetch_transactions_returns_list(self, service):
         """Test that fetch_transactions_batch returns a list."""
@@ -33,6 +34,7 @@ class TestPopbillService:
 
         assert isinstance(transactions, list)
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_mock_transactions_have_required_fields(self, service):
         """Test that mock transactions have all required fields."""
@@ -61,6 +63,7 @@ class TestPopbillService:
             for field in required_fields:
                 assert field in tx, f"Missing field: {field}"
 
+    @pytest.mark.slow
     @pytest.mark.asyncio
     async def test_fetch_multiple_accounts(self, service):
         """Test fetching from multiple accounts."""
@@ -82,6 +85,63 @@ class TestPopbillService:
         banks = {tx["bank_name"] for tx in transactions}
         assert len(banks) >= 1  # At least one bank
 
+    @pytest.mark.asyncio
+    async def test_fetch_transactions_chunked_covers_range(self, service, monkeypatch):
+        """Test chunked fetch splits the range into consecutive whole-day windows."""
+        windows = []
+
+        async def fake_fetch(corp_num, accounts, start_date, end_date):
+            windows.append((start_date, end_date))
+            return [{"id": str(start_date)}]
+
+        monkeypatch.setattr(service, "fetch_transactions_batch", fake_fetch)
+
+        chunks = [
+            chunk
+            async for chunk in service.fetch_transactions_chunked(
+                corp_num="1234567890",
+                accounts=[],
+                start_date=date(2026, 1, 1),
+                end_date=date(2026, 3, 10),
+                chunk_days=31,
+            )
+        ]
+
+        assert windows == [
+            (date(2026, 1, 1), date(2026, 1, 31)),
+            (date(2026, 2, 1), date(2026, 3, 3)),
+            (date(2026, 3, 4), date(2026, 3, 10)),
+        ]
+        assert chunks == [[{"id": "2026-01-01"}], [{"id": "2026-02-01"}], [{"id": "2026-03-04"}]]
+
+    def test_parse_transactions(self, service):
+        """Test Popbill response rows become transactions with generated IDs."""
+        response = {
+            "list": [
+                {
+                    "trdate": "20260205",
+                    "trtime": "14:30:00",
+                    "tramt": "-50000",
+                    "remark": "AWS Korea",
+                },
+                {"trdate": "20260205", "tramt": "12000", "accIn": True, "remark": ""},
+            ]
+        }
+
+        transactions = service._parse_transactions(
+            response, {"bank": "기업은행", "account": "123-456-789"}
+        )
+
+        assert [tx["id"] for tx in transactions] == [
+            "2026-02-05-003-AWS-000",
+            "2026-02-05-003-UNK-001",
+        ]
+        assert transactions[0]["date"] == datetime(2026, 2, 5)
+        assert transactions[0]["amount"] == 50000
+        assert transactions[0]["type"] == "지출"
+        assert transactions[1]["type"] == "입금"
+        assert transactions[1]["time"] == "00:00:00"
+
     def test_detect_internal_transfers_empty(self, service):
         """Test internal transfer detection with no transfers."""
         transactions = [
@@ -118,3 +178,18 @@ class TestPopbillService:
 
         # 10 minutes apart - should NOT be detected
         assert internal_ids == []
+
+    def test_detect_internal_transfers_same_amount_bucket(self, service):
+        """Test each expense is matched once within a bucket of same-amount transactions."""
+        today = date.today()
+        transactions = [
+            {"id": "1", "amount": 50000, "type": "지출", "date": today, "time": "09:00:00"},
+            {"id": "2", "amount": 50000, "type": "입금", "date": today, "time": "09:01:00"},
+            {"id": "3", "amount": 50000, "type": "입금", "date": today, "time": "09:03:00"},
+            {"id": "4", "amount": 50000, "type": "지출", "date": today, "time": "12:00:00"},
+            {"id": "5", "amount": 50000, "type": "지출", "date": today, "time": "bad"},
+        ]
+
+        internal_ids = service.detect_internal_transfers(transactions)
+
+        assert internal_ids == ["1"]
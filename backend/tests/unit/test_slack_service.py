@@ -0,0 +1,196 @@
+"""
+Unit tests for SlackService.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import slack_service
+from src.services.slack_service import (
+    SLACK_MAX_BLOCKS,
+    SLACK_POST_INTERVAL,
+    SlackService,
+    _chunk_blocks,
+)
+
+
+class FakeWebClient:
+    """Stand-in for AsyncWebClient that records posted messages."""
+
+    def __init__(self, fail_channels: tuple[str, ...] = ()):
+        self.fail_channels = fail_channels
+        self.posts: list[dict] = []
+
+    async def chat_postMessage(self, **kwargs):
+        if kwargs["channel"] in self.fail_channels:
+            raise RuntimeError("channel_not_found")
+        self.posts.append(kwargs)
+        return {"ts": str(len(self.posts)), "channel": kwargs["channel"]}
+
+
+def question_blocks(transaction_count: int, questions_per_transaction: int) -> list[dict]:
+    """Blocks shaped like _build_question_blocks output, numbered for order checks."""
+    blocks = [{"type": "section", "n": 0}, {"type": "divider"}]
+    for _ in range(transaction_count):
+        blocks.append({"type": "section", "n": len(blocks)})
+        for _ in range(questions_per_transaction):
+            blocks.append({"type": "section", "n": len(blocks)})
+            blocks.append({"type": "actions", "n": len(blocks)})
+        blocks.append({"type": "divider"})
+    return blocks
+
+
+class TestChunkBlocks:
+    """Tests for splitting blocks into messages at Slack's block limit."""
+
+    @pytest.mark.parametrize("transaction_count,questions", [(1, 2), (12, 2), (30, 1), (9, 3)])
+    def test_chunks_respect_limit_and_order(self, transaction_count, questions):
+        """Test chunks stay within the limit, end on dividers and keep block order."""
+        blocks = question_blocks(transaction_count, questions)
+
+        chunks = _chunk_blocks(blocks)
+
+        assert all(len(chunk) <= SLACK_MAX_BLOCKS for chunk in chunks)
+        assert all(chunk[-1]["type"] == "divider" for chunk in chunks)
+        assert [block for chunk in chunks for block in chunk] == blocks
+
+    def test_small_message_is_one_chunk(self):
+        """Test messages under the limit are not split."""
+        blocks = question_blocks(3, 2)
+
+        assert _chunk_blocks(blocks) == [blocks]
+
+
+class TestSendMany:
+    """Tests for posting one message to several channels."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        """Create a non-mock SlackService with a fake client and no rate-limit delay."""
+        monkeypatch.setattr(slack_service, "SLACK_POST_INTERVAL", 0.0)
+        monkeypatch.setattr(slack_service, "_next_post_at", 0.0)
+        service = SlackService()
+        service.is_mock = False
+        service.client = FakeWebClient(fail_channels=("C-missing",))
+        return service
+
+    @pytest.mark.asyncio
+    async def test_one_result_per_channel_in_order(self, service):
+        """Test results line up with channels, including a failed one."""
+        channels = ["C1", "C-missing", "C2"]
+
+        results = await service.send_many(channels, question_blocks(2, 1), "text")
+
+        assert [r["channel"] for r in results] == channels
+        assert [r["status"] for r in results] == ["sent", "error", "sent"]
+        assert sorted(post["channel"] for post in service.client.posts) == ["C1", "C2"]
+
+    @pytest.mark.asyncio
+    async def test_long_message_posted_in_chunks(self, service):
+        """Test a message over the block limit goes out as several posts per channel."""
+        blocks = question_blocks(30, 1)
+
+        await service.send_many(["C1"], blocks, "text")
+
+        posted = [post["blocks"] for post in service.client.posts]
+        assert len(posted) == len(_chunk_blocks(blocks)) > 1
+        assert [block for chunk in posted for block in chunk] == blocks
+
+
+class TestPostRateLimit:
+    """Tests for the app-wide chat.postMessage rate limiter."""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        """Freeze the limiter's clock at 100s and record its sleeps instead of waiting."""
+        clock = SimpleNamespace(now=100.0, sleeps=[])
+
+        async def sleep(delay):
+            clock.sleeps.append(delay)
+            await asyncio.sleep(0)
+
+        monkeypatch.setattr(slack_service, "time", SimpleNamespace(monotonic=lambda: clock.now))
+        monkeypatch.setattr(slack_service, "asyncio", SimpleNamespace(sleep=sleep))
+        monkeypatch.setattr(slack_service, "_next_post_at", 0.0)
+        return clock
+
+    @pytest.fixture
+    def service(self):
+        """Create a non-mock SlackService with a fake client."""
+        service = SlackService()
+        service.is_mock = False
+        service.client = FakeWebClient()
+        return service
+
+    @pytest.mark.asyncio
+    async def test_concurrent_posts_spaced_by_interval(self, service, clock):
+        """Test concurrent sends reserve consecutive slots SLACK_POST_INTERVAL apart."""
+        await asyncio.gather(*(service._post_message(channel=f"C{i}") for i in range(4)))
+
+        assert clock.sleeps == [SLACK_POST_INTERVAL * n for n in (1, 2, 3)]
+        assert slack_service._next_post_at == 100.0 + 4 * SLACK_POST_INTERVAL
+        assert len(service.client.posts) == 4
+
+    @pytest.mark.asyncio
+    async def test_post_after_interval_is_not_delayed(self, service, clock):
+        """Test a send after the reserved slot has passed goes out immediately."""
+        await service._post_message(channel="C1")
+        clock.now += SLACK_POST_INTERVAL
+
+        await service._post_message(channel="C2")
+
+        assert clock.sleeps == []
+
+
+class TestHandleButtonClick:
+    """Tests for parsing answer button clicks."""
+
+    @pytest.mark.asyncio
+    async def test_parses_json_value(self):
+        """Test the JSON button value is the primary source of the answer."""
+        payload = {
+            "actions": [{"value": '{"tx_id":"t1","q_id":"q1","answer":"회의비"}'}],
+            "user": {"id": "U1"},
+        }
+
+        result = await SlackService().handle_button_click(payload)
+
+        assert result["status"] == "success"
+        assert (result["transaction_id"], result["question_id"], result["answer"]) == (
+            "t1",
+            "q1",
+            "회의비",
+        )
+        assert result["user_id"] == "U1"
+
+    @pytest.mark.parametrize(
+        "action_id,expected",
+        [
+            ("answer_t1_q1_A", ("t1", "q1", "A")),
+            ("answer_t1_q1_A_b", ("t1", "q1", "A_b")),  # Underscores stay in the answer
+            ("answer_t1_q1_", ("t1", "q1", "")),  # Empty answer
+            ("answer__q1_A", ("", "q1", "A")),  # Empty transaction segment
+            ("answer_t1__A", ("t1", "", "A")),  # Empty question segment
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_falls_back_to_action_id(self, action_id, expected):
+        """Test non-JSON values are parsed from the action_id like the old split logic."""
+        payload = {"actions": [{"value": "not json", "action_id": action_id}]}
+
+        result = await SlackService().handle_button_click(payload)
+
+        assert result["status"] == "success"
+        assert (result["transaction_id"], result["question_id"], result["answer"]) == expected
+
+    @pytest.mark.parametrize("action_id", ["answer_t1_q1", "skip_t1", "", "xanswer_t1_q1_A"])
+    @pytest.mark.asyncio
+    async def test_unparseable_action_id(self, action_id):
+        """Test action IDs not shaped answer_{tx_id}_{q_id}_{option} are rejected."""
+        payload = {"actions": [{"value": "not json", "action_id": action_id}]}
+
+        result = await SlackService().handle_button_click(payload)
+
+        assert result["status"] == "error"